@@ -0,0 +1,51 @@
+"""Measure the memory held per hit by a decoded QueryResponse.
+
+Usage:
+    python benchmarks/memory.py [--hits N]
+
+Prints one JSON object per measurement.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any
+
+from payloads import make_payload
+
+from karp_api_client.models import QueryResponse
+
+
+def measure(body: bytes, *, lazy_hits: bool) -> dict[str, Any]:
+    """Measure bytes retained by the response decoded from `body`."""
+    gc.collect()
+    tracemalloc.start()
+    response = QueryResponse.from_dict(json.loads(body), lazy_hits=lazy_hits)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    num_hits = len(response.hits)
+    return {
+        "benchmark": "memory",
+        "lazy_hits": lazy_hits,
+        "hits": num_hits,
+        "bytes_per_hit": round(retained / num_hits, 1),
+        "peak_bytes_per_hit": round(peak / num_hits, 1),
+    }
+
+
+def main() -> None:
+    """Measure the memory of eager and lazy hits and print one JSON line for each."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hits", type=int, default=10_000)
+    args = parser.parse_args()
+
+    body = make_payload(args.hits)
+    for lazy_hits in (False, True):
+        sys.stdout.write(json.dumps(measure(body, lazy_hits=lazy_hits)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Micro-benchmarks for decoding, models, the query DSL, query round trips and local lookups.
+
+Runs offline: queries are answered by an `httpx.MockTransport` serving
+generated payloads, or a recorded Karp response given with `--recorded`.
+
+Usage:
+    python benchmarks/micro.py [--quick] [--recorded FILE] [--output FILE] [--baseline FILE [--tolerance 0.2]]
+
+Prints one JSON object per benchmark. With `--baseline`, a previous
+`--output` file, benchmarks slower than the baseline by more than
+`--tolerance` are reported on stderr and the exit status is 1.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from payloads import make_payload
+
+from karp_api_client import Client, dsl
+from karp_api_client.api import querying
+from karp_api_client.json_backend import get_json_backend
+from karp_api_client.local_index import LocalIndex
+from karp_api_client.models import EntryDto, QueryResponse
+
+BASE_URL = "https://karp.test/karp/v7"
+
+
+def bench(
+    name: str, fn: Callable[[], Any], *, items: int, unit: str, repeat: int, min_time: float, **params: Any
+) -> dict[str, Any]:
+    """Time `fn`, which handles `items` items per call, and report the best of `repeat` runs."""
+    fn()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    best = min(timings)
+    return {
+        "benchmark": name,
+        **params,
+        "unit": unit,
+        "calls": number * repeat,
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "per_second": items / best,
+    }
+
+
+def mock_client(body: bytes) -> Client:
+    """Create a client whose queries are all answered with `body`."""
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+    return Client(base_url=BASE_URL, httpx_args={"transport": httpx.MockTransport(handler)})
+
+
+def run(*, sizes: list[int], or_sizes: list[int], recorded: Optional[Path], **timing: Any) -> Iterator[dict[str, Any]]:
+    """Run all benchmarks."""
+    for size in sizes:
+        body = make_payload(size, recorded)
+        data = json.loads(body)
+        response = QueryResponse.from_dict(data)
+        for backend in _installed_json_backends():
+            yield bench(
+                "decode",
+                lambda loads=backend.loads, body=body: loads(body),
+                items=size,
+                unit="hits",
+                hits=size,
+                json=backend.name,
+                **timing,
+            )
+        yield bench(
+            "from_dict", lambda data=data: QueryResponse.from_dict(data), items=size, unit="hits", hits=size, **timing
+        )
+        yield bench(
+            "from_dict_lazy",
+            lambda data=data: QueryResponse.from_dict(data, lazy_hits=True),
+            items=size,
+            unit="hits",
+            hits=size,
+            **timing,
+        )
+        yield bench("to_dict", response.to_dict, items=size, unit="hits", hits=size, **timing)
+
+        client = mock_client(body)
+        yield bench(
+            "query_sync",
+            lambda client=client: querying.query_sync("ao", client=client),
+            items=size,
+            unit="hits",
+            hits=size,
+            **timing,
+        )
+        loop = asyncio.new_event_loop()
+        try:
+            yield bench(
+                "query_async",
+                lambda loop=loop, client=client: loop.run_until_complete(querying.query_async("ao", client=client)),
+                items=size,
+                unit="hits",
+                hits=size,
+                **timing,
+            )
+        finally:
+            loop.close()
+
+        # one exact-match lookup answered by Karp, here a mock, against one answered by a local index
+        index = LocalIndex(response.hits)
+        lookup = dsl.Equals(field="baseform", value=response.hits[size // 2].entry["baseform"])
+        lookup_client = mock_client(make_payload(1, recorded))
+        yield bench(
+            "lookup_remote",
+            lambda client=lookup_client, lookup=lookup: querying.query_sync(
+                "ao", client=client, query_options=querying.QueryOptions(q=lookup)
+            ),
+            items=1,
+            unit="lookups",
+            hits=size,
+            **timing,
+        )
+        yield bench(
+            "lookup_local",
+            lambda index=index, lookup=lookup: index.search(lookup),
+            items=1,
+            unit="lookups",
+            hits=size,
+            **timing,
+        )
+        yield bench(
+            "lookup_local_query",
+            lambda index=index, lookup=lookup: index.query(query_options=querying.QueryOptions(q=lookup)),
+            items=1,
+            unit="lookups",
+            hits=size,
+            **timing,
+        )
+        yield bench(
+            "index_build", lambda hits=response.hits: LocalIndex(hits), items=size, unit="hits", hits=size, **timing
+        )
+
+    hit = json.loads(make_payload(1, recorded))["hits"][0]
+    yield bench("entry_dto", lambda: EntryDto.from_dict(hit), items=1, unit="entries", **timing)
+
+    for size in or_sizes:
+        words = [f"word{i}" for i in range(size)]
+        terms = [dsl.Equals(field="baseform", value=word) for word in words]
+
+        def build_ior(terms: list[dsl.Equals] = terms) -> dsl.Or:
+            q = dsl.Or()
+            for term in terms:
+                q |= term
+            return q
+
+        yield bench(
+            "dsl_or_build",
+            lambda terms=terms: dsl.Or.from_iterable(terms),
+            items=size,
+            unit="terms",
+            terms=size,
+            **timing,
+        )
+        yield bench("dsl_or_ior", build_ior, items=size, unit="terms", terms=size, **timing)
+        yield bench(
+            "dsl_or_str",
+            lambda terms=terms: str(dsl.Or.from_iterable(terms)),
+            items=size,
+            unit="terms",
+            terms=size,
+            **timing,
+        )
+        yield bench(
+            "dsl_query_string",
+            lambda terms=terms: querying.QueryOptions(q=dsl.Or.from_iterable(terms)).to_query_string(),
+            items=size,
+            unit="terms",
+            terms=size,
+            **timing,
+        )
+
+
+def _installed_json_backends() -> list[Any]:
+    return [
+        get_json_backend(name)
+        for name in ("json", "orjson", "msgspec")
+        if name == "json" or importlib.util.find_spec(name)
+    ]
+
+
+def _key(result: dict[str, Any]) -> tuple[Any, ...]:
+    return result["benchmark"], result.get("hits"), result.get("terms"), result.get("json")
+
+
+def compare(results: list[dict[str, Any]], baseline: Path, tolerance: float) -> list[str]:
+    """List the benchmarks that are slower than in `baseline` by more than `tolerance`."""
+    lines = [json.loads(line) for line in baseline.read_text(encoding="utf-8").splitlines() if line.strip()]
+    previous = {_key(result): result for result in lines if "benchmark" in result}
+    regressions = []
+    for result in results:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        ratio = before["per_second"] / result["per_second"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{' '.join(str(part) for part in _key(result) if part)}: {ratio:.2f}x slower than baseline"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks, print one JSON line for each and return 1 on a regression against `--baseline`."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and shorter runs, for smoke tests")
+    parser.add_argument("--recorded", type=Path, help="recorded Karp query response to build payloads from")
+    parser.add_argument("--output", type=Path, help="also write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="results of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    if args.quick:
+        options: dict[str, Any] = {"sizes": [100], "or_sizes": [100], "repeat": 3, "min_time": 0.01}
+    else:
+        options = {"sizes": [100, 1000, 10_000], "or_sizes": [10, 1000, 10_000], "repeat": 5, "min_time": 0.2}
+
+    environment = {"python": platform.python_version(), "implementation": platform.python_implementation()}
+    results = []
+    for result in run(recorded=args.recorded, **options):
+        results.append(result)
+        sys.stdout.write(json.dumps({**result, **environment}) + "\n")
+        sys.stdout.flush()
+    if args.output is not None:
+        args.output.write_text(
+            "".join(json.dumps({**result, **environment}) + "\n" for result in results), encoding="utf-8"
+        )
+    if args.baseline is not None:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            sys.stderr.write(f"{regression}\n")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
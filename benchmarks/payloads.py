@@ -0,0 +1,39 @@
+"""Query response payloads for the benchmarks."""
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+RESOURCES = ("schlyter", "soederwall", "soederwall-supp")
+
+
+def make_hit(i: int) -> dict[str, Any]:
+    """Build a hit resembling Karp output."""
+    return {
+        "id": f"01J{i:023d}",
+        "version": 1 + i % 3,
+        "last_modified": 1700000000.0 + i,
+        "last_modified_by": "local admin",
+        "resource": RESOURCES[i % len(RESOURCES)],
+        "entry": {
+            "baseform": f"word{i}",
+            "pos": "nn",
+            "senses": [{"definition": f"definition of word{i}"}],
+        },
+        "message": "imported",
+        "discarded": False,
+    }
+
+
+def make_payload(num_hits: int, recorded: Optional[Path] = None) -> bytes:
+    """Build a query response body with `num_hits` hits.
+
+    With `recorded`, a query response body saved from Karp, its hits are
+    repeated, with unique ids, to make up `num_hits`.
+    """
+    if recorded is None:
+        hits = [make_hit(i) for i in range(num_hits)]
+    else:
+        sample = json.loads(recorded.read_bytes())["hits"]
+        hits = [{**sample[i % len(sample)], "id": f"{sample[i % len(sample)]['id']}-{i}"} for i in range(num_hits)]
+    return json.dumps({"total": num_hits, "hits": hits, "distribution": None}).encode()
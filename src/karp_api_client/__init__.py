@@ -1,6 +1,42 @@
-"""A client library for accessing Karp API."""
+"""A client library for accessing Karp API.
 
-from karp_api_client.client import AuthenticatedClient, Client
+The submodules are loaded lazily, so importing the package, or `dsl`, does not
+import httpx.
+"""
+
+from typing import TYPE_CHECKING
+
+from karp_api_client import lazy
+
+if TYPE_CHECKING:
+    from karp_api_client.client import AuthenticatedClient, Client
+
+__getattr__ = lazy.Loader(
+    __name__,
+    submodules=[
+        "api",
+        "cache",
+        "cli",
+        "client",
+        "coalesce",
+        "dsl",
+        "entry_cache",
+        "errors",
+        "export",
+        "instrumentation",
+        "json_backend",
+        "json_stream",
+        "local_index",
+        "mirror",
+        "models",
+        "pool",
+        "ratelimit",
+        "shared",
+        "transport",
+    ],
+    exports={"AuthenticatedClient": "client", "Client": "client"},
+)
+__dir__ = __getattr__.names
 
 __all__ = (
     "AuthenticatedClient",
@@ -0,0 +1,13 @@
+"""Endpoints of Karp API, one submodule per part of the API, loaded lazily."""
+
+from typing import TYPE_CHECKING
+
+from karp_api_client import lazy
+
+if TYPE_CHECKING:
+    from karp_api_client.api import history, querying
+
+__getattr__ = lazy.Loader(__name__, submodules=["history", "querying"])
+__dir__ = __getattr__.names
+
+__all__ = ["history", "querying"]
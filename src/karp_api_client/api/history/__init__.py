@@ -0,0 +1,36 @@
+"""History part of Karp API."""
+
+from typing import TYPE_CHECKING
+
+from karp_api_client import lazy
+
+if TYPE_CHECKING:
+    from karp_api_client.api.history.get_history import (
+        HistoryOptions,
+        get_history_async,
+        get_history_sync,
+    )
+    from karp_api_client.api.history.get_history_for_entry import (
+        get_history_for_entry_async,
+        get_history_for_entry_sync,
+    )
+
+__getattr__ = lazy.Loader(
+    __name__,
+    exports={
+        "HistoryOptions": "get_history",
+        "get_history_async": "get_history",
+        "get_history_sync": "get_history",
+        "get_history_for_entry_async": "get_history_for_entry",
+        "get_history_for_entry_sync": "get_history_for_entry",
+    },
+)
+__dir__ = __getattr__.names
+
+__all__ = [
+    "HistoryOptions",
+    "get_history_async",
+    "get_history_for_entry_async",
+    "get_history_for_entry_sync",
+    "get_history_sync",
+]
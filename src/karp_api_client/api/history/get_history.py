@@ -0,0 +1,165 @@
+"""Get resource history endpoint."""
+
+from http import HTTPStatus
+from typing import Any, Optional, Union
+from urllib import parse
+
+import attrs
+import httpx
+from httpx import codes
+from returns.result import Failure, Result, Success
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.json_backend import parse_response
+from karp_api_client.models.get_history_dto import GetHistoryDto
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.shared import Response
+
+
+@attrs.define
+class HistoryOptions:
+    """Options for filtering and paging the history of a resource."""
+
+    user_id: Optional[str] = attrs.field(default=None)
+    entry_id: Optional[str] = attrs.field(default=None)
+    from_date: Optional[float] = attrs.field(default=None)
+    to_date: Optional[float] = attrs.field(default=None)
+    from_version: Optional[int] = attrs.field(default=None)
+    to_version: Optional[int] = attrs.field(default=None)
+    current_page: Optional[int] = attrs.field(default=None)
+    page_size: Optional[int] = attrs.field(default=None)
+
+    def to_query_string(self) -> str:
+        """Format this object as a query string."""
+        d = {
+            name: value
+            for name, value in (
+                ("user_id", self.user_id),
+                ("entry_id", self.entry_id),
+                ("from_date", self.from_date),
+                ("to_date", self.to_date),
+                ("from_version", self.from_version),
+                ("to_version", self.to_version),
+                ("current_page", self.current_page),
+                ("page_size", self.page_size),
+            )
+            if value is not None
+        }
+
+        if d:
+            return parse.urlencode(d, quote_via=parse.quote)
+        return ""
+
+
+def get_history_sync(
+    resource_id: str,
+    *,
+    client: Union[Client, AuthenticatedClient],
+    history_options: Optional[HistoryOptions] = None,
+) -> Result[Response[GetHistoryDto], Response[Optional[HttpValidationError]]]:
+    """Get History.
+
+    Gets one page of the changes to a resource.
+
+    Args:
+        resource_id : the resource
+        client : the client to use for this API call
+        history_options : optional filters and paging
+
+    Returns:
+        Result[Response[GetHistoryDto], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    kwargs = _get_history_kwargs(resource_id, history_options=history_options)
+    response = client.get_sync_client().request(**kwargs)
+
+    return _build_history_response(client=client, response=response)
+
+
+async def get_history_async(
+    resource_id: str,
+    *,
+    client: Union[Client, AuthenticatedClient],
+    history_options: Optional[HistoryOptions] = None,
+) -> Result[Response[GetHistoryDto], Response[Optional[HttpValidationError]]]:
+    """Get History.
+
+    Gets one page of the changes to a resource.
+
+    Args:
+        resource_id : the resource
+        client : the client to use for this API call
+        history_options : optional filters and paging
+
+    Returns:
+        Result[Response[GetHistoryDto], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    kwargs = _get_history_kwargs(resource_id, history_options=history_options)
+    response = await client.get_async_client().request(**kwargs)
+
+    return _build_history_response(client=client, response=response)
+
+
+def _get_history_kwargs(resource_id: str, *, history_options: Optional[HistoryOptions]) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+
+    qs = "" if history_options is None else history_options.to_query_string()
+    url = f"/history/{parse.quote(resource_id, safe='')}{'?' if qs else ''}{qs}"
+
+    kwargs: dict[str, Any] = {"method": "get", "url": url}
+    headers["Accept"] = "application/json"
+    kwargs["headers"] = headers
+    return kwargs
+
+
+def _build_history_response(
+    *, client: Union[Client, AuthenticatedClient], response: httpx.Response
+) -> Result[Response[GetHistoryDto], Response[Optional[HttpValidationError]]]:
+    return (
+        _parse_history_response(client=client, response=response)
+        .map(
+            lambda resp: Response(
+                status_code=HTTPStatus(response.status_code),
+                content=response.content,
+                headers=response.headers,
+                parsed=resp,
+            )
+        )
+        .alt(
+            lambda opt_resp: Response(
+                status_code=HTTPStatus(response.status_code),
+                content=response.content,
+                headers=response.headers,
+                parsed=opt_resp,
+            )
+        )
+    )
+
+
+def _parse_history_response(
+    *, client: Union[Client, AuthenticatedClient], response: httpx.Response
+) -> Result[GetHistoryDto, Optional[HttpValidationError]]:
+    if response.status_code == codes.OK:
+        response_200 = parse_response(client, response, GetHistoryDto.from_dict)
+
+        return Success(response_200)
+    if response.status_code == codes.UNPROCESSABLE_ENTITY:
+        response_422 = parse_response(client, response, HttpValidationError.from_dict)
+        return Failure(response_422)
+    if client.instrumentation is not None:
+        client.instrumentation.record(response)
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    return Failure(None)
+
+
+__all__ = ["HistoryOptions", "get_history_async", "get_history_sync"]
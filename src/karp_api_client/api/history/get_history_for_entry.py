@@ -0,0 +1,165 @@
+"""Get entry history endpoint."""
+
+from http import HTTPStatus
+from typing import Any, Optional, Union
+from urllib import parse
+
+import httpx
+from httpx import codes
+from returns.result import Failure, Result, Success
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.json_backend import STDLIB_BACKEND, parse_response
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.shared import Response
+
+
+def get_history_for_entry_sync(
+    resource_id: str,
+    entry_id: str,
+    version: Optional[int],
+    *,
+    client: Union[Client, AuthenticatedClient],
+) -> Result[Response[EntryDto], Response[Optional[HttpValidationError]]]:
+    """Get Entry History.
+
+    Gets a version of an entry, or the latest version if `version` is None.
+    Versions are served from `Client.entry_cache`, if any, once cached.
+
+    Args:
+        resource_id : the resource of the entry
+        entry_id : the id of the entry
+        version : the version to get, None for the latest version
+        client : the client to use for this API call
+
+    Returns:
+        Result[Response[EntryDto], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    if (cached := _lookup_cached_entry(resource_id, entry_id, version, client=client)) is not None:
+        return cached
+    kwargs = _get_history_for_entry_kwargs(resource_id, entry_id, version)
+    response = client.get_sync_client().request(**kwargs)
+
+    return _build_history_for_entry_response(resource_id, client=client, response=response)
+
+
+async def get_history_for_entry_async(
+    resource_id: str,
+    entry_id: str,
+    version: Optional[int],
+    *,
+    client: Union[Client, AuthenticatedClient],
+) -> Result[Response[EntryDto], Response[Optional[HttpValidationError]]]:
+    """Get Entry History.
+
+    Gets a version of an entry, or the latest version if `version` is None.
+    Versions are served from `Client.entry_cache`, if any, once cached.
+
+    Args:
+        resource_id : the resource of the entry
+        entry_id : the id of the entry
+        version : the version to get, None for the latest version
+        client : the client to use for this API call
+
+    Returns:
+        Result[Response[EntryDto], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    if (cached := _lookup_cached_entry(resource_id, entry_id, version, client=client)) is not None:
+        return cached
+    kwargs = _get_history_for_entry_kwargs(resource_id, entry_id, version)
+    response = await client.get_async_client().request(**kwargs)
+
+    return _build_history_for_entry_response(resource_id, client=client, response=response)
+
+
+def _get_history_for_entry_kwargs(resource_id: str, entry_id: str, version: Optional[int]) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+
+    url = f"/entries/{parse.quote(resource_id, safe='')}/{parse.quote(entry_id, safe='')}"
+    # the latest version has a route of its own
+    if version is not None:
+        url = f"{url}/{version}"
+
+    kwargs: dict[str, Any] = {"method": "get", "url": url}
+    headers["Accept"] = "application/json"
+    kwargs["headers"] = headers
+    return kwargs
+
+
+def _lookup_cached_entry(
+    resource_id: str, entry_id: str, version: Optional[int], *, client: Union[Client, AuthenticatedClient]
+) -> Optional[Result[Response[EntryDto], Response[Optional[HttpValidationError]]]]:
+    if client.entry_cache is None or version is None:
+        return None
+    payload = client.entry_cache.get(resource_id, entry_id, version, origin=client.identity())
+    if payload is None:
+        return None
+    loads = (client.json_backend or STDLIB_BACKEND).loads
+    return Success(
+        Response(
+            status_code=HTTPStatus.OK,
+            content=payload,
+            headers=httpx.Headers(),
+            parsed=EntryDto.from_dict(loads(payload)),
+        )
+    )
+
+
+def _build_history_for_entry_response(
+    resource_id: str, *, client: Union[Client, AuthenticatedClient], response: httpx.Response
+) -> Result[Response[EntryDto], Response[Optional[HttpValidationError]]]:
+    result: Result[Response[EntryDto], Response[Optional[HttpValidationError]]] = (
+        _parse_history_for_entry_response(client=client, response=response)
+        .map(
+            lambda resp: Response(
+                status_code=HTTPStatus(response.status_code),
+                content=response.content,
+                headers=response.headers,
+                parsed=resp,
+            )
+        )
+        .alt(
+            lambda opt_resp: Response(
+                status_code=HTTPStatus(response.status_code),
+                content=response.content,
+                headers=response.headers,
+                parsed=opt_resp,
+            )
+        )
+    )
+    if client.entry_cache is not None and isinstance(result, Success):
+        entry = result.unwrap().parsed
+        if entry is not None:
+            client.entry_cache.put(resource_id, entry.id, entry.version, response.content, origin=client.identity())
+    return result
+
+
+def _parse_history_for_entry_response(
+    *, client: Union[Client, AuthenticatedClient], response: httpx.Response
+) -> Result[EntryDto, Optional[HttpValidationError]]:
+    if response.status_code == codes.OK:
+        response_200 = parse_response(client, response, EntryDto.from_dict)
+
+        return Success(response_200)
+    if response.status_code == codes.UNPROCESSABLE_ENTITY:
+        response_422 = parse_response(client, response, HttpValidationError.from_dict)
+        return Failure(response_422)
+    if client.instrumentation is not None:
+        client.instrumentation.record(response)
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    return Failure(None)
+
+
+__all__ = ["get_history_for_entry_async", "get_history_for_entry_sync"]
@@ -1,10 +1,108 @@
 """Querying part of Karp API."""
 
-from karp_api_client.api.querying.query import (
-    QueryOptions,
-    QueryResponse,
-    query_async,
-    query_sync,
+from typing import TYPE_CHECKING
+
+from karp_api_client import lazy
+
+if TYPE_CHECKING:
+    from karp_api_client.api.querying.entries import (
+        BulkEntries,
+        get_entries_async,
+        get_entries_by_id_async,
+        get_entries_by_id_sync,
+        get_entries_sync,
+    )
+    from karp_api_client.api.querying.fanout import (
+        fan_out_query,
+        query_fanout_async,
+        query_fanout_sync,
+    )
+    from karp_api_client.api.querying.loader import EntryLoader, LoaderStats
+    from karp_api_client.api.querying.many import (
+        ManyResult,
+        QueryItem,
+        query_many_sync,
+    )
+    from karp_api_client.api.querying.pagination import (
+        PaginationProgress,
+        iter_query_async,
+        iter_query_sync,
+    )
+    from karp_api_client.api.querying.query import (
+        QueryOptions,
+        QueryResponse,
+        query_async,
+        query_sync,
+    )
+    from karp_api_client.api.querying.split import (
+        query_split_async,
+        query_split_sync,
+        split_query,
+    )
+    from karp_api_client.api.querying.streaming import (
+        StreamedQuery,
+        stream_query_async,
+        stream_query_sync,
+    )
+
+__getattr__ = lazy.Loader(
+    __name__,
+    exports={
+        "BulkEntries": "entries",
+        "get_entries_async": "entries",
+        "get_entries_by_id_async": "entries",
+        "get_entries_by_id_sync": "entries",
+        "get_entries_sync": "entries",
+        "fan_out_query": "fanout",
+        "query_fanout_async": "fanout",
+        "query_fanout_sync": "fanout",
+        "EntryLoader": "loader",
+        "LoaderStats": "loader",
+        "ManyResult": "many",
+        "QueryItem": "many",
+        "query_many_sync": "many",
+        "PaginationProgress": "pagination",
+        "iter_query_async": "pagination",
+        "iter_query_sync": "pagination",
+        "QueryOptions": "query",
+        "QueryResponse": "query",
+        "query_async": "query",
+        "query_sync": "query",
+        "query_split_async": "split",
+        "query_split_sync": "split",
+        "split_query": "split",
+        "StreamedQuery": "streaming",
+        "stream_query_async": "streaming",
+        "stream_query_sync": "streaming",
+    },
 )
+__dir__ = __getattr__.names
 
-__all__ = ["QueryOptions", "QueryResponse", "query_async", "query_sync"]
+__all__ = [
+    "BulkEntries",
+    "EntryLoader",
+    "LoaderStats",
+    "ManyResult",
+    "PaginationProgress",
+    "QueryItem",
+    "QueryOptions",
+    "QueryResponse",
+    "StreamedQuery",
+    "fan_out_query",
+    "get_entries_async",
+    "get_entries_by_id_async",
+    "get_entries_by_id_sync",
+    "get_entries_sync",
+    "iter_query_async",
+    "iter_query_sync",
+    "query_async",
+    "query_fanout_async",
+    "query_fanout_sync",
+    "query_many_sync",
+    "query_split_async",
+    "query_split_sync",
+    "query_sync",
+    "split_query",
+    "stream_query_async",
+    "stream_query_sync",
+]
@@ -0,0 +1,323 @@
+"""Get entries by id endpoint."""
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Optional, Union
+from urllib import parse
+
+import attrs
+import httpx
+from httpx import codes
+from returns.result import Failure, Result, Success
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.json_backend import parse_response
+from karp_api_client.models.entries_by_id_response import EntriesByIdResponse
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.shared import Response
+
+DEFAULT_MAX_URL_LENGTH = 2000
+DEFAULT_MAX_IDS_PER_REQUEST = 100
+
+
+@attrs.define
+class BulkEntries:
+    """Result of fetching many entries by id.
+
+    Attributes:
+    entries (list[Optional[EntryDto]]): the entry for each requested id, in input order, None if missing.
+    missing (list[str]): requested ids that Karp returned no entry for, in input order.
+    requests (int): number of requests sent.
+    """
+
+    entries: list[Optional[EntryDto]]
+    missing: list[str]
+    requests: int
+
+
+def get_entries_by_id_sync(
+    resource_id: str,
+    entry_ids: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+) -> Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]:
+    """Get Entries By Id.
+
+    Args:
+        resource_id : the resource to get entries from
+        entry_ids : sequence of entry ids as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+
+    Returns:
+        Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    kwargs = _get_entries_by_id_kwargs(resource_id=resource_id, entry_ids=entry_ids)
+    response = client.get_sync_client().request(**kwargs)
+
+    return _build_entries_by_id_response(client=client, response=response)
+
+
+async def get_entries_by_id_async(
+    resource_id: str,
+    entry_ids: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+) -> Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]:
+    """Get Entries By Id.
+
+    Args:
+        resource_id : the resource to get entries from
+        entry_ids : sequence of entry ids as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+
+    Returns:
+        Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    kwargs = _get_entries_by_id_kwargs(resource_id=resource_id, entry_ids=entry_ids)
+    response = await client.get_async_client().request(**kwargs)
+
+    return _build_entries_by_id_response(client=client, response=response)
+
+
+def get_entries_sync(
+    resource_id: str,
+    entry_ids: Iterable[str],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    max_ids_per_request: int = DEFAULT_MAX_IDS_PER_REQUEST,
+    concurrency: int = 4,
+) -> BulkEntries:
+    """Get any number of entries by id.
+
+    The ids are split into chunks that keep each URL within `max_url_length`,
+    and the chunks are fetched concurrently on a thread pool sharing the
+    client's `httpx.Client`.
+
+    Args:
+        resource_id : the resource to get entries from
+        entry_ids : the ids to get, duplicates are fetched once
+        client : the client to use for this API call
+        max_url_length : maximum length of each request URL, including the base url
+                         and the `api_key` of an AuthenticatedClient
+        max_ids_per_request : maximum number of ids in each request
+        concurrency : maximum number of requests in flight
+
+    Returns:
+        BulkEntries with the entries in input order and the missing ids
+
+    Raises:
+        errors.QueryFailed: If a chunk could not be fetched.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    entry_ids = list(entry_ids)
+    chunks = chunk_entry_ids(
+        resource_id,
+        entry_ids,
+        base_url=str(client.get_sync_client().base_url),
+        max_url_length=max_url_length - _auth_url_length(client),
+        max_ids_per_request=max_ids_per_request,
+    )
+    if len(chunks) <= 1 or concurrency <= 1:
+        results = [get_entries_by_id_sync(resource_id, chunk, client=client) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(
+                executor.map(lambda chunk: get_entries_by_id_sync(resource_id, chunk, client=client), chunks)
+            )
+    return _collect_entries(entry_ids, results)
+
+
+async def get_entries_async(
+    resource_id: str,
+    entry_ids: Iterable[str],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    max_ids_per_request: int = DEFAULT_MAX_IDS_PER_REQUEST,
+    concurrency: int = 4,
+) -> BulkEntries:
+    """Get any number of entries by id.
+
+    The ids are split into chunks that keep each URL within `max_url_length`,
+    and the chunks are fetched concurrently over the client's `httpx.AsyncClient`.
+
+    Args:
+        resource_id : the resource to get entries from
+        entry_ids : the ids to get, duplicates are fetched once
+        client : the client to use for this API call
+        max_url_length : maximum length of each request URL, including the base url
+                         and the `api_key` of an AuthenticatedClient
+        max_ids_per_request : maximum number of ids in each request
+        concurrency : maximum number of requests in flight
+
+    Returns:
+        BulkEntries with the entries in input order and the missing ids
+
+    Raises:
+        errors.QueryFailed: If a chunk could not be fetched.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    entry_ids = list(entry_ids)
+    chunks = chunk_entry_ids(
+        resource_id,
+        entry_ids,
+        base_url=str(client.get_async_client().base_url),
+        max_url_length=max_url_length - _auth_url_length(client),
+        max_ids_per_request=max_ids_per_request,
+    )
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _fetch(
+        chunk: list[str],
+    ) -> Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]:
+        async with semaphore:
+            return await get_entries_by_id_async(resource_id, chunk, client=client)
+
+    results = await asyncio.gather(*(_fetch(chunk) for chunk in chunks))
+    return _collect_entries(entry_ids, results)
+
+
+def chunk_entry_ids(
+    resource_id: str,
+    entry_ids: Iterable[str],
+    *,
+    base_url: str = "",
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    max_ids_per_request: int = DEFAULT_MAX_IDS_PER_REQUEST,
+) -> list[list[str]]:
+    """Split unique `entry_ids` into chunks whose request URLs fit in `max_url_length`.
+
+    Raises:
+        ValueError: If a single id does not fit in `max_url_length`.
+    """
+    prefix_length = len(base_url.rstrip("/")) + len(_entries_by_id_url(resource_id, []))
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    length = prefix_length
+    for entry_id in dict.fromkeys(entry_ids):
+        id_length = len(parse.quote(entry_id, safe=""))
+        separator = 1 if chunk else 0
+        if chunk and (length + separator + id_length > max_url_length or len(chunk) >= max_ids_per_request):
+            chunks.append(chunk)
+            chunk, length, separator = [], prefix_length, 0
+        if prefix_length + id_length > max_url_length:
+            raise ValueError(f"entry id {entry_id!r} does not fit in a URL of length {max_url_length}")
+        chunk.append(entry_id)
+        length += separator + id_length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _collect_entries(
+    entry_ids: list[str],
+    results: Iterable[Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]],
+) -> BulkEntries:
+    found: dict[str, EntryDto] = {}
+    requests = 0
+    for result in results:
+        requests += 1
+        if isinstance(result, Failure):
+            raise errors.QueryFailed(result.failure())
+        parsed = result.unwrap().parsed
+        if parsed is None:
+            raise errors.QueryFailed(result.unwrap())
+        for entry in parsed.hits:
+            found[entry.id] = entry
+    entries = [found.get(entry_id) for entry_id in entry_ids]
+    missing = [entry_id for entry_id, entry in zip(entry_ids, entries) if entry is None]
+    return BulkEntries(entries=entries, missing=missing, requests=requests)
+
+
+def _auth_url_length(client: Union[Client, AuthenticatedClient]) -> int:
+    """Get the number of characters the authentication of `client` adds to a request URL."""
+    params = client.auth_params()
+    if not params:
+        return 0
+    # appended after "?" or "&"
+    return 1 + len(str(httpx.QueryParams(params)))
+
+
+def _entries_by_id_url(resource_id: str, entry_ids: Sequence[str]) -> str:
+    ids = ",".join(parse.quote(entry_id, safe="") for entry_id in entry_ids)
+    return f"/query/entries/{parse.quote(resource_id, safe='')}/{ids}"
+
+
+def _get_entries_by_id_kwargs(resource_id: str, *, entry_ids: Union[str, Sequence[str]]) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+
+    entry_ids_ = entry_ids.split(",") if isinstance(entry_ids, str) else entry_ids
+
+    kwargs: dict[str, Any] = {"method": "get", "url": _entries_by_id_url(resource_id, entry_ids_)}
+    headers["Accept"] = "application/json"
+    kwargs["headers"] = headers
+    return kwargs
+
+
+def _build_entries_by_id_response(
+    *, client: Union[Client, AuthenticatedClient], response: httpx.Response
+) -> Result[Response[EntriesByIdResponse], Response[Optional[HttpValidationError]]]:
+    return (
+        _parse_entries_by_id_response(client=client, response=response)
+        .map(
+            lambda resp: Response(
+                status_code=HTTPStatus(response.status_code),
+                content=response.content,
+                headers=response.headers,
+                parsed=resp,
+            )
+        )
+        .alt(
+            lambda opt_resp: Response(
+                status_code=HTTPStatus(response.status_code),
+                content=response.content,
+                headers=response.headers,
+                parsed=opt_resp,
+            )
+        )
+    )
+
+
+def _parse_entries_by_id_response(
+    *, client: Union[Client, AuthenticatedClient], response: httpx.Response
+) -> Result[EntriesByIdResponse, Optional[HttpValidationError]]:
+    if response.status_code == codes.OK:
+        response_200 = parse_response(client, response, EntriesByIdResponse.from_dict)
+
+        return Success(response_200)
+    if response.status_code == codes.UNPROCESSABLE_ENTITY:
+        response_422 = parse_response(client, response, HttpValidationError.from_dict)
+        return Failure(response_422)
+    if client.instrumentation is not None:
+        client.instrumentation.record(response)
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    return Failure(None)
+
+
+__all__ = [
+    "BulkEntries",
+    "chunk_entry_ids",
+    "get_entries_async",
+    "get_entries_by_id_async",
+    "get_entries_by_id_sync",
+    "get_entries_sync",
+]
@@ -0,0 +1,154 @@
+"""Fan-out of a query over several resources to one request per resource."""
+
+import asyncio
+import itertools
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Optional, Union
+
+import attrs
+from returns.result import Failure, Result, Success
+
+from karp_api_client import AuthenticatedClient, Client
+from karp_api_client.api.querying.merge import KARP_DEFAULT_SIZE, merge_distributions, merge_sorted
+from karp_api_client.api.querying.query import QueryOptions, query_async, query_sync
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.models.query_response import QueryResponse
+from karp_api_client.shared import Response
+
+
+def query_fanout_sync(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    concurrency: Optional[int] = None,
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    """Query, sending one request per resource concurrently on a thread pool and merging the hits.
+
+    See `fan_out_query` for how the hits are merged. A slow resource only
+    delays its own request, and each resource is cached separately by
+    `Client.cache`. The merged response has no `content`.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options
+        concurrency : maximum number of requests in flight, all of them by default
+
+    Returns:
+        Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    parts = fan_out_query(resources, query_options=query_options)
+    if len(parts) == 1:
+        return query_sync(resources, client=client, query_options=query_options)
+    with ThreadPoolExecutor(max_workers=max(concurrency or len(parts), 1)) as executor:
+        results = list(executor.map(lambda part: query_sync(part[0], client=client, query_options=part[1]), parts))
+    return _merge_results(results, query_options=query_options)
+
+
+async def query_fanout_async(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    concurrency: Optional[int] = None,
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    """Query, sending one request per resource concurrently and merging the hits.
+
+    See `fan_out_query` for how the hits are merged. A slow resource only
+    delays its own request, and each resource is cached separately by
+    `Client.cache`. The merged response has no `content`.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options
+        concurrency : maximum number of requests in flight, all of them by default
+
+    Returns:
+        Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    parts = fan_out_query(resources, query_options=query_options)
+    if len(parts) == 1:
+        return await query_async(resources, client=client, query_options=query_options)
+    semaphore = asyncio.Semaphore(max(concurrency or len(parts), 1))
+
+    async def _query(
+        resource: str, part: QueryOptions
+    ) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+        async with semaphore:
+            return await query_async(resource, client=client, query_options=part)
+
+    results = await asyncio.gather(*itertools.starmap(_query, parts))
+    return _merge_results(results, query_options=query_options)
+
+
+def fan_out_query(
+    resources: Union[str, Sequence[str]], *, query_options: Optional[QueryOptions] = None
+) -> list[tuple[str, QueryOptions]]:
+    """Split a query over several resources into one query per resource.
+
+    Each resource is asked for its first `from_ + size` hits, so that the
+    merged hits can be paged like the original query. The hits of the
+    resources, each sorted by `sort`, are merged with a k-way merge on the
+    `sort` keys, or follow each other in the order of `resources` if there
+    is no `sort`. `total` and `distribution` are the sums of the resources.
+    """
+    query_options = query_options or QueryOptions()
+    names = list(dict.fromkeys(resources.split(",") if isinstance(resources, str) else resources))
+    if len(names) == 1:
+        return [(names[0], query_options)]
+    from_ = query_options.from_ or 0
+    part_options = attrs.evolve(
+        query_options,
+        from_=None,
+        size=from_ + (KARP_DEFAULT_SIZE if query_options.size is None else query_options.size),
+    )
+    return [(name, part_options) for name in names]
+
+
+def _merge_results(
+    results: Iterable[Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]],
+    *,
+    query_options: Optional[QueryOptions],
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    query_options = query_options or QueryOptions()
+    responses = []
+    for result in results:
+        if isinstance(result, Failure):
+            return result
+        responses.append(result.unwrap())
+    parsed = [response.parsed for response in responses if response.parsed is not None]
+    hits = merge_sorted(
+        (response.hits for response in parsed),
+        sort=query_options.sort,
+        from_=query_options.from_ or 0,
+        size=KARP_DEFAULT_SIZE if query_options.size is None else query_options.size,
+    )
+    return Success(
+        Response(
+            status_code=HTTPStatus.OK,
+            content=b"",
+            headers=responses[0].headers,
+            parsed=QueryResponse(
+                total=sum(response.total for response in parsed),
+                hits=hits,
+                distribution=merge_distributions(response.distribution for response in parsed),
+            ),
+        )
+    )
+
+
+__all__ = ["fan_out_query", "query_fanout_async", "query_fanout_sync"]
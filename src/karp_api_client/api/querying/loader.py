@@ -0,0 +1,158 @@
+"""Batching of many small lookups into one query."""
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union
+
+import attrs
+
+from karp_api_client import AuthenticatedClient, Client, dsl
+from karp_api_client.api.querying.merge import field_value
+from karp_api_client.api.querying.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PaginationProgress,
+    iter_query_async,
+)
+from karp_api_client.api.querying.query import QueryOptions
+from karp_api_client.models.entry_dto import EntryDto
+
+_Key = tuple[str, str]
+
+
+@attrs.define
+class LoaderStats:
+    """Counters for an EntryLoader.
+
+    Attributes:
+    loads (int): lookups requested.
+    coalesced (int): lookups that joined an identical pending lookup.
+    batches (int): batches sent.
+    requests (int): requests sent, more than one for batches with many hits.
+    """
+
+    loads: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    requests: int = 0
+
+
+class EntryLoader:
+    """Batch `dsl.Equals` lookups made close together into one `dsl.Or` query.
+
+    Lookups made within `delay` seconds, or within the same event loop
+    iteration with the default `delay` of 0, are sent together as one query,
+    and every hit is routed to the lookups whose field it matches exactly.
+    All hits of a batch are fetched, one page of `page_size` hits at a time.
+
+    ```python
+    loader = EntryLoader("saldo", client=client)
+    hits = await loader.load(dsl.Equals(field="baseform", value="katt"))
+    ```
+
+    A loader must only be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        resources: Union[str, Sequence[str]],
+        *,
+        client: Union[Client, AuthenticatedClient],
+        delay: float = 0.0,
+        max_batch_size: int = 100,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        """Construct an EntryLoader for queries to `resources`."""
+        self.resources = resources
+        self.client = client
+        self.delay = delay
+        self.max_batch_size = max_batch_size
+        self.page_size = page_size
+        self.stats = LoaderStats()
+        self._pending: dict[_Key, asyncio.Future[list[EntryDto]]] = {}
+        self._timer: Optional[asyncio.Handle] = None
+        self._batches: set[asyncio.Task[None]] = set()
+
+    async def load(self, query: dsl.Equals) -> list[EntryDto]:
+        """Get the hits of `query`, batched with other lookups.
+
+        Raises:
+            errors.QueryFailed: If the batch could not be fetched.
+        """
+        self.stats.loads += 1
+        key = (str(query.field), str(query.value))
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = (
+                    loop.call_later(self.delay, self._dispatch) if self.delay > 0 else loop.call_soon(self._dispatch)
+                )
+        else:
+            self.stats.coalesced += 1
+        # shielded, so that a cancelled caller does not fail the others waiting for the same lookup
+        return await asyncio.shield(future)
+
+    async def load_many(self, queries: Iterable[dsl.Equals]) -> list[list[EntryDto]]:
+        """Get the hits of each of `queries`, in order."""
+        return list(await asyncio.gather(*(self.load(query) for query in queries)))
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self.stats.batches += 1
+        task = asyncio.ensure_future(self._fetch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _fetch(self, batch: dict[_Key, "asyncio.Future[list[EntryDto]]"]) -> None:
+        queries = [dsl.Equals(field=field, value=value) for field, value in batch]
+        q: dsl.Query = queries[0] if len(queries) == 1 else dsl.Or.from_iterable(queries)
+        fields = {field for field, _ in batch}
+        hits: dict[_Key, list[EntryDto]] = {key: [] for key in batch}
+        progress = PaginationProgress()
+        try:
+            async for entry in iter_query_async(
+                self.resources,
+                client=self.client,
+                query_options=QueryOptions(q=q),
+                page_size=self.page_size,
+                progress=progress,
+            ):
+                for field in fields:
+                    for value in _values(field_value(entry, field)):
+                        if (key := (field, value)) in hits:
+                            hits[key].append(entry)
+        except BaseException as exc:
+            for future in batch.values():
+                if future.done():
+                    continue
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(hits[key])
+        finally:
+            self.stats.requests += progress.pages_fetched
+
+
+def _values(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [str(value)]
+
+
+__all__ = ["EntryLoader", "LoaderStats"]
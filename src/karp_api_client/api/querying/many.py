@@ -0,0 +1,111 @@
+"""Many queries at once from sync code, on a thread pool."""
+
+import concurrent.futures
+import time
+from collections.abc import Generator, Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Union
+
+from returns.result import Failure, Result
+
+from karp_api_client import AuthenticatedClient, Client
+from karp_api_client.api.querying.query import QueryOptions, query_sync
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.models.query_response import QueryResponse
+from karp_api_client.shared import Response
+
+QueryItem = tuple[Union[str, Sequence[str]], Optional[QueryOptions]]
+"""Resources and query options of one query."""
+
+ManyResult = Result[Response[QueryResponse], Union[Response[Optional[HttpValidationError]], Exception]]
+"""Result of one query, failing with the failed response or with the exception raised."""
+
+
+def query_many_sync(
+    queries: Iterable[QueryItem],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    max_workers: int = 8,
+    ordered: bool = True,
+    timeout: Optional[float] = None,
+) -> Generator[tuple[int, ManyResult], None, None]:
+    """Send many queries concurrently on a thread pool and yield their results.
+
+    The queries share the `httpx.Client` of `client`, and so its connection
+    pool, cache and rate limit. At most `max_workers` queries are in flight.
+    The queries are sent when iteration starts.
+
+    Each result is yielded with the index of its query, in the order of
+    `queries` or, if not `ordered`, as soon as it is done. A query that raises
+    fails with the exception instead of stopping the others. Queries not
+    done `timeout` seconds after iteration started fail with a `TimeoutError`,
+    and those not yet sent are cancelled.
+
+    ```python
+    lookups = [("saldo", QueryOptions(q=dsl.Equals(field="baseform", value=word))) for word in words]
+    results = [result for _, result in query_many_sync(lookups, client=client)]
+    ```
+
+    Args:
+        queries : pairs of resources and query options
+        client : the client to use for these API calls
+        max_workers : maximum number of queries in flight
+        ordered : yield the results in the order of `queries`, rather than as they are done
+        timeout : seconds until all queries must be done, None to wait as long as it takes
+
+    Yields:
+        tuple[int, ManyResult]: the index of each query and its result
+
+    Raises:
+        ValueError: If `max_workers` is less than 1.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be positive, got {max_workers}")
+    items = list(queries)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    # created here, so that the threads do not race to create it
+    client.get_sync_client()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="karp-query")
+    try:
+        futures = [executor.submit(_query, resources, options, client) for resources, options in items]
+        if ordered:
+            for index, future in enumerate(futures):
+                yield index, _result(future, deadline)
+        else:
+            yield from _as_completed(futures, deadline)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _query(
+    resources: Union[str, Sequence[str]], options: Optional[QueryOptions], client: Union[Client, AuthenticatedClient]
+) -> ManyResult:
+    try:
+        return query_sync(resources, client=client, query_options=options)
+    except Exception as exc:
+        return Failure(exc)
+
+
+def _result(future: "Future[ManyResult]", deadline: Optional[float]) -> ManyResult:
+    try:
+        return future.result(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        return Failure(TimeoutError("query not done before the deadline"))
+
+
+def _as_completed(
+    futures: list["Future[ManyResult]"], deadline: Optional[float]
+) -> Generator[tuple[int, ManyResult], None, None]:
+    indexes = {future: index for index, future in enumerate(futures)}
+    timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+    try:
+        for future in concurrent.futures.as_completed(futures, timeout=timeout):
+            yield indexes.pop(future), future.result()
+    except concurrent.futures.TimeoutError:
+        for future in sorted(indexes, key=indexes.__getitem__):
+            future.cancel()
+            yield indexes[future], Failure(TimeoutError("query not done before the deadline"))
+
+
+__all__ = ["ManyResult", "QueryItem", "query_many_sync"]
@@ -0,0 +1,91 @@
+"""Helpers for merging the hits of several queries."""
+
+import heapq
+import itertools
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Optional
+
+from karp_api_client.models.entry_dto import EntryDto
+
+KARP_DEFAULT_SIZE = 25
+"""Number of hits Karp returns when no size is given."""
+
+
+def parse_sort(sort: Optional[Sequence[str]]) -> list[tuple[str, bool]]:
+    """Parse Karp sort fields like `"baseform|desc"` into `(field, descending)` pairs."""
+    fields = []
+    for item in sort or ():
+        field, _, order = item.partition("|")
+        fields.append((field.strip(), order.strip().lower() == "desc"))
+    return fields
+
+
+def field_value(entry: EntryDto, field: str) -> Any:
+    """Look up a, possibly dotted, `field` in `entry.entry`, falling back to the attributes of `entry`."""
+    value: Any = entry.entry.additional_properties
+    for name in field.split("."):
+        if not isinstance(value, dict) or name not in value:
+            return getattr(entry, field.lstrip("_"), None)
+        value = value[name]
+    return value
+
+
+class _SortValue:
+    """A sort value that orders missing values last in either direction."""
+
+    __slots__ = ("descending", "value")
+
+    def __init__(self, value: Any, *, descending: bool) -> None:
+        if isinstance(value, list):
+            value = value[0] if value else None
+        self.value = value
+        self.descending = descending
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _SortValue) and self.value == other.value
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __lt__(self, other: "_SortValue") -> bool:
+        if self.value is None or other.value is None:
+            return self.value is not None and other.value is None
+        a, b = (other.value, self.value) if self.descending else (self.value, other.value)
+        try:
+            return bool(a < b)
+        except TypeError:
+            return str(a) < str(b)
+
+
+def sort_key(sort: Optional[Sequence[str]]) -> Callable[[EntryDto], tuple[_SortValue, ...]]:
+    """Build a key function ordering entries like Karp's `sort` option."""
+    fields = parse_sort(sort)
+
+    def _key(entry: EntryDto) -> tuple[_SortValue, ...]:
+        return tuple(_SortValue(field_value(entry, field), descending=descending) for field, descending in fields)
+
+    return _key
+
+
+def merge_sorted(
+    hits: Iterable[Iterable[EntryDto]], *, sort: Optional[Sequence[str]], from_: int, size: int
+) -> list[EntryDto]:
+    """Page through the k-way merge of hit lists that are each sorted by `sort`.
+
+    Only `from_ + size` hits are taken from the merge. Without `sort`, the
+    lists are concatenated in order.
+    """
+    merged = heapq.merge(*hits, key=sort_key(sort)) if sort else itertools.chain.from_iterable(hits)
+    return list(itertools.islice(merged, from_, from_ + size))
+
+
+def merge_distributions(distributions: Iterable[Optional[dict[str, int]]]) -> Optional[dict[str, int]]:
+    """Sum hits per resource, None if no distribution was given."""
+    merged: Optional[dict[str, int]] = None
+    for distribution in distributions:
+        if distribution is None:
+            continue
+        if merged is None:
+            merged = {}
+        for resource, count in distribution.items():
+            merged[resource] = merged.get(resource, 0) + count
+    return merged
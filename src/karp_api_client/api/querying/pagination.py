@@ -0,0 +1,200 @@
+"""Paginated iteration over the query endpoint."""
+
+import asyncio
+import itertools
+from collections import deque
+from collections.abc import AsyncGenerator, Generator, Sequence
+from typing import Optional, Union
+
+import attrs
+from returns.result import Failure, Result
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.api.querying.query import QueryOptions, query_async, query_sync
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.models.query_response import QueryResponse
+from karp_api_client.shared import Response
+
+DEFAULT_PAGE_SIZE = 100
+
+
+@attrs.define
+class PaginationProgress:
+    """Progress of a paginated query.
+
+    Pass an instance to `iter_query_sync` or `iter_query_async` and it is
+    updated in place while iterating.
+
+    Attributes:
+    pages_fetched (int): number of pages fetched so far.
+    hits_yielded (int): number of hits yielded so far.
+    bytes_read (int): number of response body bytes read so far.
+    total (Optional[int]): total number of hits reported by Karp, once known.
+    """
+
+    pages_fetched: int = 0
+    hits_yielded: int = 0
+    bytes_read: int = 0
+    total: Optional[int] = None
+
+
+def iter_query_sync(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    page_size: Optional[int] = None,
+    progress: Optional[PaginationProgress] = None,
+) -> Generator[EntryDto, None, None]:
+    """Iterate over all hits of a query, fetching one page at a time.
+
+    Only one page is held in memory at a time. Iteration starts at
+    `query_options.from_` and stops when `QueryResponse.total` is reached.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options, `from_` is used as start offset
+        page_size : number of hits per page, defaults to `query_options.size` or `DEFAULT_PAGE_SIZE`
+        progress : optional progress object that is updated while iterating
+
+    Yields:
+        EntryDto: each hit in order
+
+    Raises:
+        errors.QueryFailed: If a page could not be fetched.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    query_options = query_options or QueryOptions()
+    progress = progress if progress is not None else PaginationProgress()
+    offset = query_options.from_ or 0
+    size = _page_size(query_options, page_size)
+    while True:
+        result = query_sync(resources, client=client, query_options=_page_options(query_options, offset, size))
+        page = _unwrap_page(result, progress)
+        for hit in page.hits:
+            progress.hits_yielded += 1
+            yield hit
+        offset += len(page.hits)
+        if _is_last_page(page, offset):
+            return
+
+
+async def iter_query_async(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    page_size: Optional[int] = None,
+    progress: Optional[PaginationProgress] = None,
+    concurrency: int = 1,
+) -> AsyncGenerator[EntryDto, None]:
+    """Iterate over all hits of a query, fetching one page at a time.
+
+    Iteration starts at `query_options.from_` and stops when `QueryResponse.total` is reached.
+
+    With `concurrency` greater than 1, the remaining pages are fetched concurrently
+    over the shared `httpx.AsyncClient` once the first page has reported `total`.
+    At most `concurrency` pages are in flight or buffered at a time and hits are
+    still yielded in order. Concurrent fetching requires asyncio.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options, `from_` is used as start offset
+        page_size : number of hits per page, defaults to `query_options.size` or `DEFAULT_PAGE_SIZE`
+        progress : optional progress object that is updated while iterating
+        concurrency : maximum number of pages to fetch concurrently
+
+    Yields:
+        EntryDto: each hit in order
+
+    Raises:
+        errors.QueryFailed: If a page could not be fetched.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+        ValueError: If `page_size` or `concurrency` is less than 1.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+    query_options = query_options or QueryOptions()
+    progress = progress if progress is not None else PaginationProgress()
+    offset = query_options.from_ or 0
+    size = _page_size(query_options, page_size)
+    while True:
+        result = await query_async(resources, client=client, query_options=_page_options(query_options, offset, size))
+        page = _unwrap_page(result, progress)
+        for hit in page.hits:
+            progress.hits_yielded += 1
+            yield hit
+        offset += len(page.hits)
+        if _is_last_page(page, offset):
+            return
+        if concurrency > 1:
+            break
+
+    # `total` is known, so the remaining offsets are independent of each other
+    offsets = iter(range(offset, page.total, size))
+    pending: deque[asyncio.Future] = deque()
+
+    def _schedule(n: int) -> None:
+        for next_offset in itertools.islice(offsets, n):
+            pending.append(
+                asyncio.ensure_future(
+                    query_async(resources, client=client, query_options=_page_options(query_options, next_offset, size))
+                )
+            )
+
+    _schedule(concurrency)
+    try:
+        while pending:
+            result = await pending.popleft()
+            _schedule(1)
+            page = _unwrap_page(result, progress)
+            for hit in page.hits:
+                progress.hits_yielded += 1
+                yield hit
+            if not page.hits:
+                return
+    finally:
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _page_size(query_options: QueryOptions, page_size: Optional[int]) -> int:
+    size = page_size or query_options.size or DEFAULT_PAGE_SIZE
+    if size < 1:
+        raise ValueError(f"page_size must be positive, got {size}")
+    return size
+
+
+def _page_options(query_options: QueryOptions, offset: int, size: int) -> QueryOptions:
+    return attrs.evolve(query_options, from_=offset, size=size)
+
+
+def _unwrap_page(
+    result: Result[Response[QueryResponse], Response[Optional[HttpValidationError]]],
+    progress: PaginationProgress,
+) -> QueryResponse:
+    if isinstance(result, Failure):
+        raise errors.QueryFailed(result.failure())
+    response = result.unwrap()
+    progress.pages_fetched += 1
+    progress.bytes_read += len(response.content)
+    if response.parsed is None:
+        raise errors.QueryFailed(response)
+    progress.total = response.parsed.total
+    return response.parsed
+
+
+def _is_last_page(page: QueryResponse, offset: int) -> bool:
+    # an empty page guards against looping forever if `total` overstates the hits
+    return not page.hits or offset >= page.total
+
+
+__all__ = ["DEFAULT_PAGE_SIZE", "PaginationProgress", "iter_query_async", "iter_query_sync"]
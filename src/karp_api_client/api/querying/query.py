@@ -2,7 +2,7 @@
 
 from collections.abc import Sequence
 from http import HTTPStatus
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 from urllib import parse
 
 import attrs
@@ -11,6 +11,8 @@ from httpx import codes
 from returns.result import Failure, Result, Success
 
 from karp_api_client import AuthenticatedClient, Client, dsl, errors
+from karp_api_client.cache import CacheEntry, cache_key
+from karp_api_client.json_backend import parse_response
 from karp_api_client.models.http_validation_error import HttpValidationError
 from karp_api_client.models.query_response import QueryResponse
 from karp_api_client.shared import Response
@@ -76,9 +78,17 @@ def query_sync(
         resources=resources,
         query_options=query_options,
     )
-    response = client.get_sync_client().request(**kwargs)
+    cached, stale = _lookup_cached_query(client=client, kwargs=kwargs)
+    if cached is not None:
+        return cached
 
-    return _build_query_response(client=client, response=response)
+    def _send() -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+        response = client.get_sync_client().request(**kwargs)
+        return _build_cached_query_response(client=client, kwargs=kwargs, stale=stale, response=response)
+
+    if client.single_flight is None:
+        return _send()
+    return client.single_flight.do(cache_key(kwargs, client), _send)
 
 
 async def query_async(
@@ -106,9 +116,17 @@ async def query_async(
         resources=resources,
         query_options=query_options,
     )
-    response = await client.get_async_client().request(**kwargs)
+    cached, stale = _lookup_cached_query(client=client, kwargs=kwargs)
+    if cached is not None:
+        return cached
+
+    async def _send() -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+        response = await client.get_async_client().request(**kwargs)
+        return _build_cached_query_response(client=client, kwargs=kwargs, stale=stale, response=response)
 
-    return _build_query_response(client=client, response=response)
+    if client.single_flight is None:
+        return await _send()
+    return await client.single_flight.do_async(cache_key(kwargs, client), _send)
 
 
 def _get_query_kwargs(resources: Union[Sequence[str], str], *, query_options: Optional[QueryOptions]) -> dict[str, Any]:
@@ -125,6 +143,38 @@ def _get_query_kwargs(resources: Union[Sequence[str], str], *, query_options: Op
     return kwargs
 
 
+def _lookup_cached_query(
+    *, client: Union[Client, AuthenticatedClient], kwargs: dict[str, Any]
+) -> tuple[Optional[Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]], Optional[CacheEntry]]:
+    if client.cache is None:
+        return None, None
+    cached, stale = client.cache.lookup(cache_key(kwargs, client))
+    if cached is not None:
+        return Success(cast(Response[QueryResponse], cached)), None
+    if stale is not None:
+        kwargs["headers"].update(stale.conditional_headers())
+    return None, stale
+
+
+def _build_cached_query_response(
+    *,
+    client: Union[Client, AuthenticatedClient],
+    kwargs: dict[str, Any],
+    stale: Optional[CacheEntry],
+    response: httpx.Response,
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    if client.cache is None:
+        return _build_query_response(client=client, response=response)
+    cache = client.cache
+    key = cache_key(kwargs, client)
+    if stale is not None and response.status_code == codes.NOT_MODIFIED:
+        return Success(cast(Response[QueryResponse], cache.revalidated(key, stale, response.headers)))
+    result = _build_query_response(client=client, response=response)
+    if isinstance(result, Success):
+        cache.store(key, result.unwrap())
+    return result
+
+
 def _build_query_response(
     *, client: Union[Client, AuthenticatedClient], response: httpx.Response
 ) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
@@ -153,12 +203,16 @@ def _parse_query_response(
     *, client: Union[Client, AuthenticatedClient], response: httpx.Response
 ) -> Result[QueryResponse, Optional[HttpValidationError]]:
     if response.status_code == codes.OK:
-        response_200 = QueryResponse.from_dict(response.json())
+        response_200 = parse_response(
+            client, response, lambda data: QueryResponse.from_dict(data, lazy_hits=client.lazy_hits)
+        )
 
         return Success(response_200)
     if response.status_code == codes.UNPROCESSABLE_ENTITY:
-        response_422 = HttpValidationError.from_dict(response.json())
+        response_422 = parse_response(client, response, HttpValidationError.from_dict)
         return Failure(response_422)
+    if client.instrumentation is not None:
+        client.instrumentation.record(response)
     if client.raise_on_unexpected_status:
         raise errors.UnexpectedStatus(response.status_code, response.content)
     return Failure(None)
@@ -0,0 +1,222 @@
+"""Splitting of queries that are too long for a URL."""
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Optional, Union
+from urllib import parse
+
+import attrs
+from returns.result import Failure, Result, Success
+
+from karp_api_client import AuthenticatedClient, Client, dsl
+from karp_api_client.api.querying.entries import DEFAULT_MAX_URL_LENGTH, _auth_url_length
+from karp_api_client.api.querying.merge import KARP_DEFAULT_SIZE, merge_distributions, sort_key
+from karp_api_client.api.querying.query import (
+    QueryOptions,
+    _get_query_kwargs,
+    query_async,
+    query_sync,
+)
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.models.query_response import QueryResponse
+from karp_api_client.shared import Response
+
+_OR_SEPARATOR_LENGTH = len(parse.quote("||", safe=""))
+
+
+def query_split_sync(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    concurrency: int = 4,
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    """Query, splitting a `dsl.Or` query that does not fit in `max_url_length` into several requests.
+
+    A query that fits is sent as is. Otherwise the queries of the Or are split
+    into sub-queries that fit, which are sent concurrently on a thread pool,
+    and their hits are merged, see `split_query` for the details. The merged
+    response has no `content`.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options
+        max_url_length : maximum length of each request URL, including the base url
+                         and the `api_key` of an AuthenticatedClient
+        concurrency : maximum number of requests in flight
+
+    Returns:
+        Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        ValueError: If a single query of the Or does not fit in `max_url_length`.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    parts = split_query(
+        resources,
+        query_options=query_options,
+        base_url=str(client.get_sync_client().base_url),
+        max_url_length=max_url_length - _auth_url_length(client),
+    )
+    if len(parts) == 1:
+        return query_sync(resources, client=client, query_options=parts[0])
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        results = list(executor.map(lambda part: query_sync(resources, client=client, query_options=part), parts))
+    return _merge_results(results, query_options=query_options)
+
+
+async def query_split_async(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    concurrency: int = 4,
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    """Query, splitting a `dsl.Or` query that does not fit in `max_url_length` into several requests.
+
+    A query that fits is sent as is. Otherwise the queries of the Or are split
+    into sub-queries that fit, which are sent concurrently, and their hits are
+    merged, see `split_query` for the details. The merged response has no `content`.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options
+        max_url_length : maximum length of each request URL, including the base url
+                         and the `api_key` of an AuthenticatedClient
+        concurrency : maximum number of requests in flight
+
+    Returns:
+        Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]
+
+    Raises:
+        ValueError: If a single query of the Or does not fit in `max_url_length`.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    parts = split_query(
+        resources,
+        query_options=query_options,
+        base_url=str(client.get_async_client().base_url),
+        max_url_length=max_url_length - _auth_url_length(client),
+    )
+    if len(parts) == 1:
+        return await query_async(resources, client=client, query_options=parts[0])
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _query(part: QueryOptions) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+        async with semaphore:
+            return await query_async(resources, client=client, query_options=part)
+
+    results = await asyncio.gather(*(_query(part) for part in parts))
+    return _merge_results(results, query_options=query_options)
+
+
+def split_query(
+    resources: Union[str, Sequence[str]],
+    *,
+    query_options: Optional[QueryOptions] = None,
+    base_url: str = "",
+    max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+) -> list[QueryOptions]:
+    """Split the query of `query_options` into queries whose request URLs fit in `max_url_length`.
+
+    Only a `dsl.Or` query can be split; any other query is returned as is,
+    as is a query that fits. Duplicate queries in the Or are sent once. Each
+    part asks for the first `from_ + size` hits, so that the merged hits can be
+    sorted and paged like the original query. The merged hits are
+    de-duplicated by id, and `total` and `distribution` are the sums of the
+    parts less the duplicates among the fetched hits.
+
+    Raises:
+        ValueError: If a single query of the Or does not fit in `max_url_length`.
+    """
+    query_options = query_options or QueryOptions()
+    if _url_length(resources, query_options, base_url) <= max_url_length or not isinstance(query_options.q, dsl.Or):
+        return [query_options]
+    from_ = query_options.from_ or 0
+    part_options = attrs.evolve(
+        query_options,
+        q=dsl.Or(),
+        from_=None,
+        size=from_ + (KARP_DEFAULT_SIZE if query_options.size is None else query_options.size),
+    )
+    prefix_length = _url_length(resources, part_options, base_url)
+    parts: list[list[dsl.Query]] = []
+    part: list[dsl.Query] = []
+    length = prefix_length
+    for query in dict.fromkeys(query_options.q.ors):
+        query_length = len(parse.quote(str(query), safe=""))
+        separator = _OR_SEPARATOR_LENGTH if part else 0
+        if part and length + separator + query_length > max_url_length:
+            parts.append(part)
+            part, length, separator = [], prefix_length, 0
+        if prefix_length + query_length > max_url_length:
+            raise ValueError(f"query {str(query)!r} does not fit in a URL of length {max_url_length}")
+        part.append(query)
+        length += separator + query_length
+    if part:
+        parts.append(part)
+    return [attrs.evolve(part_options, q=dsl.Or(*part)) for part in parts]
+
+
+def _url_length(resources: Union[str, Sequence[str]], query_options: QueryOptions, base_url: str) -> int:
+    url = _get_query_kwargs(resources, query_options=query_options)["url"]
+    return len(base_url.rstrip("/")) + len(url)
+
+
+def _merge_results(
+    results: Iterable[Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]],
+    *,
+    query_options: Optional[QueryOptions],
+) -> Result[Response[QueryResponse], Response[Optional[HttpValidationError]]]:
+    """Merge the hits of the parts of a split query.
+
+    Hits are de-duplicated by id, sorted by the `sort` of the query, if any,
+    and paged by its `from_` and `size`. `total` and `distribution` are the sums
+    of the parts, less the duplicates found among the fetched hits, so they are
+    exact unless the parts match the same entries beyond the fetched hits.
+    """
+    query_options = query_options or QueryOptions()
+    responses = []
+    for result in results:
+        if isinstance(result, Failure):
+            return result
+        responses.append(result.unwrap())
+    parsed = [response.parsed for response in responses if response.parsed is not None]
+    hits: dict[str, EntryDto] = {}
+    total = sum(response.total for response in parsed)
+    distribution = merge_distributions(response.distribution for response in parsed)
+    for response in parsed:
+        for hit in response.hits:
+            if hit.id not in hits:
+                hits[hit.id] = hit
+                continue
+            total -= 1
+            if distribution is not None and hit.resource in distribution:
+                distribution[hit.resource] -= 1
+    merged = list(hits.values())
+    if query_options.sort:
+        merged.sort(key=sort_key(query_options.sort))
+    from_ = query_options.from_ or 0
+    size = KARP_DEFAULT_SIZE if query_options.size is None else query_options.size
+    return Success(
+        Response(
+            status_code=HTTPStatus.OK,
+            content=b"",
+            headers=responses[0].headers,
+            parsed=QueryResponse(total=total, hits=merged[from_ : from_ + size], distribution=distribution),
+        )
+    )
+
+
+__all__ = ["query_split_async", "query_split_sync", "split_query"]
@@ -0,0 +1,179 @@
+"""Streaming decoding of query responses."""
+
+from collections.abc import AsyncGenerator, Generator, Mapping, Sequence
+from http import HTTPStatus
+from typing import Any, Optional, Union
+
+import attrs
+import httpx
+from httpx import codes
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.api.querying.query import (
+    QueryOptions,
+    _build_query_response,
+    _get_query_kwargs,
+)
+from karp_api_client.json_stream import QueryResponseParser
+from karp_api_client.models.entry_dto import EntryDto
+
+
+@attrs.define
+class StreamedQuery:
+    """Everything but the hits of a streamed query response.
+
+    Pass an instance to `stream_query_sync` or `stream_query_async` and it is
+    filled in while iterating. `total` and `distribution` are set as soon as
+    they have been read, which may be before or after the hits depending on
+    the order of the fields in the body.
+
+    Attributes:
+    status_code (Optional[HTTPStatus]): status code of the response.
+    headers (Mapping[str, str]): headers of the response.
+    total (Optional[int]): total number of hits, once read.
+    distribution (Optional[dict[str, int]]): hits per resource, once read.
+    additional_properties (dict[str, Any]): other top-level fields, once read.
+    bytes_read (int): number of body bytes read so far.
+    content (Optional[bytes]): the raw body, only kept with `retain_body=True`.
+    """
+
+    status_code: Optional[HTTPStatus] = None
+    headers: Mapping[str, str] = attrs.field(factory=dict)
+    total: Optional[int] = None
+    distribution: Optional[dict[str, int]] = None
+    additional_properties: dict[str, Any] = attrs.field(factory=dict)
+    bytes_read: int = 0
+    content: Optional[bytes] = None
+
+
+def stream_query_sync(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    summary: Optional[StreamedQuery] = None,
+    retain_body: bool = False,
+) -> Generator[EntryDto, None, None]:
+    """Query and yield each hit as soon as it has been received.
+
+    The body is parsed incrementally while it is downloaded, so neither the
+    full body nor the full parsed tree is held in memory.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options
+        summary : optional object that is filled in with the rest of the response
+        retain_body : keep the raw body in `summary.content`
+
+    Yields:
+        EntryDto: each hit in order
+
+    Raises:
+        errors.QueryFailed: If the server returns an error status.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+        ValueError: If the body is not valid JSON.
+    """
+    summary = summary if summary is not None else StreamedQuery()
+    kwargs = _get_query_kwargs(resources=resources, query_options=query_options)
+    with client.get_sync_client().stream(**kwargs) as response:
+        stream = _HitStream(client=client, response=response, summary=summary, retain_body=retain_body)
+        if response.status_code != codes.OK:
+            response.read()
+            stream.fail()
+        for chunk in response.iter_bytes():
+            yield from stream.feed(chunk)
+        yield from stream.close()
+
+
+async def stream_query_async(
+    resources: Union[str, Sequence[str]],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    summary: Optional[StreamedQuery] = None,
+    retain_body: bool = False,
+) -> AsyncGenerator[EntryDto, None]:
+    """Query and yield each hit as soon as it has been received.
+
+    The body is parsed incrementally while it is downloaded, so neither the
+    full body nor the full parsed tree is held in memory.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        client : the client to use for this API call
+        query_options : optional query options
+        summary : optional object that is filled in with the rest of the response
+        retain_body : keep the raw body in `summary.content`
+
+    Yields:
+        EntryDto: each hit in order
+
+    Raises:
+        errors.QueryFailed: If the server returns an error status.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+        ValueError: If the body is not valid JSON.
+    """
+    summary = summary if summary is not None else StreamedQuery()
+    kwargs = _get_query_kwargs(resources=resources, query_options=query_options)
+    async with client.get_async_client().stream(**kwargs) as response:
+        stream = _HitStream(client=client, response=response, summary=summary, retain_body=retain_body)
+        if response.status_code != codes.OK:
+            await response.aread()
+            stream.fail()
+        async for chunk in response.aiter_bytes():
+            for hit in stream.feed(chunk):
+                yield hit
+        for hit in stream.close():
+            yield hit
+
+
+class _HitStream:
+    def __init__(
+        self,
+        *,
+        client: Union[Client, AuthenticatedClient],
+        response: httpx.Response,
+        summary: StreamedQuery,
+        retain_body: bool,
+    ) -> None:
+        self._client = client
+        self._response = response
+        self._summary = summary
+        self._parser = QueryResponseParser()
+        self._body: Optional[bytearray] = bytearray() if retain_body else None
+        summary.status_code = HTTPStatus(response.status_code)
+        summary.headers = response.headers
+
+    def fail(self) -> None:
+        result = _build_query_response(client=self._client, response=self._response)
+        raise errors.QueryFailed(result.failure())
+
+    def feed(self, chunk: bytes) -> list[EntryDto]:
+        self._summary.bytes_read += len(chunk)
+        if self._body is not None:
+            self._body += chunk
+        return self._hits(self._parser.feed(chunk))
+
+    def close(self) -> list[EntryDto]:
+        hits = self._hits(self._parser.close())
+        if self._body is not None:
+            self._summary.content = bytes(self._body)
+        return hits
+
+    def _hits(self, raw_hits: list[Any]) -> list[EntryDto]:
+        fields = self._parser.fields
+        summary = self._summary
+        summary.total = fields.get("total")
+        summary.distribution = fields.get("distribution")
+        summary.additional_properties = {
+            key: value for key, value in fields.items() if key not in {"total", "distribution", "hits"}
+        }
+        return [EntryDto.from_dict(hit) for hit in raw_hits]
+
+
+__all__ = ["StreamedQuery", "stream_query_async", "stream_query_sync"]
@@ -0,0 +1,195 @@
+"""In-process response cache."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any, Optional
+
+import attrs
+
+from karp_api_client.shared import Response
+
+if TYPE_CHECKING:
+    from karp_api_client.client import ClientBase
+
+
+@attrs.define
+class CacheStats:
+    """Counters for a ResponseCache.
+
+    Attributes:
+    hits (int): lookups served from a fresh entry without a request.
+    misses (int): lookups that found no entry or a stale one.
+    revalidations (int): stale entries that the server confirmed unchanged (304 Not Modified).
+    evictions (int): entries dropped because the cache was full.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered without downloading a body."""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return (self.hits + self.revalidations) / lookups
+
+
+@attrs.define
+class CacheEntry:
+    """A cached response together with its freshness and validators."""
+
+    response: Response[Any]
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers for revalidating this entry with a conditional request."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of parsed responses with per-entry TTL.
+
+    Entries expire after `ttl` seconds unless the response carries `Cache-Control: max-age`,
+    which takes precedence. Responses marked `no-store` are never cached and responses marked
+    `no-cache` are always revalidated. Stale entries with an `ETag` or `Last-Modified` header are
+    kept and revalidated with a conditional request.
+
+    The cache is safe to share between threads and between the sync and async clients.
+    Cached responses are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Construct a ResponseCache holding at most `max_size` entries for `ttl` seconds."""
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of entries in the cache."""
+        return len(self._entries)
+
+    def lookup(self, key: str) -> tuple[Optional[Response[Any]], Optional[CacheEntry]]:
+        """Look up `key`.
+
+        Returns:
+            (response, None) for a fresh entry, (None, entry) for a stale entry
+            that can be revalidated, and (None, None) otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if entry.expires_at > self._clock():
+                self.stats.hits += 1
+                return entry.response, None
+            self.stats.misses += 1
+            if entry.etag is None and entry.last_modified is None:
+                del self._entries[key]
+                return None, None
+            return None, entry
+
+    def store(self, key: str, response: Response[Any]) -> None:
+        """Store `response` under `key` unless its headers forbid it."""
+        directives = _parse_cache_control(response.headers)
+        if "no-store" in directives:
+            return
+        ttl = self._ttl(directives)
+        entry = CacheEntry(
+            response=response,
+            expires_at=self._clock() + ttl,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        if ttl <= 0 and entry.etag is None and entry.last_modified is None:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def revalidated(self, key: str, entry: CacheEntry, headers: Mapping[str, str]) -> Response[Any]:
+        """Refresh a stale `entry` after the server answered 304 Not Modified."""
+        ttl = self._ttl(_parse_cache_control(headers))
+        with self._lock:
+            self.stats.revalidations += 1
+            entry.expires_at = self._clock() + ttl
+            entry.etag = headers.get("etag", entry.etag)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        return entry.response
+
+    def _ttl(self, directives: Mapping[str, Optional[str]]) -> float:
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _parse_max_age(directives)
+        return self.ttl if max_age is None else max_age
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+def cache_key(request_kwargs: Mapping[str, Any], client: "ClientBase") -> str:
+    """Build a cache key from the request kwargs built by an api function and the client sending them.
+
+    The key includes the identity of the client, its base URL and credentials,
+    so that a cache shared between clients never serves one client's responses
+    to another. The resources of a query are sorted, since their order does not
+    change the response.
+    """
+    url = request_kwargs["url"]
+    if url.startswith("/query/"):
+        path, sep, query_string = url.partition("?")
+        resources = ",".join(sorted(path.removeprefix("/query/").split(",")))
+        url = f"/query/{resources}{sep}{query_string}"
+    return f"{client.identity()} {request_kwargs['method'].upper()} {url}"
+
+
+def _parse_cache_control(headers: Mapping[str, str]) -> dict[str, Optional[str]]:
+    directives: dict[str, Optional[str]] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+def _parse_max_age(directives: Mapping[str, Optional[str]]) -> Optional[float]:
+    value = directives.get("max-age")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+__all__ = ["CacheEntry", "CacheStats", "ResponseCache", "cache_key"]
@@ -0,0 +1,103 @@
+"""Command line interface, installed as `karp-client`."""
+
+import argparse
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional, Union
+
+import httpx
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.api.querying.query import QueryOptions
+from karp_api_client.export import COMPRESSIONS, FORMATS, ExportProgress, export_sync
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run `karp-client` with `argv`, or the command line arguments, and return the exit status."""
+    parser = argparse.ArgumentParser(prog="karp-client", description="Client for accessing Karp API.")
+    parser.add_argument(
+        "--base-url", default=os.environ.get("KARP_API_CLIENT_BASE_URL"), help="base url of the Karp API"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser(
+        "export",
+        help="write all hits of a query to a file",
+        description="Write all hits of a query as JSON lines or CSV, one page at a time. "
+        "An API token is read from KARP_API_CLIENT_API_TOKEN or KARP_API_TOKEN, if set.",
+    )
+    export.add_argument("resources", help="comma-separated resources to query")
+    export.add_argument("-q", "--query", help="query in the Karp query DSL, e.g. 'equals|baseform|katt'")
+    export.add_argument("--path", help="export only this field of each entry, e.g. 'entry.baseform'")
+    export.add_argument("--sort", action="append", help="field to sort by, e.g. 'baseform|desc', may be repeated")
+    export.add_argument("-o", "--output", default="-", help="file to write, '-' for stdout (default)")
+    export.add_argument("--format", choices=FORMATS, help="output format, inferred from the output suffix by default")
+    export.add_argument(
+        "--compression",
+        choices=[*COMPRESSIONS.values(), "none"],
+        help="compression of the output file, inferred from its suffix by default",
+    )
+    export.add_argument("--fields", help="comma-separated CSV columns, the fields of the first page by default")
+    export.add_argument("--resume", action="store_true", help="continue an interrupted export to the output file")
+    export.add_argument("--page-size", type=int, default=None, help="hits per request")
+
+    args = parser.parse_args(argv)
+    return _export(args)
+
+
+def _export(args: argparse.Namespace) -> int:
+    output: Union[Path, str] = args.output
+    if args.output != "-":
+        output = Path(args.output)
+    query_options = QueryOptions(q=args.query, sort=args.sort, path=args.path)
+    progress = ExportProgress()
+    try:
+        with _client(args.base_url) as client:
+            export_sync(
+                args.resources,
+                sys.stdout if output == "-" else output,
+                client=client,
+                query_options=query_options,
+                format_=args.format or _format(args.output),
+                compression=_compression(args.compression, output),
+                fields=args.fields.split(",") if args.fields else None,
+                resume=args.resume,
+                page_size=args.page_size,
+                progress=progress,
+            )
+    except (errors.QueryFailed, errors.UnexpectedStatus, httpx.HTTPError, ValueError, OSError) as exc:
+        sys.stderr.write(f"karp-client: export failed at offset {progress.offset}: {exc}\n")
+        return 1
+    if output != "-":
+        sys.stderr.write(f"karp-client: wrote {progress.offset - progress.resumed_from} hits to {output}\n")
+    return 0
+
+
+def _client(base_url: Optional[str]) -> Union[Client, AuthenticatedClient]:
+    client: Union[Client, AuthenticatedClient]
+    if os.environ.get("KARP_API_CLIENT_API_TOKEN") or os.environ.get("KARP_API_TOKEN"):
+        client = AuthenticatedClient.from_env()
+    else:
+        client = Client()
+    if base_url:
+        client.set_base_url(base_url)
+    return client
+
+
+def _format(output: str) -> str:
+    suffixes = [suffix for suffix in Path(output).suffixes if suffix not in COMPRESSIONS]
+    return "csv" if suffixes and suffixes[-1] == ".csv" else "jsonl"
+
+
+def _compression(compression: Optional[str], output: Union[Path, str]) -> Optional[str]:
+    if output == "-":
+        return None
+    if compression is None:
+        return "infer"
+    return None if compression == "none" else compression
+
+
+if __name__ == "__main__":
+    sys.exit(main())
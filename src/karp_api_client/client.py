@@ -1,8 +1,12 @@
 """Client for accessing Karp API."""
 
+import asyncio
+import hashlib
 import os
 import ssl
 import typing
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, TypeVar, Union
 
 try:
@@ -12,6 +16,15 @@ except ImportError:
 import attrs
 import httpx
 
+from karp_api_client.cache import ResponseCache
+from karp_api_client.coalesce import SingleFlight
+from karp_api_client.entry_cache import EntryCache
+from karp_api_client.instrumentation import Instrumentation
+from karp_api_client.json_backend import JsonBackend
+from karp_api_client.pool import PoolProfile, PoolStats, pool_stats
+from karp_api_client.ratelimit import AsyncRateLimitedTransport, RateLimitedTransport, RateLimiter
+from karp_api_client.transport import AsyncResilientTransport, Resilience, ResilientTransport
+
 
 class ApiKeyAuth(httpx.Auth):
     """Appends api_key as query_string to all calls."""
@@ -22,11 +35,56 @@ class ApiKeyAuth(httpx.Auth):
 
     def auth_flow(self, request: httpx.Request) -> typing.Generator[httpx.Request, httpx.Response, None]:
         """Update url with api_key=token."""
-        request.url = request.url.copy_with(api_key=self.api_token)
+        request.url = request.url.copy_merge_params({"api_key": self.api_token})
         yield request
 
 
+class _SharedTransport(httpx.BaseTransport):
+    """Transport of another client, which is left open when this one is closed."""
+
+    def __init__(self, transport: httpx.BaseTransport) -> None:
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.transport.handle_request(request)
+
+
+class _AsyncSharedTransport(httpx.AsyncBaseTransport):
+    """Transport of another client, which is left open when this one is closed."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+
+def _shared_transports(client: Union[httpx.Client, httpx.AsyncClient], shared: Any) -> dict[str, Any]:
+    """Get the transport and mounts of `client`, wrapped in `shared`, as httpx client arguments."""
+    # the mounts include the proxies httpx read from the environment for `client`
+    mounts = getattr(client, "_mounts", {})
+    return {
+        "transport": shared(client._transport),
+        "mounts": {
+            pattern.pattern: shared(transport) if transport is not None else None
+            for pattern, transport in mounts.items()
+        },
+    }
+
+
+def _wrap_transports(client: Union[httpx.Client, httpx.AsyncClient], wrap: Any) -> None:
+    """Wrap the transport of `client` and its mounts, which include the proxies httpx read from the environment."""
+    client._transport = wrap(client._transport)
+    client._mounts = {
+        pattern: wrap(transport) if transport is not None else None for pattern, transport in client._mounts.items()
+    }
+
+
 T = TypeVar("T", bound="ClientBase")
+# headers that make a response specific to a user
+_CREDENTIAL_HEADERS = frozenset({"authorization", "cookie"})
+# httpx client arguments set by a PoolProfile
+_POOL_ARGS = frozenset({"limits", "http2"})
 
 
 @attrs.define(slots=False)
@@ -34,6 +92,16 @@ class ClientBase:
     """Base class for clients."""
 
     raise_on_unexpected_status: bool = attrs.field(default=False, kw_only=True)
+    cache: Optional[ResponseCache] = attrs.field(default=None, kw_only=True)
+    single_flight: Optional[SingleFlight] = attrs.field(default=None, kw_only=True)
+    entry_cache: Optional[EntryCache] = attrs.field(default=None, kw_only=True)
+    lazy_hits: bool = attrs.field(default=False, kw_only=True)
+    json_backend: Optional[JsonBackend] = attrs.field(default=None, kw_only=True)
+    resilience: Optional[Resilience] = attrs.field(default=None, kw_only=True)
+    rate_limiter: Optional[RateLimiter] = attrs.field(default=None, kw_only=True)
+    pool: Optional[PoolProfile] = attrs.field(default=None, kw_only=True)
+    instrumentation: Optional[Instrumentation] = attrs.field(default=None, kw_only=True)
+    vary_headers: Sequence[str] = attrs.field(default=(), kw_only=True)
     _base_url: str = attrs.field(default="https://spraakbanken4.it.gu.se/karp/v7", alias="base_url")
     _cookies: dict[str, str] = attrs.field(factory=dict, kw_only=True, alias="cookies")
     _headers: dict[str, str] = attrs.field(factory=dict, kw_only=True, alias="headers")
@@ -43,35 +111,68 @@ class ClientBase:
     _httpx_args: dict[str, Any] = attrs.field(factory=dict, kw_only=True, alias="httpx_args")
     _client: Optional[httpx.Client] = attrs.field(default=None, init=False)
     _async_client: Optional[httpx.AsyncClient] = attrs.field(default=None, init=False)
+    _root: Optional["ClientBase"] = attrs.field(default=None, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Check that `pool` and `httpx_args` do not both set the pool."""
+        conflicting = sorted(_POOL_ARGS & self._httpx_args.keys())
+        if self.pool is not None and conflicting:
+            raise ValueError(f"pool sets {', '.join(conflicting)}, which httpx_args also sets; give them in one place")
 
     def set_base_url(self, base_url: str) -> Self:
         """Update the base_url for this Client."""
         self._base_url = base_url
         return self
 
+    def identity(self) -> str:
+        """Identify the host this client sends requests to and the credentials it sends.
+
+        The credentials are the token, the cookies, the `Authorization` and
+        `Cookie` headers and the headers named in `vary_headers`, other headers
+        such as tracing headers don't change the identity. They are hashed, so
+        the identity does not reveal them. Responses are only cached or shared
+        between clients with the same identity.
+        """
+        credentials = repr(self._credentials())
+        return f"{self._base_url.rstrip('/')} {hashlib.sha256(credentials.encode()).hexdigest()}"
+
+    def _credentials(self) -> list[Any]:
+        names = _CREDENTIAL_HEADERS | {name.lower() for name in self.vary_headers}
+        return [
+            sorted((name.lower(), value) for name, value in self._headers.items() if name.lower() in names),
+            sorted(self._cookies.items()),
+        ]
+
+    def auth_params(self) -> dict[str, str]:  # noqa: PLR6301
+        """Get the query parameters added to every request URL to authenticate."""
+        return {}
+
     def with_headers(self, headers: dict[str, str]) -> Self:
-        """Get a new client matching this one with additional headers."""
-        if self._client is not None:
-            self._client.headers.update(headers)
-        if self._async_client is not None:
-            self._async_client.headers.update(headers)
-        return attrs.evolve(self, headers={**self._headers, **headers})
+        """Get a new client matching this one with additional headers.
+
+        The new client shares the connection pool of this one.
+        """
+        return self._derive(headers={**self._headers, **headers})
 
     def with_cookies(self, cookies: dict[str, str]) -> Self:
-        """Get a new client matching this one with additional cookies."""
-        if self._client is not None:
-            self._client.cookies.update(cookies)
-        if self._async_client is not None:
-            self._async_client.cookies.update(cookies)
-        return attrs.evolve(self, cookies={**self._cookies, **cookies})
+        """Get a new client matching this one with additional cookies.
+
+        The new client shares the connection pool of this one.
+        """
+        return self._derive(cookies={**self._cookies, **cookies})
 
     def with_timeout(self, timeout: httpx.Timeout) -> Self:
-        """Get a new client matching this one with a new timeout (in seconds)."""
-        if self._client is not None:
-            self._client.timeout = timeout
-        if self._async_client is not None:
-            self._async_client.timeout = timeout
-        return attrs.evolve(self, timeout=timeout)
+        """Get a new client matching this one with a new timeout (in seconds).
+
+        The new client shares the connection pool of this one.
+        """
+        return self._derive(timeout=timeout)
+
+    def _derive(self, **changes: Any) -> Self:
+        client = attrs.evolve(self, **changes)
+        # share the transports of the root client, which owns and closes them
+        client._root = self._root if self._root is not None else self
+        return client
 
     def set_sync_client(self, client: httpx.Client) -> Self:
         """Manually set the underlying httpx.Client.
@@ -89,15 +190,66 @@ class ClientBase:
 
     # @abc.abstractmethod
     def _create_sync_client(self) -> httpx.Client:
-        return httpx.Client(
+        httpx_args = dict(self._httpx_args)
+        if self._root is not None:
+            httpx_args.update(_shared_transports(self._root.get_sync_client(), _SharedTransport))
+            return httpx.Client(
+                base_url=self._base_url,
+                cookies=self._cookies,
+                headers=self._headers,
+                timeout=self._timeout,
+                verify=self._verify_ssl,
+                follow_redirects=self._follow_redirects,
+                event_hooks=self._sync_event_hooks(httpx_args.pop("event_hooks", None)),
+                **httpx_args,
+            )
+        client = httpx.Client(
             base_url=self._base_url,
             cookies=self._cookies,
             headers=self._headers,
             timeout=self._timeout,
             verify=self._verify_ssl,
             follow_redirects=self._follow_redirects,
-            **self._httpx_args,
+            event_hooks=self._sync_event_hooks(httpx_args.pop("event_hooks", None)),
+            **self._pool_args(),
+            **httpx_args,
         )
+        _wrap_transports(client, self._wrap_sync_transport)
+        return client
+
+    def _sync_event_hooks(self, event_hooks: Optional[dict[str, list[Any]]]) -> dict[str, list[Any]]:
+        event_hooks = {name: list(hooks) for name, hooks in (event_hooks or {}).items()}
+        if self.instrumentation is not None:
+            event_hooks.setdefault("request", []).append(self.instrumentation.sync_hook())
+        return event_hooks
+
+    def _wrap_sync_transport(self, transport: httpx.BaseTransport) -> httpx.BaseTransport:
+        # under the retries, so that every attempt waits for the rate limiter
+        if self.rate_limiter is not None:
+            transport = RateLimitedTransport(transport, self.rate_limiter, base_path=httpx.URL(self._base_url).path)
+        if self.resilience is not None:
+            transport = ResilientTransport(transport, self.resilience)
+        return transport
+
+    def _pool_args(self) -> dict[str, Any]:
+        if self.pool is None:
+            return {}
+        return {"limits": self.pool.limits, "http2": self.pool.http2}
+
+    def warm_up_sync(self, connections: int = 1, *, path: str = "/") -> None:
+        """Open `connections` connections ahead of the first requests by sending concurrent HEAD requests."""
+        client = self.get_sync_client()
+        if connections <= 1:
+            client.head(path)
+            return
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(lambda _: client.head(path), range(connections)))
+
+    def sync_pool_stats(self) -> Optional[PoolStats]:
+        """Inspect the connection pool of the underlying httpx.Client, if it has been created."""
+        if self._client is None:
+            return None
+        return pool_stats(self._client)
 
     def __enter__(self) -> Self:
         """Enter a context manager for self.client—you cannot enter twice (see httpx docs)."""
@@ -123,15 +275,59 @@ class ClientBase:
         return self._async_client
 
     def _create_async_client(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
+        httpx_args = dict(self._httpx_args)
+        if self._root is not None:
+            httpx_args.update(_shared_transports(self._root.get_async_client(), _AsyncSharedTransport))
+            return httpx.AsyncClient(
+                base_url=self._base_url,
+                cookies=self._cookies,
+                headers=self._headers,
+                timeout=self._timeout,
+                verify=self._verify_ssl,
+                follow_redirects=self._follow_redirects,
+                event_hooks=self._async_event_hooks(httpx_args.pop("event_hooks", None)),
+                **httpx_args,
+            )
+        client = httpx.AsyncClient(
             base_url=self._base_url,
             cookies=self._cookies,
             headers=self._headers,
             timeout=self._timeout,
             verify=self._verify_ssl,
             follow_redirects=self._follow_redirects,
-            **self._httpx_args,
+            event_hooks=self._async_event_hooks(httpx_args.pop("event_hooks", None)),
+            **self._pool_args(),
+            **httpx_args,
         )
+        _wrap_transports(client, self._wrap_async_transport)
+        return client
+
+    def _async_event_hooks(self, event_hooks: Optional[dict[str, list[Any]]]) -> dict[str, list[Any]]:
+        event_hooks = {name: list(hooks) for name, hooks in (event_hooks or {}).items()}
+        if self.instrumentation is not None:
+            event_hooks.setdefault("request", []).append(self.instrumentation.async_hook())
+        return event_hooks
+
+    def _wrap_async_transport(self, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+        # under the retries, so that every attempt waits for the rate limiter
+        if self.rate_limiter is not None:
+            transport = AsyncRateLimitedTransport(
+                transport, self.rate_limiter, base_path=httpx.URL(self._base_url).path
+            )
+        if self.resilience is not None:
+            transport = AsyncResilientTransport(transport, self.resilience)
+        return transport
+
+    async def warm_up_async(self, connections: int = 1, *, path: str = "/") -> None:
+        """Open `connections` connections ahead of the first requests by sending concurrent HEAD requests."""
+        client = self.get_async_client()
+        await asyncio.gather(*(client.head(path) for _ in range(max(connections, 1))))
+
+    def async_pool_stats(self) -> Optional[PoolStats]:
+        """Inspect the connection pool of the underlying httpx.AsyncClient, if it has been created."""
+        if self._async_client is None:
+            return None
+        return pool_stats(self._async_client)
 
     async def __aenter__(self) -> Self:
         """Enter a context manager for underlying httpx.AsyncClient—you cannot enter twice (see httpx docs)."""
@@ -154,6 +350,13 @@ class AuthenticatedClient(ClientBase):
 
     _token: str = attrs.field(kw_only=True, alias="token")
 
+    def _credentials(self) -> list[Any]:
+        return [*super()._credentials(), self._token]
+
+    def auth_params(self) -> dict[str, str]:
+        """Get the query parameters added to every request URL to authenticate."""
+        return {"api_key": self._token}
+
     def _create_sync_client(self) -> httpx.Client:
         client = super()._create_sync_client()
         client.auth = ApiKeyAuth(self._token)
@@ -0,0 +1,99 @@
+"""Coalescing of identical in-flight requests."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+import attrs
+
+T = TypeVar("T")
+
+
+@attrs.define
+class SingleFlightStats:
+    """Counters for a SingleFlight.
+
+    Attributes:
+    calls (int): calls that sent a request.
+    coalesced (int): calls that shared the request of an identical call in flight instead.
+    """
+
+    calls: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """Share one request between identical concurrent calls.
+
+    Attach one to a client with `Client(single_flight=...)` and concurrent
+    `query_sync` or `query_async` calls for the same URL send a single request
+    and all get the same parsed response, or the same exception. Calls are
+    keyed like the ResponseCache, so calls from clients with another base URL
+    or other credentials are never shared.
+
+    Shared responses must not be mutated. The SingleFlight is thread safe;
+    async calls are only coalesced with calls on the same event loop.
+    """
+
+    def __init__(self) -> None:
+        """Construct a SingleFlight with no calls in flight."""
+        self.stats = SingleFlightStats()
+        self._calls: dict[str, Future[Any]] = {}
+        self._async_calls: dict[tuple[int, str], asyncio.Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of calls in flight."""
+        return len(self._calls) + len(self._async_calls)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Call `fn`, or wait for the result of the call in flight for `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = Future()
+                self.stats.calls += 1
+            else:
+                self.stats.coalesced += 1
+        if not leader:
+            return call.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key)
+            call.set_exception(exc)
+            raise
+        self._finish(key)
+        call.set_result(result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await `fn()`, or the result of the call in flight for `key`.
+
+        The call runs in its own task, so cancelling one of the callers does
+        not cancel the request for the others.
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            if call is None:
+                call = self._async_calls[loop_key] = asyncio.ensure_future(fn())
+                call.add_done_callback(lambda _: self._finish_async(loop_key))
+                self.stats.calls += 1
+            else:
+                self.stats.coalesced += 1
+        return await asyncio.shield(call)
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            del self._calls[key]
+
+    def _finish_async(self, loop_key: tuple[int, str]) -> None:
+        with self._lock:
+            del self._async_calls[loop_key]
+
+
+__all__ = ["SingleFlight", "SingleFlightStats"]
@@ -1,5 +1,16 @@
-"""Karp query DSL."""
+"""Karp query DSL.
 
-from .query import Equals, Or, Query
+Building queries does not import httpx.
+"""
+
+from typing import TYPE_CHECKING
+
+from karp_api_client import lazy
+
+if TYPE_CHECKING:
+    from .query import Equals, Or, Query
+
+__getattr__ = lazy.Loader(__name__, exports={"Equals": "query", "Or": "query", "Query": "query"})
+__dir__ = __getattr__.names
 
 __all__ = ["Equals", "Or", "Query"]
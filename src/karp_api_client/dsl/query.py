@@ -1,8 +1,8 @@
 """Karp Query DSL."""
 
 import copy
-from collections.abc import Callable
-from typing import Any, ClassVar, Union
+from collections.abc import Callable, Iterable
+from typing import Any, ClassVar, Optional, Union
 
 from karp_api_client.shared import UNSET, Unset
 
@@ -13,12 +13,19 @@ except ImportError:
 
 
 class Query:
-    """Base class for all queries."""
+    """Base class for all queries.
+
+    Queries compare and hash by structure, and their string form is computed
+    once. Queries are values: once combined into another query they should
+    not be changed, except by in-place operators such as `|=`.
+    """
 
     _param_defs: ClassVar[dict[str, dict[str, Union[str, bool]]]] = {}
 
     def __init__(self, **params: Any) -> None:
         """Construct a Query."""
+        self._str: Optional[str] = None
+        self._hash: Optional[int] = None
         self._params: dict[str, Any] = {}
         for pname, pvalue in params.items():
             self._params[pname] = pvalue
@@ -34,6 +41,44 @@ class Query:
             return other.__ror__(self)
         return Or(self, other)
 
+    def __str__(self) -> str:
+        """Format this query as the Karp Api."""
+        if self._str is None:
+            self._str = self._format()
+        return self._str
+
+    def _format(self) -> str:
+        # subclasses format themselves, other queries show as plain objects
+        return f"<{self.__class__.__module__}.{self.__class__.__qualname__} object at {id(self):#x}>"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare queries by structure."""
+        if not isinstance(other, Query):
+            return NotImplemented
+        return self.__class__ is other.__class__ and self._params == other._params
+
+    def __hash__(self) -> int:
+        """Hash this query by structure."""
+        if self._hash is None:
+            self._hash = hash((self.__class__, _freeze(self._params)))
+        return self._hash
+
+    def __repr__(self) -> str:
+        """Show the query class and its string form."""
+        return f"{self.__class__.__name__}({str(self)!r})"
+
+    def canonical(self) -> "Query":
+        """Get an equivalent query in canonical form.
+
+        Equivalent queries have equal canonical forms, and so produce the same
+        string and cache keys.
+        """
+        return self
+
+    def _changed(self) -> None:
+        self._str = None
+        self._hash = None
+
     def _clone(self) -> Self:
         c = self.__class__()
         for attr in self._params:
@@ -70,31 +115,85 @@ class Equals(Query):
             kwargs[str(_field)] = _value
         super().__init__(**kwargs)
 
-    def __str__(self) -> str:
-        """Format this query as the Karp Api."""
+    def _format(self) -> str:
         return f"equals|{self.field}|{self.value}"
 
 
 class Or(Query):
-    """Find all entries that matches any of the queries."""
+    """Find all entries that matches any of the queries.
+
+    Build large disjunctions with `Or.from_iterable` or `|=`, which append in
+    place, rather than with `q = q | other`, which copies the list of queries.
+    """
 
     _param_defs: ClassVar[dict[str, dict[str, Union[str, bool]]]] = {"ors": {"type": "query", "multi": True}}
 
     def __init__(self, *queries: Query) -> None:
-        """Construct an Or query by combining two queries."""
-        super().__init__(ors=list(queries))
+        """Construct an Or query by combining two queries.
+
+        Or queries among `queries` are copied, so that changing them later with
+        `|=` does not change this query.
+        """
+        super().__init__(ors=[query._clone() if isinstance(query, Or) else query for query in queries])
+
+    @classmethod
+    def from_iterable(cls, queries: Iterable[Query]) -> "Or":
+        """Construct an Or query of any number of queries, merging nested Or queries."""
+        q = cls()
+        for query in queries:
+            q._add(query)
+        return q
 
     def __or__(self, other: "Query") -> "Or":
         """Combine other query with or."""
-        q = self._clone()
-        if isinstance(other, Or):
-            q.ors.extend(other.ors)
-        else:
-            q_other = other._clone()
-            q.ors.append(q_other)
+        q = self.__class__(*self.ors)
+        q._add(other)
         return q
 
-    def __str__(self) -> str:
-        """Format for Karp API."""
+    def __ror__(self, other: "Query") -> "Or":
+        """Combine other query with or, before the queries of this one."""
+        q = self.__class__(other)
+        q._add(self)
+        return q
+
+    def __ior__(self, other: "Query") -> Self:
+        """Add other query to this one in place, copying the queries of an Or rather than sharing its list."""
+        self._add(other)
+        return self
+
+    def _add(self, other: Query) -> None:
+        if isinstance(other, Or):
+            self.ors.extend(other.ors)
+        else:
+            self.ors.append(other)
+        self._changed()
+
+    def canonical(self) -> "Query":
+        """Get an equivalent query with nested Or queries flattened, duplicates removed and queries sorted."""
+        queries: dict[Query, str] = {}
+        for query in _flatten_ors(self):
+            canonical = query.canonical()
+            queries.setdefault(canonical, str(canonical))
+        if len(queries) == 1:
+            return next(iter(queries))
+        return self.__class__(*sorted(queries, key=queries.__getitem__))
+
+    def _format(self) -> str:
         queries = "||".join(str(q) for q in self.ors)
         return f"or({queries})"
+
+
+def _flatten_ors(query: Or) -> Iterable[Query]:
+    for q in query.ors:
+        if isinstance(q, Or):
+            yield from _flatten_ors(q)
+        else:
+            yield q
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
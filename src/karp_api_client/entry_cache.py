@@ -0,0 +1,215 @@
+"""Persistent cache of entry versions."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import attrs
+
+# pending access times are written in one transaction once there are this many
+ACCESS_FLUSH_SIZE = 1024
+# stored as the user_version of the database, a cache with another schema is emptied
+SCHEMA_VERSION = 1
+
+
+@attrs.define
+class EntryCacheStats:
+    """Counters for an EntryCache, for this process.
+
+    Attributes:
+    hits (int): lookups served from the cache.
+    misses (int): lookups that found no entry.
+    stores (int): entries stored.
+    evictions (int): entries dropped to stay within the size cap.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+class EntryCache:
+    """SQLite cache of entry payloads keyed by origin, resource, entry id and version.
+
+    A version of an entry never changes, so cached versions never expire.
+    Attach one to a client with `Client(entry_cache=...)` and version-pinned
+    reads with `get_history_for_entry_sync` or `get_history_for_entry_async`
+    are served from the cache. The origin of an entry is the `identity()` of
+    the client that read it, so clients of other servers, or with other
+    credentials, sharing the cache don't see each other's entries.
+
+    The database file can be shared by several processes and survives
+    restarts. When the stored payloads exceed `max_bytes`, the least recently
+    read entries are evicted. Reads only write their access times in batches,
+    on eviction and on close, so that a read does not take the write lock.
+    The cache is thread safe.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open, or create, the cache at `path`, holding at most `max_bytes` of payloads, None for no limit."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.stats = EntryCacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._accessed: dict[tuple[str, str, str, int], float] = {}
+        self._db = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # a crash may lose the last transactions but cannot corrupt the database in WAL mode, fine for a cache
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._create_schema()
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _create_schema(self) -> None:
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS entries")
+            self._db.execute("DROP TABLE IF EXISTS totals")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " origin TEXT NOT NULL,"
+            " resource TEXT NOT NULL,"
+            " id TEXT NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " PRIMARY KEY (origin, resource, id, version))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        # the total size is kept up to date by triggers, so that checking the cap does not scan the table
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+        )
+        self._db.execute("INSERT OR IGNORE INTO totals (id, size) VALUES (0, 0)")
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries"
+            " BEGIN UPDATE totals SET size = size + NEW.size; END"
+        )
+        self._db.execute(
+            "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries"
+            " BEGIN UPDATE totals SET size = size - OLD.size; END"
+        )
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM entries").fetchone()[0]
+
+    def __enter__(self) -> "EntryCache":
+        """Enter a context manager that closes the cache."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the cache."""
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Total bytes of the cached payloads."""
+        with self._lock:
+            return self._db.execute("SELECT size FROM totals").fetchone()[0]
+
+    def get(self, resource: str, entry_id: str, version: int, *, origin: str = "") -> Optional[bytes]:
+        """Get the JSON payload of a version of an entry read from `origin`, if cached."""
+        key = (origin, resource, entry_id, version)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM entries WHERE origin = ? AND resource = ? AND id = ? AND version = ?", key
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._accessed[key] = self._clock()
+            if len(self._accessed) >= ACCESS_FLUSH_SIZE:
+                self._commit_accessed()
+        return bytes(row[0])
+
+    def put(self, resource: str, entry_id: str, version: int, payload: bytes, *, origin: str = "") -> None:
+        """Store the JSON payload of a version of an entry read from `origin`, evicting old entries if needed."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # a version never changes, so an entry cached by another process is kept
+                inserted = self._db.execute(
+                    "INSERT OR IGNORE INTO entries (origin, resource, id, version, payload, size, accessed)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (origin, resource, entry_id, version, payload, len(payload), self._clock()),
+                ).rowcount
+                self.stats.stores += inserted
+                if self.max_bytes is not None:
+                    self._evict(self.max_bytes)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _commit_accessed(self) -> None:
+        self._db.execute("BEGIN IMMEDIATE")
+        self._flush_accessed()
+        self._db.execute("COMMIT")
+
+    def _flush_accessed(self) -> None:
+        self._db.executemany(
+            "UPDATE entries SET accessed = ? WHERE origin = ? AND resource = ? AND id = ? AND version = ?",
+            [(accessed, *key) for key, accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _evict(self, max_bytes: int) -> None:
+        self._flush_accessed()
+        excess = self._db.execute("SELECT size FROM totals").fetchone()[0] - max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        oldest = self._db.execute("SELECT origin, resource, id, version, size FROM entries ORDER BY accessed")
+        for origin, resource, entry_id, version, size in oldest:
+            if excess <= 0:
+                break
+            evicted.append((origin, resource, entry_id, version))
+            excess -= size
+        oldest.close()
+        self._db.executemany(
+            "DELETE FROM entries WHERE origin = ? AND resource = ? AND id = ? AND version = ?", evicted
+        )
+        self.stats.evictions += len(evicted)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._accessed.clear()
+            self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Write the pending access times and close the database."""
+        with self._lock:
+            if self._accessed:
+                self._commit_accessed()
+            self._db.close()
+
+
+__all__ = ["EntryCache", "EntryCacheStats"]
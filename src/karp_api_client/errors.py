@@ -1,5 +1,11 @@
 """Contains shared errors types that can be raised from API functions."""
 
+from typing import Any
+
+import httpx
+
+from karp_api_client.shared import Response
+
 
 class UnexpectedStatus(Exception):  # noqa: N818
     """Raised by api functions when the response status is an undocumented status.
@@ -20,4 +26,35 @@ class UnexpectedStatus(Exception):  # noqa: N818
         )
 
 
-__all__ = ["UnexpectedStatus"]
+class QueryFailed(Exception):  # noqa: N818
+    """Raised by iterating api functions when a page could not be fetched.
+
+    Functions returning a `Result` report failures as `Failure`, but iterators
+    have no such channel so the failed response is wrapped in this exception.
+
+    Args:
+        response: the failed response
+    """
+
+    def __init__(self, response: Response[Any]) -> None:
+        self.response = response
+
+        super().__init__(f"Query failed with status code: {response.status_code}\n\nParsed:\n{response.parsed}")
+
+
+class CircuitOpen(httpx.TransportError):
+    """Raised by a resilient transport when the circuit for a host is open.
+
+    Args:
+        host: the host that requests are failing fast for
+        retry_in: seconds until a probe request is let through
+    """
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        self.host = host
+        self.retry_in = retry_in
+
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+
+
+__all__ = ["CircuitOpen", "QueryFailed", "UnexpectedStatus"]
@@ -0,0 +1,340 @@
+"""Export of all hits of a query to JSON lines or CSV files."""
+
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+from collections.abc import Callable, Sequence
+from http import HTTPStatus
+from pathlib import Path
+from typing import IO, Any, Optional, TextIO, Union
+
+import attrs
+import httpx
+from httpx import codes
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.api.querying.pagination import DEFAULT_PAGE_SIZE
+from karp_api_client.api.querying.query import QueryOptions, _get_query_kwargs
+from karp_api_client.json_backend import parse_response
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.shared import Response
+
+FORMATS = ("jsonl", "csv")
+"""Output formats."""
+
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+"""Compressions, by the file suffix they are inferred from."""
+
+_OPENERS: dict[str, Callable[..., Any]] = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+@attrs.define
+class ExportProgress:
+    """Progress of an export.
+
+    Pass an instance to `export_sync` or `export_async` and it is updated in
+    place while exporting.
+
+    Attributes:
+    offset (int): offset of the next hit to write, counting hits written before resuming.
+    resumed_from (int): offset the export started from, where it left off when resumed.
+    pages_fetched (int): number of pages fetched so far.
+    bytes_read (int): number of response body bytes read so far.
+    total (Optional[int]): total number of hits reported by Karp, once known.
+    """
+
+    offset: int = 0
+    resumed_from: int = 0
+    pages_fetched: int = 0
+    bytes_read: int = 0
+    total: Optional[int] = None
+
+
+def export_sync(
+    resources: Union[str, Sequence[str]],
+    output: Union[str, Path, TextIO],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    format_: str = "jsonl",
+    compression: Optional[str] = "infer",
+    fields: Optional[Sequence[str]] = None,
+    resume: bool = False,
+    page_size: Optional[int] = None,
+    progress: Optional[ExportProgress] = None,
+) -> ExportProgress:
+    """Write all hits of a query to `output`, one page at a time.
+
+    Only one page is held in memory at a time. Hits are written as they are
+    returned by Karp, so `query_options.path` exports only that field of each
+    entry. In CSV, nested fields become columns named with dots, lists are
+    written as JSON and the columns are the fields of the first page unless
+    given with `fields`.
+
+    A file output is compressed with `compression`, one of `"gzip"`, `"bz2"`
+    and `"xz"`, or inferred from its suffix with `"infer"`. After each page,
+    the offset reached is saved next to the output in `<output>.progress`.
+    With `resume`, an interrupted export continues from that offset; the
+    progress file is removed once the export is complete.
+
+    Args:
+        resources : sequence of resources as strings, or as a commas-separatade string.
+        output : path of the file to write, or an open text stream
+        client : the client to use for this API call
+        query_options : optional query options, `from_` is used as start offset
+        format_ : `"jsonl"` or `"csv"`
+        compression : compression of a file output, None for none
+        fields : CSV columns
+        resume : continue an interrupted export to the same file
+        page_size : number of hits per page, defaults to `query_options.size` or `DEFAULT_PAGE_SIZE`
+        progress : optional progress object that is updated while exporting
+
+    Returns:
+        ExportProgress
+
+    Raises:
+        errors.QueryFailed: If a page could not be fetched.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+        ValueError: If the options are invalid, or `resume` is given for a
+                    file that was not written by an interrupted export of the same query.
+    """
+    exporter = _Exporter(
+        resources,
+        output,
+        query_options=query_options,
+        format_=format_,
+        compression=compression,
+        fields=fields,
+        resume=resume,
+        page_size=page_size,
+        progress=progress,
+    )
+    while not exporter.done:
+        response = client.get_sync_client().request(**exporter.next_page_kwargs())
+        exporter.write_page(_unwrap_page(client, response), len(response.content))
+    return exporter.finish()
+
+
+async def export_async(
+    resources: Union[str, Sequence[str]],
+    output: Union[str, Path, TextIO],
+    *,
+    client: Union[Client, AuthenticatedClient],
+    query_options: Optional[QueryOptions] = None,
+    format_: str = "jsonl",
+    compression: Optional[str] = "infer",
+    fields: Optional[Sequence[str]] = None,
+    resume: bool = False,
+    page_size: Optional[int] = None,
+    progress: Optional[ExportProgress] = None,
+) -> ExportProgress:
+    """Write all hits of a query to `output`, one page at a time.
+
+    See `export_sync`. Writing to the output blocks the event loop.
+
+    Returns:
+        ExportProgress
+
+    Raises:
+        errors.QueryFailed: If a page could not be fetched.
+        errors.UnexpectedStatus: If the server returns an undocumented status code
+                                and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+        ValueError: If the options are invalid, or `resume` is given for a
+                    file that was not written by an interrupted export of the same query.
+    """
+    exporter = _Exporter(
+        resources,
+        output,
+        query_options=query_options,
+        format_=format_,
+        compression=compression,
+        fields=fields,
+        resume=resume,
+        page_size=page_size,
+        progress=progress,
+    )
+    while not exporter.done:
+        response = await client.get_async_client().request(**exporter.next_page_kwargs())
+        exporter.write_page(_unwrap_page(client, response), len(response.content))
+    return exporter.finish()
+
+
+class _Exporter:
+    """Writes pages of hits and keeps track of where to resume."""
+
+    def __init__(
+        self,
+        resources: Union[str, Sequence[str]],
+        output: Union[str, Path, TextIO],
+        *,
+        query_options: Optional[QueryOptions],
+        format_: str,
+        compression: Optional[str],
+        fields: Optional[Sequence[str]],
+        resume: bool,
+        page_size: Optional[int],
+        progress: Optional[ExportProgress],
+    ) -> None:
+        if format_ not in FORMATS:
+            raise ValueError(f"unknown format {format_!r}, expected one of {list(FORMATS)}")
+        self.resources = resources
+        self.query_options = query_options or QueryOptions()
+        self.format = format_
+        self.fields = list(fields) if fields is not None else None
+        self.page_size = page_size or self.query_options.size or DEFAULT_PAGE_SIZE
+        if self.page_size < 1:
+            raise ValueError(f"page_size must be positive, got {self.page_size}")
+        self.progress = progress if progress is not None else ExportProgress()
+        self.progress.offset = self.progress.resumed_from = self.query_options.from_ or 0
+        self.done = False
+        self.header = format_ == "csv"
+        # identifies the query in the progress file, so that another query does not resume it
+        self.query = _get_query_kwargs(
+            resources, query_options=attrs.evolve(self.query_options, from_=None, size=None)
+        )["url"]
+
+        if isinstance(output, (str, Path)):
+            self.path: Optional[Path] = Path(output)
+            self.stream: Optional[TextIO] = None
+            self.compression = _compression(self.path, compression)
+            self.state_path: Optional[Path] = self.path.with_name(f"{self.path.name}.progress")
+            self._start(self.path, self.state_path, resume=resume)
+        else:
+            if resume or compression not in {"infer", None}:
+                raise ValueError("only a file output can be resumed or compressed")
+            self.path = self.state_path = None
+            self.stream = output
+            self.compression = None
+
+    def _start(self, path: Path, state_path: Path, *, resume: bool) -> None:
+        if resume and state_path.exists():
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+            if state["query"] != self.query or state["format"] != self.format:
+                raise ValueError(f"{path} is an export of another query or format, not resuming it")
+            # drops anything written after the last complete page
+            os.truncate(path, state["size"])
+            self.progress.offset = self.progress.resumed_from = state["offset"]
+            self.fields = state["fields"]
+            self.header = self.header and state["size"] == 0
+            return
+        if resume and path.exists() and path.stat().st_size > 0:
+            raise ValueError(f"{path} has no progress file, so there is no export to resume")
+        path.write_bytes(b"")
+
+    def next_page_kwargs(self) -> dict[str, Any]:
+        options = attrs.evolve(self.query_options, from_=self.progress.offset, size=self.page_size)
+        return _get_query_kwargs(self.resources, query_options=options)
+
+    def write_page(self, page: dict[str, Any], size: int) -> None:
+        hits = page["hits"]
+        self.progress.pages_fetched += 1
+        self.progress.bytes_read += size
+        self.progress.total = page["total"]
+        if self.path is not None:
+            # every page is a complete compressed stream, so that the file can be cut after any page
+            with _open(self.path, self.compression) as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+                self._write(text, hits)
+        elif self.stream is not None:
+            self._write(self.stream, hits)
+            self.stream.flush()
+        self.progress.offset += len(hits)
+        self.done = not hits or self.progress.offset >= page["total"]
+        self._save_state()
+
+    def finish(self) -> ExportProgress:
+        if self.state_path is not None:
+            self.state_path.unlink(missing_ok=True)
+        return self.progress
+
+    def _write(self, text: TextIO, hits: list[Any]) -> None:
+        if self.format == "jsonl":
+            for hit in hits:
+                text.write(json.dumps(hit, ensure_ascii=False))
+                text.write("\n")
+            return
+        rows = [_flatten(hit, self.query_options.path or "value") for hit in hits]
+        if self.fields is None:
+            self.fields = list(dict.fromkeys(name for row in rows for name in row))
+        writer = csv.DictWriter(text, self.fields, extrasaction="ignore")
+        if self.header:
+            writer.writeheader()
+            self.header = False
+        writer.writerows(rows)
+
+    def _save_state(self) -> None:
+        if self.path is None or self.state_path is None:
+            return
+        state = {
+            "query": self.query,
+            "format": self.format,
+            "offset": self.progress.offset,
+            "size": self.path.stat().st_size,
+            "fields": self.fields,
+        }
+        partial = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        partial.write_text(json.dumps(state), encoding="utf-8")
+        partial.replace(self.state_path)
+
+
+def _open(path: Path, compression: Optional[str]) -> IO[bytes]:
+    if compression is None:
+        return path.open("ab")
+    return _OPENERS[compression](path, "ab")
+
+
+def _compression(path: Path, compression: Optional[str]) -> Optional[str]:
+    if compression == "infer":
+        return COMPRESSIONS.get(path.suffix)
+    if compression is not None and compression not in _OPENERS:
+        raise ValueError(f"unknown compression {compression!r}, expected one of {list(_OPENERS)}")
+    return compression
+
+
+def _flatten(hit: Any, name: str, prefix: str = "") -> dict[str, Any]:
+    if not isinstance(hit, dict):
+        return {name: _cell(hit)}
+    row: dict[str, Any] = {}
+    for key, value in hit.items():
+        if isinstance(value, dict):
+            row.update(_flatten(value, name, f"{prefix}{key}."))
+        else:
+            row[f"{prefix}{key}"] = _cell(value)
+    return row
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _unwrap_page(client: Union[Client, AuthenticatedClient], response: httpx.Response) -> dict[str, Any]:
+    if response.status_code == codes.OK:
+        # the hits are written as returned, with `path` they are not even entries
+        return parse_response(client, response, lambda data: data)
+    parsed: Optional[HttpValidationError] = None
+    if response.status_code == codes.UNPROCESSABLE_ENTITY:
+        parsed = parse_response(client, response, HttpValidationError.from_dict)
+    else:
+        if client.instrumentation is not None:
+            client.instrumentation.record(response)
+        if client.raise_on_unexpected_status:
+            raise errors.UnexpectedStatus(response.status_code, response.content)
+    raise errors.QueryFailed(
+        Response(
+            status_code=HTTPStatus(response.status_code),
+            content=response.content,
+            headers=response.headers,
+            parsed=parsed,
+        )
+    )
+
+
+__all__ = ["COMPRESSIONS", "FORMATS", "ExportProgress", "export_async", "export_sync"]
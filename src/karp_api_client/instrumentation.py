@@ -0,0 +1,288 @@
+"""Per-request timing instrumentation."""
+
+import bisect
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, Optional, TypeVar
+
+import attrs
+import httpx
+
+T = TypeVar("T")
+
+TIMING_EXTENSION = "karp_api_client.timing"
+"""Key of the RequestTiming in `httpx.Request.extensions`."""
+
+PHASES = ("connect", "ttfb", "download", "decode", "build", "elapsed")
+"""Timed phases of a request, in order."""
+
+logger = logging.getLogger(__name__)
+
+
+@attrs.define
+class RequestTiming:
+    """Where the time of one request went, in seconds.
+
+    Phases that did not happen, or that the transport does not report, are
+    None. `connect`, `ttfb` and `download` are only reported by httpcore
+    transports.
+
+    Attributes:
+    method (str): HTTP method.
+    url (str): request URL.
+    status_code (Optional[int]): response status.
+    size (int): response body bytes downloaded, or the body length when nothing was downloaded.
+    connect (Optional[float]): waiting for a connection from the pool, including connecting.
+    ttfb (Optional[float]): time to first byte, from sending the request to receiving the response headers.
+    download (Optional[float]): receiving the response body.
+    decode (Optional[float]): decoding the JSON body.
+    build (Optional[float]): building models from the decoded body.
+    elapsed (Optional[float]): from sending the request until the response was parsed.
+    """
+
+    method: str
+    url: str
+    status_code: Optional[int] = None
+    size: int = 0
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    download: Optional[float] = None
+    decode: Optional[float] = None
+    build: Optional[float] = None
+    elapsed: Optional[float] = None
+    _marks: dict[str, float] = attrs.field(factory=dict, repr=False, eq=False, alias="marks")
+
+    def mark(self, name: str, now: float) -> None:
+        """Record when a trace event happened."""
+        self._marks[name] = now
+
+    def exclude(self, seconds: float) -> None:
+        """Leave out `seconds` spent before sending the request, such as waiting for a rate limiter."""
+        if "start" in self._marks:
+            self._marks["start"] += seconds
+
+    def _between(self, start: str, end: str) -> Optional[float]:
+        if start in self._marks and end in self._marks:
+            return self._marks[end] - self._marks[start]
+        return None
+
+    def finish(self, response: httpx.Response, now: float) -> None:
+        """Fill in the response and the phases from the recorded events."""
+        self.status_code = response.status_code
+        self.size = response.num_bytes_downloaded or _content_length(response)
+        self.connect = self._between("start", "send_request_headers")
+        self.ttfb = self._between("send_request_headers", "receive_response_headers")
+        self.download = self._between("receive_response_headers", "receive_response_body")
+        if "start" in self._marks:
+            self.elapsed = now - self._marks["start"]
+
+
+Sink = Callable[[RequestTiming], None]
+
+
+@attrs.define
+class Histogram:
+    """Cumulative histogram of durations in seconds.
+
+    Attributes:
+    buckets (tuple[float, ...]): upper bounds of the buckets, the last bucket is unbounded.
+    counts (list[int]): number of samples per bucket, one more than `buckets`.
+    count (int): number of samples.
+    sum (float): sum of the samples.
+    """
+
+    buckets: tuple[float, ...]
+    counts: list[int] = attrs.field(init=False)
+    count: int = 0
+    sum: float = 0.0
+
+    def __attrs_post_init__(self) -> None:
+        """Create an empty bucket count."""
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        """Add a sample."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        """Mean of the samples."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the `q` quantile as the upper bound of its bucket, `inf` for the unbounded bucket."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            seen += count
+            if seen >= rank and seen > 0:
+                return bound
+        return 0.0
+
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class HistogramSink:
+    """Sink keeping a histogram per phase, status counts and bytes downloaded, in memory."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Construct a HistogramSink with the given bucket bounds in seconds."""
+        self.histograms = {phase: Histogram(tuple(sorted(buckets))) for phase in PHASES}
+        self.statuses: Counter[Optional[int]] = Counter()
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: RequestTiming) -> None:
+        """Record a request."""
+        with self._lock:
+            self.requests += 1
+            self.bytes += timing.size
+            self.statuses[timing.status_code] += 1
+            for phase in PHASES:
+                value = getattr(timing, phase)
+                if value is not None:
+                    self.histograms[phase].observe(value)
+
+
+class LoggingSink:
+    """Sink logging one line per request."""
+
+    def __init__(self, log: logging.Logger = logger, level: int = logging.DEBUG) -> None:
+        """Construct a LoggingSink logging to `log` at `level`."""
+        self.log = log
+        self.level = level
+
+    def __call__(self, timing: RequestTiming) -> None:
+        """Log a request."""
+        if not self.log.isEnabledFor(self.level):
+            return
+        phases = " ".join(
+            f"{phase}={value * 1000:.1f}ms" for phase in PHASES if (value := getattr(timing, phase)) is not None
+        )
+        self.log.log(
+            self.level, "%s %s %s %d bytes %s", timing.method, timing.url, timing.status_code, timing.size, phases
+        )
+
+
+class Instrumentation:
+    """Time each API call and pass the timings to sinks.
+
+    Attach one to a client with `Client(instrumentation=...)`. Network phases
+    are read from the httpcore `trace` extension and decoding and model
+    building are timed while parsing the responses of `query_sync`,
+    `query_async` and the entries endpoints. A sink is any callable taking a
+    RequestTiming, for example a HistogramSink, a LoggingSink or a function.
+    """
+
+    def __init__(self, *sinks: Sink, clock: Callable[[], float] = time.perf_counter) -> None:
+        """Construct an Instrumentation passing timings to `sinks`."""
+        self.sinks = list(sinks)
+        self._clock = clock
+
+    def start(self, request: httpx.Request) -> RequestTiming:
+        """Start timing `request`."""
+        timing = RequestTiming(method=request.method, url=str(request.url))
+        timing.mark("start", self._clock())
+        request.extensions[TIMING_EXTENSION] = timing
+        return timing
+
+    def sync_hook(self) -> Callable[[httpx.Request], None]:
+        """Create an httpx request event hook for sync clients."""
+
+        def _hook(request: httpx.Request) -> None:
+            timing = self.start(request)
+            trace = request.extensions.get("trace")
+
+            def _trace(name: str, info: dict[str, Any]) -> None:
+                self._trace(timing, name)
+                if trace is not None:
+                    trace(name, info)
+
+            request.extensions["trace"] = _trace
+
+        return _hook
+
+    def async_hook(self) -> Callable[[httpx.Request], Awaitable[None]]:
+        """Create an httpx request event hook for async clients."""
+
+        async def _hook(request: httpx.Request) -> None:  # noqa: RUF029
+            timing = self.start(request)
+            trace = request.extensions.get("trace")
+
+            async def _trace(name: str, info: dict[str, Any]) -> None:
+                self._trace(timing, name)
+                if trace is not None:
+                    await trace(name, info)
+
+            request.extensions["trace"] = _trace
+
+        return _hook
+
+    def _trace(self, timing: RequestTiming, name: str) -> None:
+        # e.g. "http11.receive_response_headers.complete"
+        _, _, event = name.partition(".")
+        step, _, state = event.rpartition(".")
+        if (step == "send_request_headers" and state == "started") or (
+            step in {"receive_response_headers", "receive_response_body"} and state == "complete"
+        ):
+            timing.mark(step, self._clock())
+
+    def parse(
+        self,
+        response: httpx.Response,
+        build: Callable[[Any], T],
+        decode: Callable[[httpx.Response], Any] = httpx.Response.json,
+    ) -> T:
+        """Decode the JSON body of `response` and `build` a model from it, timing both, and record the request."""
+        timing = _request_timing(response)
+        start = self._clock()
+        data = decode(response)
+        decoded = self._clock()
+        model = build(data)
+        timing.decode = decoded - start
+        timing.build = self._clock() - decoded
+        self.record(response)
+        return model
+
+    def record(self, response: httpx.Response) -> None:
+        """Finish timing the request of `response` and pass it to the sinks."""
+        timing = _request_timing(response)
+        timing.finish(response, self._clock())
+        for sink in self.sinks:
+            sink(timing)
+
+
+def _content_length(response: httpx.Response) -> int:
+    # responses built in memory, e.g. by httpx.MockTransport, download nothing
+    try:
+        return len(response.content)
+    except httpx.ResponseNotRead:
+        return 0
+
+
+def _request_timing(response: httpx.Response) -> RequestTiming:
+    timing = response.request.extensions.get(TIMING_EXTENSION)
+    if timing is None:
+        timing = response.request.extensions[TIMING_EXTENSION] = RequestTiming(
+            method=response.request.method, url=str(response.request.url)
+        )
+    return timing
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "PHASES",
+    "Histogram",
+    "HistogramSink",
+    "Instrumentation",
+    "LoggingSink",
+    "RequestTiming",
+    "Sink",
+]
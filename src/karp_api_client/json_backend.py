@@ -0,0 +1,90 @@
+"""JSON decoding of response bodies."""
+
+import importlib
+import importlib.util
+import json
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, TypeVar, Union
+
+import attrs
+import httpx
+
+if TYPE_CHECKING:
+    from karp_api_client.client import ClientBase
+
+T = TypeVar("T")
+
+
+@attrs.define(frozen=True)
+class JsonBackend:
+    """A JSON decoder.
+
+    Attributes:
+    name (str): name of the backend.
+    loads (Callable[[bytes], Any]): decode a JSON document from bytes.
+    """
+
+    name: str
+    loads: Callable[[bytes], Any]
+
+
+STDLIB_BACKEND = JsonBackend("json", json.loads)
+"""The standard library `json` module."""
+
+
+def _orjson() -> JsonBackend:
+    orjson = importlib.import_module("orjson")
+    return JsonBackend("orjson", orjson.loads)
+
+
+def _msgspec() -> JsonBackend:
+    msgspec_json = importlib.import_module("msgspec.json")
+    return JsonBackend("msgspec", msgspec_json.Decoder().decode)
+
+
+_BACKENDS: dict[str, Callable[[], JsonBackend]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": lambda: STDLIB_BACKEND,
+}
+
+
+def get_json_backend(name: str = "auto") -> JsonBackend:
+    """Get a JSON backend by name.
+
+    `"auto"` picks the fastest installed of `"orjson"`, `"msgspec"` and the
+    standard library `"json"`. orjson and msgspec are optional dependencies,
+    e.g. `pip install karp-api-client[orjson]`.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+    """
+    if name == "auto":
+        name = next(candidate for candidate in _BACKENDS if candidate == "json" or importlib.util.find_spec(candidate))
+    if name not in _BACKENDS:
+        raise ValueError(f"unknown JSON backend {name!r}, expected one of {['auto', *_BACKENDS]}")
+    try:
+        return _BACKENDS[name]()
+    except ImportError as exc:
+        raise ImportError(f"JSON backend {name!r} is not installed, try `pip install karp-api-client[{name}]`") from exc
+
+
+def decode(backend: Union[JsonBackend, None], response: httpx.Response) -> Any:
+    """Decode the JSON body of `response` with `backend`, or with `response.json()` if None."""
+    if backend is None:
+        return response.json()
+    return backend.loads(response.content)
+
+
+def parse_response(client: "ClientBase", response: httpx.Response, build: Callable[[Any], T]) -> T:
+    """Build a model from the JSON body of `response`, decoded with the client's JSON backend.
+
+    The decoding and building are timed if the client has instrumentation.
+    """
+    if client.instrumentation is None:
+        return build(decode(client.json_backend, response))
+    return client.instrumentation.parse(response, build, lambda response: decode(client.json_backend, response))
+
+
+__all__ = ["STDLIB_BACKEND", "JsonBackend", "decode", "get_json_backend", "parse_response"]
@@ -0,0 +1,275 @@
+"""Incremental decoding of query response bodies."""
+
+import codecs
+import json
+import re
+from typing import Any, Optional
+
+_WHITESPACE = " \t\r\n"
+_VALUE_END = _WHITESPACE + ",]}"
+_KEY_END = _WHITESPACE + ":"
+# values that end with a closing bracket or quote, whose end is found by _ValueScanner
+_DELIMITED = '{["'
+
+# parser states
+_START = 0
+_KEY = 1
+_COLON = 2
+_VALUE = 3
+_AFTER_VALUE = 4
+_HIT = 5
+_AFTER_HIT = 6
+_DONE = 7
+_FIRST_KEY = 8
+_FIRST_HIT = 9
+
+
+class QueryResponseParser:
+    """Incrementally parses the JSON body of a query response.
+
+    Feed the body chunk by chunk; every hit in the top-level `hits` array is
+    returned as soon as its JSON object is complete. All other top-level
+    fields are collected in `fields`. Only the current incomplete value is buffered,
+    and each character of it is scanned once to find where it ends before it is
+    decoded, so that a large hit split over many chunks is decoded once.
+    """
+
+    def __init__(self, array_key: str = "hits") -> None:
+        """Construct a parser that streams the elements of the top-level `array_key`."""
+        self.array_key = array_key
+        self.fields: dict[str, Any] = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key = ""
+        # an incomplete delimited value at the start of the buffer, kept as pieces until its end arrives
+        self._scanner: Optional[_ValueScanner] = None
+        self._pieces: list[str] = []
+        self._pieces_length = 0
+        self._value_end = -1
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Feed the next chunk of the body, returning the hits completed by it.
+
+        Raises:
+            json.JSONDecodeError: if the body is not valid JSON.
+        """
+        if not self._append(self._decoder.decode(chunk), final=False):
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> list[Any]:
+        """Signal the end of the body, returning any remaining hits.
+
+        Raises:
+            json.JSONDecodeError: if the body was not a complete JSON object.
+        """
+        self._append(self._decoder.decode(b"", final=True), final=True)
+        hits = self._parse(final=True)
+        self._skip_whitespace()
+        if self._state != _DONE or self._pos != len(self._buffer):
+            raise json.JSONDecodeError("incomplete or invalid JSON body", self._buffer, self._pos)
+        return hits
+
+    def _append(self, text: str, *, final: bool) -> bool:
+        """Append decoded text to the buffer, returning False while the incomplete value is still incomplete."""
+        if self._scanner is None:
+            self._buffer = self._buffer[self._pos :] + text
+            self._pos = 0
+            return True
+        self._pieces.append(text)
+        end = self._scanner.scan(text, 0)
+        if end < 0 and not final:
+            self._pieces_length += len(text)
+            return False
+        self._value_end = -1 if end < 0 else self._pieces_length + end
+        self._buffer = "".join(self._pieces)
+        self._pos = 0
+        self._scanner = None
+        self._pieces = []
+        self._pieces_length = 0
+        return True
+
+    def _parse(self, *, final: bool) -> list[Any]:
+        hits: list[Any] = []
+        while True:
+            self._skip_whitespace()
+            if self._pos >= len(self._buffer):
+                return hits
+            char = self._buffer[self._pos]
+            if self._state == _START:
+                self._expect(char, "{")
+                self._state = _FIRST_KEY
+            elif self._state in {_FIRST_KEY, _KEY}:
+                if char == "}" and self._state == _FIRST_KEY:
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                key = self._decode_value(final=final, terminators=_KEY_END)
+                if key is _INCOMPLETE:
+                    return hits
+                if not isinstance(key, str):
+                    raise json.JSONDecodeError(
+                        "Expecting property name enclosed in double quotes", self._buffer, self._pos
+                    )
+                self._key = key
+                self._state = _COLON
+            elif self._state == _COLON:
+                self._expect(char, ":")
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if self._key == self.array_key and char == "[":
+                    self._pos += 1
+                    self.fields.setdefault(self.array_key, None)
+                    self._state = _FIRST_HIT
+                    continue
+                value = self._decode_value(final=final)
+                if value is _INCOMPLETE:
+                    return hits
+                self.fields[self._key] = value
+                self._state = _AFTER_VALUE
+            elif self._state == _AFTER_VALUE:
+                self._pos += 1
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                else:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+            elif self._state in {_FIRST_HIT, _HIT}:
+                if char == "]":
+                    if self._state == _HIT:
+                        raise json.JSONDecodeError("Expecting value", self._buffer, self._pos)
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                hit = self._decode_value(final=final)
+                if hit is _INCOMPLETE:
+                    return hits
+                hits.append(hit)
+                self._state = _AFTER_HIT
+            elif self._state == _AFTER_HIT:
+                self._pos += 1
+                if char == ",":
+                    self._state = _HIT
+                elif char == "]":
+                    self._state = _AFTER_VALUE
+                else:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+            else:
+                raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+
+    def _skip_whitespace(self) -> None:
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char != expected:
+            raise json.JSONDecodeError(f"Expecting {expected!r}", self._buffer, self._pos)
+        self._pos += 1
+
+    def _decode_value(self, *, final: bool, terminators: str = _VALUE_END) -> Any:
+        if self._buffer[self._pos] in _DELIMITED:
+            return self._decode_delimited_value(final=final)
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _INCOMPLETE
+        # numbers are not self-delimiting, so "12" may still become "123"
+        if end >= len(self._buffer):
+            if not final:
+                return _INCOMPLETE
+        elif self._buffer[end] not in terminators:
+            if not final:
+                return _INCOMPLETE
+            raise json.JSONDecodeError("Extra data", self._buffer, end)
+        self._pos = end
+        return value
+
+    def _decode_delimited_value(self, *, final: bool) -> Any:
+        end, self._value_end = self._value_end, -1
+        if end < 0:
+            scanner = _ValueScanner()
+            end = scanner.scan(self._buffer, self._pos)
+            if end < 0 and not final:
+                self._scanner = scanner
+                self._pieces = [self._buffer[self._pos :]]
+                self._pieces_length = len(self._pieces[0])
+                self._buffer = ""
+                self._pos = 0
+                return _INCOMPLETE
+        # a complete value that is not valid JSON, or the end of the body in the middle of a value, raises here
+        value, self._pos = self._json.raw_decode(self._buffer, self._pos)
+        return value
+
+
+class _ValueScanner:
+    """Finds the end of a JSON object, array or string, looking at each character once.
+
+    A string is skipped by one regular expression match, and brackets outside
+    of strings are counted. Whether the value is valid is left to the decoder.
+    """
+
+    # a whole string, a bracket, or the start of a string that does not end in the text
+    _TOKENS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]|"', re.DOTALL)
+    _STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def scan(self, text: str, pos: int) -> int:
+        """Scan `text` from `pos` on, returning the offset just after the end of the value, or -1."""
+        if self.in_string:
+            if self.escaped:
+                if pos >= len(text):
+                    return -1
+                self.escaped = False
+                pos += 1
+            match = self._STRING_END.match(text, pos)
+            if match is None:
+                self._continue_string(text, pos)
+                return -1
+            self.in_string = False
+            pos = match.end()
+            if self.depth == 0:
+                return pos
+        depth = self.depth
+        for match in self._TOKENS.finditer(text, pos):
+            start, end = match.span()
+            char = text[start]
+            if char == '"':
+                if end - start == 1:
+                    self.depth = depth
+                    self.in_string = True
+                    self._continue_string(text, end)
+                    return -1
+                if depth == 0:
+                    return end
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth <= 0:
+                    self.depth = 0
+                    return end
+        self.depth = depth
+        return -1
+
+    def _continue_string(self, text: str, pos: int) -> None:
+        # an odd number of backslashes at the end of the string escapes the first character of the next text
+        self.escaped = (len(text) - max(len(text.rstrip("\\")), pos)) % 2 == 1
+
+
+_INCOMPLETE: Any = object()
+
+
+__all__ = ["QueryResponseParser"]
@@ -0,0 +1,51 @@
+"""Lazy loading of the submodules of a package, see PEP 562."""
+
+import importlib
+import sys
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+
+class Loader:
+    """The `__getattr__` of a package, loading its submodules and the names it exports on first access.
+
+    The package's `__init__` imports nothing itself, so importing it is cheap,
+    and the dependencies of a submodule (httpx, returns, ...) are only imported
+    once something from it is used. An attribute is imported once, and is then
+    an ordinary attribute of the package.
+
+    ```python
+    __getattr__ = lazy.Loader(__name__, submodules=["dsl"], exports={"Client": "client"})
+    __dir__ = __getattr__.names
+    ```
+
+    Args:
+        package : the name of the package, `__name__` in its `__init__`
+        submodules : submodules of the package to load as attributes
+        exports : names exported by the package, mapped to the submodule defining them
+    """
+
+    __slots__ = ("exports", "package", "submodules")
+
+    def __init__(self, package: str, *, submodules: Iterable[str] = (), exports: Mapping[str, str] = {}) -> None:
+        self.package = package
+        self.submodules = frozenset(submodules)
+        self.exports = dict(exports)
+
+    def __call__(self, name: str) -> Any:
+        """Import the attribute `name` of the package."""
+        if name in self.submodules:
+            value = importlib.import_module(f"{self.package}.{name}")
+        elif name in self.exports:
+            value = getattr(importlib.import_module(f"{self.package}.{self.exports[name]}"), name)
+        else:
+            raise AttributeError(f"module {self.package!r} has no attribute {name!r}")
+        setattr(sys.modules[self.package], name, value)
+        return value
+
+    def names(self) -> list[str]:
+        """Get the names of the package, loaded or not, for `__dir__`."""
+        return sorted({*vars(sys.modules[self.package]), *self.submodules, *self.exports})
+
+
+__all__ = ["Loader"]
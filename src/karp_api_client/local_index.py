@@ -0,0 +1,186 @@
+"""In-memory inverted index answering DSL queries offline."""
+
+import array
+import bisect
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union
+
+from karp_api_client import dsl
+from karp_api_client.api.querying.merge import KARP_DEFAULT_SIZE, sort_key
+from karp_api_client.api.querying.query import QueryOptions
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.query_response import QueryResponse
+
+# posting lists are sorted arrays of document numbers, 4 bytes each
+_EMPTY: "array.array[int]" = array.array("I")
+# the document numbers of removed entries are compacted once there are more of them than this, and than entries
+COMPACT_AFTER = 1024
+
+
+class LocalIndex:
+    """Inverted index over the fields of downloaded entries.
+
+    Every value of every field of `EntryDto.entry`, with nested fields named
+    with dots like `"senses.definition"` and lists indexed per item, maps to
+    a sorted posting list of compact integer document numbers. `dsl.Equals`
+    and `dsl.Or` queries are answered from the posting lists, with values
+    compared as strings, without calling Karp.
+
+    ```python
+    index = LocalIndex(mirror.entries())
+    hits = index.search(dsl.Equals(field="baseform", value="katt"))
+    response = index.query("saldo", query_options=QueryOptions(q=q, size=10))
+    ```
+
+    Adding an entry whose id is already indexed replaces it. The index is
+    not thread safe while it is being changed.
+    """
+
+    def __init__(self, entries: Iterable[EntryDto] = ()) -> None:
+        """Construct a LocalIndex of `entries`."""
+        # indexed by document number, None where an entry was removed
+        self._entries: list[Optional[EntryDto]] = []
+        self._numbers: dict[str, int] = {}
+        self._postings: dict[str, dict[str, array.array[int]]] = {}
+        self.add_all(entries)
+
+    def __len__(self) -> int:
+        """Get the number of indexed entries."""
+        return len(self._numbers)
+
+    def __contains__(self, entry_id: object) -> bool:
+        """Check if an entry with `entry_id` is indexed."""
+        return entry_id in self._numbers
+
+    @property
+    def fields(self) -> list[str]:
+        """Names of the indexed fields."""
+        return sorted(self._postings)
+
+    def add(self, entry: EntryDto) -> None:
+        """Index `entry`, replacing an indexed entry with the same id."""
+        self.remove(entry.id)
+        number = len(self._entries)
+        self._entries.append(entry)
+        self._numbers[entry.id] = number
+        for field, value in _field_values(entry.entry.additional_properties):
+            values = self._postings.get(field)
+            if values is None:
+                values = self._postings[field] = {}
+            postings = values.get(value)
+            if postings is None:
+                postings = values[value] = array.array("I")
+            # numbers only grow, so appending keeps the list sorted; a value repeated in a list is indexed once
+            if not postings or postings[-1] != number:
+                postings.append(number)
+
+    def add_all(self, entries: Iterable[EntryDto]) -> None:
+        """Index each of `entries`."""
+        for entry in entries:
+            self.add(entry)
+
+    def remove(self, entry_id: str) -> None:
+        """Remove the entry with `entry_id`, if indexed."""
+        number = self._numbers.pop(entry_id, None)
+        if number is None:
+            return
+        entry = self._entries[number]
+        self._entries[number] = None
+        if entry is None:
+            return
+        self._remove_postings(entry, number)
+        removed = len(self._entries) - len(self._numbers)
+        if removed > COMPACT_AFTER and removed > len(self._numbers):
+            self._compact()
+
+    def _remove_postings(self, entry: EntryDto, number: int) -> None:
+        for field, value in _field_values(entry.entry.additional_properties):
+            values = self._postings[field]
+            postings = values.get(value)
+            if postings is None:
+                continue
+            i = bisect.bisect_left(postings, number)
+            if i < len(postings) and postings[i] == number:
+                del postings[i]
+            if not postings:
+                del values[value]
+
+    def _compact(self) -> None:
+        """Renumber the entries from 0, dropping the removed ones."""
+        renumbered = array.array("I", [0]) * len(self._entries)
+        entries: list[Optional[EntryDto]] = []
+        for number, entry in enumerate(self._entries):
+            if entry is not None:
+                renumbered[number] = len(entries)
+                entries.append(entry)
+        self._entries = entries
+        self._numbers = {entry_id: renumbered[number] for entry_id, number in self._numbers.items()}
+        # the order is kept, so the posting lists stay sorted
+        for values in self._postings.values():
+            for value, postings in values.items():
+                values[value] = array.array("I", [renumbered[number] for number in postings])
+
+    def search(self, q: Optional[dsl.Query]) -> list[EntryDto]:
+        """Get all entries matching `q`, or all entries if None, in the order they were added.
+
+        Raises:
+            ValueError: If `q` uses a query the index cannot evaluate.
+        """
+        return [entry for number in self._evaluate(q) if (entry := self._entries[number]) is not None]
+
+    def query(
+        self,
+        resources: Union[str, Sequence[str], None] = None,
+        *,
+        query_options: Optional[QueryOptions] = None,
+    ) -> QueryResponse:
+        """Answer a query like `query_sync` would, from the index.
+
+        Honours `q`, `from_`, `size`, `sort` and `lexicon_stats` of
+        `query_options`. `q` must be a `dsl.Query`, Karp query strings are not
+        parsed. Only entries of `resources` are searched, if given.
+
+        Raises:
+            ValueError: If `q` is a string or uses a query the index cannot evaluate.
+        """
+        query_options = query_options or QueryOptions()
+        if isinstance(query_options.q, str):
+            raise ValueError("a local index only evaluates dsl queries, not query strings")
+        hits = self.search(query_options.q)
+        if resources is not None:
+            wanted = set(resources.split(",") if isinstance(resources, str) else resources)
+            hits = [entry for entry in hits if entry.resource in wanted]
+        distribution = None if query_options.lexicon_stats is False else dict(Counter(hit.resource for hit in hits))
+        if query_options.sort:
+            hits.sort(key=sort_key(query_options.sort))
+        from_ = query_options.from_ or 0
+        size = KARP_DEFAULT_SIZE if query_options.size is None else query_options.size
+        return QueryResponse(total=len(hits), hits=hits[from_ : from_ + size], distribution=distribution)
+
+    def _evaluate(self, q: Optional[dsl.Query]) -> Sequence[int]:
+        if q is None:
+            # an entry is numbered when added, so the numbers are in order
+            return list(self._numbers.values())
+        if isinstance(q, dsl.Equals):
+            return self._postings.get(str(q.field), {}).get(str(q.value), _EMPTY)
+        if isinstance(q, dsl.Or):
+            postings = [self._evaluate(sub) for sub in q.ors]
+            if len(postings) == 1:
+                return postings[0]
+            return sorted(set().union(*postings))
+        raise ValueError(f"cannot evaluate {q!r} in a local index")
+
+
+def _field_values(data: dict[str, Any], prefix: str = "") -> Iterable[tuple[str, str]]:
+    for name, value in data.items():
+        field = f"{prefix}{name}"
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if isinstance(item, dict):
+                yield from _field_values(item, f"{field}.")
+            elif item is not None:
+                yield field, str(item)
+
+
+__all__ = ["LocalIndex"]
@@ -0,0 +1,415 @@
+"""Local mirrors of resources, kept up to date from the history endpoint."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Generator, Iterable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import attrs
+from returns.result import Failure, Result
+
+from karp_api_client import AuthenticatedClient, Client, errors
+from karp_api_client.api.history.get_history import HistoryOptions, get_history_async, get_history_sync
+from karp_api_client.api.querying.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PaginationProgress,
+    iter_query_async,
+    iter_query_sync,
+)
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.entry_dto_entry import EntryDtoEntry
+from karp_api_client.models.entry_op import EntryOp
+from karp_api_client.models.get_history_dto import GetHistoryDto
+from karp_api_client.models.history_dto import HistoryDto
+from karp_api_client.models.http_validation_error import HttpValidationError
+from karp_api_client.shared import Response
+
+# times paging through the history starts over when changes shift the pages, before giving up on that update
+MAX_HISTORY_RESTARTS = 3
+
+
+@attrs.define
+class MirrorUpdate:
+    """What one update of a ResourceMirror did.
+
+    Attributes:
+    full (bool): whether the resource was downloaded in full.
+    added (int): entries added.
+    updated (int): entries replaced by a newer version.
+    deleted (int): entries removed.
+    unchanged (int): entries or changes that were already applied.
+    requests (int): requests sent.
+    checkpoint (Optional[float]): the checkpoint after the update.
+    """
+
+    full: bool = False
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    requests: int = 0
+    checkpoint: Optional[float] = None
+
+
+class ResourceMirror:
+    """Full local copy of a resource, stored in SQLite and updated incrementally.
+
+    The first update downloads every entry of the resource with paginated
+    queries. Later updates only read the changes since the stored checkpoint
+    from `/history/{resource_id}` and apply the newest change to each entry,
+    in one transaction. A change is applied if its version, or its
+    `last_modified` for the same version, is newer than the stored one, and
+    discarded entries are removed, so reading the same change twice is
+    harmless. `overlap` seconds of history before the checkpoint are read
+    again on each update, to pick up changes committed late and to allow for
+    clock skew between us and the server. Each update pages through the
+    history up to the time it started, so that changes made meanwhile are
+    left for the next update.
+
+    ```python
+    with ResourceMirror("saldo", "saldo.db", client=client) as mirror:
+        mirror.update_sync()
+        entry = mirror.get("01BJQMF54D093DXEAWZ6JYRPAQ")
+    ```
+
+    The database file keeps the mirror and its checkpoint across restarts and
+    can hold mirrors of several resources. A mirror is thread safe, but only
+    one update should run at a time.
+    """
+
+    def __init__(
+        self,
+        resource_id: str,
+        path: Union[str, Path],
+        *,
+        client: Union[Client, AuthenticatedClient],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        overlap: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open, or create, the mirror of `resource_id` at `path`."""
+        self.resource_id = resource_id
+        self.path = Path(path)
+        self.client = client
+        self.page_size = page_size
+        self.overlap = overlap
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # discarded entries are kept as tombstones, so that an older change read again cannot restore them
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " resource TEXT NOT NULL,"
+            " id TEXT NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " last_modified REAL NOT NULL,"
+            " discarded INTEGER NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " PRIMARY KEY (resource, id))"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS checkpoints (resource TEXT PRIMARY KEY, timestamp REAL NOT NULL)")
+
+    def __len__(self) -> int:
+        """Get the number of entries in the mirror."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT count(*) FROM entries WHERE resource = ? AND NOT discarded", (self.resource_id,)
+            ).fetchone()[0]
+
+    def __enter__(self) -> "ResourceMirror":
+        """Enter a context manager that closes the mirror."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the mirror."""
+        self.close()
+
+    @property
+    def checkpoint(self) -> Optional[float]:
+        """Timestamp up to which changes have been applied, None before the first update."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT timestamp FROM checkpoints WHERE resource = ?", (self.resource_id,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def get(self, entry_id: str) -> Optional[EntryDto]:
+        """Get an entry, if in the mirror."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM entries WHERE resource = ? AND id = ? AND NOT discarded",
+                (self.resource_id, entry_id),
+            ).fetchone()
+        return None if row is None else EntryDto.from_dict(json.loads(row[0]))
+
+    def entries(self) -> list[EntryDto]:
+        """Get all entries in the mirror, ordered by id."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT payload FROM entries WHERE resource = ? AND NOT discarded ORDER BY id", (self.resource_id,)
+            ).fetchall()
+        return [EntryDto.from_dict(json.loads(payload)) for (payload,) in rows]
+
+    def update_sync(self) -> MirrorUpdate:
+        """Bring the mirror up to date, downloading the resource in full the first time.
+
+        Raises:
+            errors.QueryFailed: If a page of entries or of history could not be fetched.
+        """
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            update = MirrorUpdate(full=True)
+            started = self._clock()
+            progress = PaginationProgress()
+            for batch in _batched(
+                iter_query_sync(self.resource_id, client=self.client, page_size=self.page_size, progress=progress),
+                self.page_size,
+            ):
+                self._apply(batch, update)
+            update.requests = progress.pages_fetched
+            return self._finish_full(update, started)
+
+        update = MirrorUpdate()
+        paging = _HistoryPaging(from_date=checkpoint - self.overlap, to_date=self._clock())
+        changes: dict[str, EntryDto] = {}
+        for page in self._history_pages_sync(paging, update):
+            self._collect(page, changes)
+        self._apply(changes.values(), update)
+        return self._finish(update, checkpoint, paging)
+
+    async def update_async(self) -> MirrorUpdate:
+        """Bring the mirror up to date, downloading the resource in full the first time.
+
+        Raises:
+            errors.QueryFailed: If a page of entries or of history could not be fetched.
+        """
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            update = MirrorUpdate(full=True)
+            started = self._clock()
+            progress = PaginationProgress()
+            batch: list[EntryDto] = []
+            async for entry in iter_query_async(
+                self.resource_id, client=self.client, page_size=self.page_size, progress=progress
+            ):
+                batch.append(entry)
+                if len(batch) >= self.page_size:
+                    self._apply(batch, update)
+                    batch = []
+            self._apply(batch, update)
+            update.requests = progress.pages_fetched
+            return self._finish_full(update, started)
+
+        update = MirrorUpdate()
+        paging = _HistoryPaging(from_date=checkpoint - self.overlap, to_date=self._clock())
+        changes: dict[str, EntryDto] = {}
+        async for page in self._history_pages_async(paging, update):
+            self._collect(page, changes)
+        self._apply(changes.values(), update)
+        return self._finish(update, checkpoint, paging)
+
+    def reset(self) -> None:
+        """Remove all entries and the checkpoint, so that the next update downloads the resource in full."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM entries WHERE resource = ?", (self.resource_id,))
+            self._db.execute("DELETE FROM checkpoints WHERE resource = ?", (self.resource_id,))
+            self._db.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def _history_pages_sync(
+        self, paging: "_HistoryPaging", update: MirrorUpdate
+    ) -> Generator[GetHistoryDto, None, None]:
+        while True:
+            result = get_history_sync(
+                self.resource_id, client=self.client, history_options=self._history_options(paging)
+            )
+            update.requests += 1
+            page = _unwrap_history_page(result)
+            if paging.restart(page):
+                continue
+            yield page
+            if not paging.advance(page, self.page_size):
+                return
+
+    async def _history_pages_async(
+        self, paging: "_HistoryPaging", update: MirrorUpdate
+    ) -> AsyncGenerator[GetHistoryDto, None]:
+        while True:
+            result = await get_history_async(
+                self.resource_id, client=self.client, history_options=self._history_options(paging)
+            )
+            update.requests += 1
+            page = _unwrap_history_page(result)
+            if paging.restart(page):
+                continue
+            yield page
+            if not paging.advance(page, self.page_size):
+                return
+
+    def _history_options(self, paging: "_HistoryPaging") -> HistoryOptions:
+        return HistoryOptions(
+            from_date=paging.from_date,
+            to_date=paging.to_date,
+            current_page=paging.page_number,
+            page_size=self.page_size,
+        )
+
+    def _collect(self, page: GetHistoryDto, changes: dict[str, EntryDto]) -> None:
+        # only the newest change to each entry is applied, whatever order the history is in
+        for change in page.history:
+            entry = _history_entry(self.resource_id, change)
+            newest = changes.get(entry.id)
+            if newest is None or (entry.version, entry.last_modified) > (newest.version, newest.last_modified):
+                changes[entry.id] = entry
+
+    def _apply(self, entries: Iterable[EntryDto], update: MirrorUpdate) -> None:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for entry in entries:
+                    self._apply_entry(entry, update)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _apply_entry(self, entry: EntryDto, update: MirrorUpdate) -> None:
+        stored = self._db.execute(
+            "SELECT version, last_modified, discarded FROM entries WHERE resource = ? AND id = ?",
+            (self.resource_id, entry.id),
+        ).fetchone()
+        discarded = entry.discarded is True
+        if stored is not None and (entry.version, entry.last_modified) <= (stored[0], stored[1]):
+            update.unchanged += 1
+            return
+        was_live = stored is not None and not stored[2]
+        if discarded:
+            if was_live:
+                update.deleted += 1
+            else:
+                update.unchanged += 1
+        elif was_live:
+            update.updated += 1
+        else:
+            update.added += 1
+        if update.checkpoint is None or entry.last_modified > update.checkpoint:
+            update.checkpoint = entry.last_modified
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (resource, id, version, last_modified, discarded, payload)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.resource_id,
+                entry.id,
+                entry.version,
+                entry.last_modified,
+                discarded,
+                json.dumps(entry.to_dict()).encode(),
+            ),
+        )
+
+    def _finish_full(self, update: MirrorUpdate, started: float) -> MirrorUpdate:
+        # changes made during the download are read from the history on the next update
+        newest = update.checkpoint
+        return self._store_checkpoint(update, started if newest is None else min(started, newest))
+
+    def _finish(self, update: MirrorUpdate, checkpoint: float, paging: "_HistoryPaging") -> MirrorUpdate:
+        newest = update.checkpoint
+        if paging.shifted or newest is None:
+            # a change may have been skipped, so the next update reads the same history again
+            return self._store_checkpoint(update, checkpoint)
+        return self._store_checkpoint(update, max(checkpoint, newest))
+
+    def _store_checkpoint(self, update: MirrorUpdate, checkpoint: float) -> MirrorUpdate:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints (resource, timestamp) VALUES (?, ?)",
+                (self.resource_id, checkpoint),
+            )
+        update.checkpoint = checkpoint
+        return update
+
+
+@attrs.define
+class _HistoryPaging:
+    """Position in the history between `from_date` and `to_date`.
+
+    Changes committed late into that window shift the pages, so paging starts
+    over when the total changes, at most MAX_HISTORY_RESTARTS times. After that
+    `shifted` is set and paging goes on up to the total seen then, so that it
+    ends even if the changes keep coming.
+    """
+
+    from_date: float
+    to_date: float
+    page_number: int = 0
+    total: Optional[int] = None
+    restarts: int = 0
+    shifted: bool = False
+
+    def restart(self, page: GetHistoryDto) -> bool:
+        """Check whether the pages shifted since the last page, and if so start over unless restarted too often."""
+        if self.total is None:
+            self.total = page.total
+        if self.shifted or page.total == self.total:
+            return False
+        if self.restarts >= MAX_HISTORY_RESTARTS:
+            self.shifted = True
+            return False
+        self.total = page.total
+        self.restarts += 1
+        self.page_number = 0
+        return True
+
+    def advance(self, page: GetHistoryDto, page_size: int) -> bool:
+        """Move to the next page, returning False after the last page."""
+        if not page.history or (self.page_number + 1) * page_size >= (self.total or 0):
+            return False
+        self.page_number += 1
+        return True
+
+
+def _history_entry(resource_id: str, change: HistoryDto) -> EntryDto:
+    return EntryDto(
+        id=change.id,
+        version=change.version,
+        last_modified=change.timestamp,
+        last_modified_by=change.user_id,
+        resource=resource_id,
+        entry=EntryDtoEntry.from_dict(change.entry),
+        message=change.message,
+        discarded=change.op is EntryOp.DELETED,
+    )
+
+
+def _unwrap_history_page(
+    result: Result[Response[GetHistoryDto], Response[Optional[HttpValidationError]]],
+) -> GetHistoryDto:
+    if isinstance(result, Failure):
+        raise errors.QueryFailed(result.failure())
+    response = result.unwrap()
+    if response.parsed is None:
+        raise errors.QueryFailed(response)
+    return response.parsed
+
+
+def _batched(entries: Iterable[EntryDto], size: int) -> Generator[list[EntryDto], None, None]:
+    batch: list[EntryDto] = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+__all__ = ["MirrorUpdate", "ResourceMirror"]
@@ -1,8 +1,43 @@
 """Models used by Karp API."""
 
-from .entry_dto import EntryDto
-from .entry_dto_entry import EntryDtoEntry
-from .query_response import QueryResponse
-from .validation_error import ValidationError
+from typing import TYPE_CHECKING
 
-__all__ = ["EntryDto", "EntryDtoEntry", "QueryResponse", "ValidationError"]
+from karp_api_client import lazy
+
+if TYPE_CHECKING:
+    from .entries_by_id_response import EntriesByIdResponse
+    from .entry_dto import EntryDto
+    from .entry_dto_entry import EntryDtoEntry
+    from .entry_op import EntryOp
+    from .get_history_dto import GetHistoryDto
+    from .history_dto import HistoryDto
+    from .query_response import LazyHits, QueryResponse
+    from .validation_error import ValidationError
+
+__getattr__ = lazy.Loader(
+    __name__,
+    exports={
+        "EntriesByIdResponse": "entries_by_id_response",
+        "EntryDto": "entry_dto",
+        "EntryDtoEntry": "entry_dto_entry",
+        "EntryOp": "entry_op",
+        "GetHistoryDto": "get_history_dto",
+        "HistoryDto": "history_dto",
+        "LazyHits": "query_response",
+        "QueryResponse": "query_response",
+        "ValidationError": "validation_error",
+    },
+)
+__dir__ = __getattr__.names
+
+__all__ = [
+    "EntriesByIdResponse",
+    "EntryDto",
+    "EntryDtoEntry",
+    "EntryOp",
+    "GetHistoryDto",
+    "HistoryDto",
+    "LazyHits",
+    "QueryResponse",
+    "ValidationError",
+]
@@ -0,0 +1,52 @@
+"""Entries By Id Response."""
+
+from typing import Any, Optional, TypeVar
+
+import attrs
+
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.shared import AdditionalProperties, additional_properties_field
+
+T = TypeVar("T", bound="EntriesByIdResponse")
+
+
+@attrs.define
+class EntriesByIdResponse(AdditionalProperties):
+    """Response returned from get entries by id."""
+
+    total: int
+    hits: list["EntryDto"]
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to dict."""
+        hits = [entry.to_dict() for entry in self.hits]
+
+        field_dict: dict[str, Any] = {
+            "total": self.total,
+        }
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
+
+        field_dict.update(
+            {
+                "hits": hits,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: dict[str, Any]) -> T:
+        """Deserialize from dict."""
+        d = src_dict.copy()
+        hits = [EntryDto.from_dict(entry) for entry in d.pop("hits")]
+        total = d.pop("total")
+
+        entries_by_id_response = cls(
+            total=total,
+            hits=hits,
+        )
+
+        entries_by_id_response._additional_properties = d or None
+        return entries_by_id_response
@@ -1,11 +1,10 @@
 """EntryDto model."""
 
-from typing import TYPE_CHECKING, Any, TypeVar, Union, cast
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union, cast
 
 from attrs import define as _attrs_define
-from attrs import field as _attrs_field
 
-from karp_api_client.shared import UNSET, Unset
+from karp_api_client.shared import UNSET, AdditionalProperties, Unset, additional_properties_field, intern_str
 
 if TYPE_CHECKING:
     from karp_api_client.models.entry_dto_entry import EntryDtoEntry
@@ -15,7 +14,7 @@ T = TypeVar("T", bound="EntryDto")
 
 
 @_attrs_define
-class EntryDto:
+class EntryDto(AdditionalProperties):
     """EntryDto.
 
     Attributes:
@@ -37,7 +36,7 @@ class EntryDto:
     entry: "EntryDtoEntry"
     message: Union[Unset, str, None] = UNSET
     discarded: Union[Unset, bool] = False
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize this object to dict."""
@@ -59,7 +58,8 @@ class EntryDto:
         discarded = self.discarded
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update(
             {
                 "id": id_,
@@ -89,9 +89,9 @@ class EntryDto:
 
         last_modified = d.pop("last_modified")
 
-        last_modified_by = d.pop("last_modified_by")
+        last_modified_by = intern_str(d.pop("last_modified_by"))
 
-        resource = d.pop("resource")
+        resource = intern_str(d.pop("resource"))
 
         entry = EntryDtoEntry.from_dict(d.pop("entry"))
 
@@ -117,26 +117,5 @@ class EntryDto:
             discarded=discarded,
         )
 
-        entry_dto.additional_properties = d
+        entry_dto._additional_properties = d or None
         return entry_dto
-
-    @property
-    def additional_keys(self) -> list[str]:
-        """Return any additional keys."""
-        return list(self.additional_properties.keys())
-
-    def __getitem__(self, key: str) -> Any:
-        """Get an additional property by key."""
-        return self.additional_properties[key]
-
-    def __setitem__(self, key: str, value: Any) -> None:
-        """Set an additional property."""
-        self.additional_properties[key] = value
-
-    def __delitem__(self, key: str) -> None:
-        """Delete an additional property."""
-        del self.additional_properties[key]
-
-    def __contains__(self, key: str) -> bool:
-        """Check if this object contains an additional propery 'key'."""
-        return key in self.additional_properties
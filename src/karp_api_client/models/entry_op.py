@@ -0,0 +1,15 @@
+"""EntryOp model."""
+
+from enum import Enum
+
+
+class EntryOp(str, Enum):
+    """Kind of change recorded in the history of a resource."""
+
+    ADDED = "ADDED"
+    DELETED = "DELETED"
+    UPDATED = "UPDATED"
+
+    def __str__(self) -> str:
+        """Format as the value."""
+        return str(self.value)
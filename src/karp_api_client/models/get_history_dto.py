@@ -0,0 +1,51 @@
+"""GetHistoryDto model."""
+
+from typing import Any, Optional, TypeVar
+
+import attrs
+
+from karp_api_client.models.history_dto import HistoryDto
+from karp_api_client.shared import AdditionalProperties, additional_properties_field
+
+T = TypeVar("T", bound="GetHistoryDto")
+
+
+@attrs.define
+class GetHistoryDto(AdditionalProperties):
+    """Response returned from get history, one page of changes to a resource."""
+
+    history: list["HistoryDto"]
+    total: int
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize to dict."""
+        history = [change.to_dict() for change in self.history]
+
+        field_dict: dict[str, Any] = {}
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
+
+        field_dict.update(
+            {
+                "history": history,
+                "total": self.total,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: dict[str, Any]) -> T:
+        """Deserialize from dict."""
+        d = src_dict.copy()
+        history = [HistoryDto.from_dict(change) for change in d.pop("history")]
+        total = d.pop("total")
+
+        get_history_dto = cls(
+            history=history,
+            total=total,
+        )
+
+        get_history_dto._additional_properties = d or None
+        return get_history_dto
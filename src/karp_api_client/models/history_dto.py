@@ -0,0 +1,74 @@
+"""HistoryDto model."""
+
+from typing import Any, Optional, TypeVar
+
+from attrs import define as _attrs_define
+
+from karp_api_client.models.entry_op import EntryOp
+from karp_api_client.shared import AdditionalProperties, additional_properties_field, intern_str
+
+T = TypeVar("T", bound="HistoryDto")
+
+
+@_attrs_define
+class HistoryDto(AdditionalProperties):
+    """HistoryDto.
+
+    Attributes:
+    id (str): id of the changed entry.
+    timestamp (float):
+    message (str):
+    version (int): version of the entry after the change.
+    op (EntryOp):
+    user_id (str):
+    diff (list[dict[str, Any]]):
+    entry (dict[str, Any]): the entry after the change.
+    """
+
+    id: str
+    timestamp: float
+    message: str
+    version: int
+    op: EntryOp
+    user_id: str
+    diff: list[dict[str, Any]]
+    entry: dict[str, Any]
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize this object to dict."""
+        field_dict: dict[str, Any] = {}
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
+        field_dict.update(
+            {
+                "id": self.id,
+                "timestamp": self.timestamp,
+                "message": self.message,
+                "version": self.version,
+                "op": self.op.value,
+                "userId": self.user_id,
+                "diff": self.diff,
+                "entry": self.entry,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: dict[str, Any]) -> T:
+        """Deserialize from dict."""
+        d = src_dict.copy()
+        history_dto = cls(
+            id=d.pop("id"),
+            timestamp=d.pop("timestamp"),
+            message=d.pop("message"),
+            version=d.pop("version"),
+            op=EntryOp(d.pop("op")),
+            user_id=intern_str(d.pop("userId")),
+            diff=d.pop("diff"),
+            entry=d.pop("entry"),
+        )
+
+        history_dto._additional_properties = d or None
+        return history_dto
@@ -1,11 +1,10 @@
 """Http Validation Error."""
 
-from typing import TYPE_CHECKING, Any, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
 
 from attrs import define as _attrs_define
-from attrs import field as _attrs_field
 
-from karp_api_client.shared import UNSET, Unset
+from karp_api_client.shared import UNSET, AdditionalProperties, Unset, additional_properties_field
 
 if TYPE_CHECKING:
     from karp_api_client.models.validation_error import ValidationError
@@ -15,7 +14,7 @@ T = TypeVar("T", bound="HttpValidationError")
 
 
 @_attrs_define
-class HttpValidationError:
+class HttpValidationError(AdditionalProperties):
     """Http Validation Error.
 
     Attributes:
@@ -23,7 +22,7 @@ class HttpValidationError:
     """
 
     detail: Union[Unset, list["ValidationError"]] = UNSET
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
 
     def to_dict(self) -> dict[str, Any]:
         """Serizalize this entity to dict."""
@@ -35,7 +34,8 @@ class HttpValidationError:
                 detail.append(detail_item)
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update({})
         if detail is not UNSET:
             field_dict["detail"] = detail
@@ -59,26 +59,5 @@ class HttpValidationError:
             detail=detail,
         )
 
-        http_validation_error.additional_properties = d
+        http_validation_error._additional_properties = d or None
         return http_validation_error
-
-    @property
-    def additional_keys(self) -> list[str]:
-        """List of any additional keys."""
-        return list(self.additional_properties.keys())
-
-    def __getitem__(self, key: str) -> Any:
-        """Get an addtional property."""
-        return self.additional_properties[key]
-
-    def __setitem__(self, key: str, value: Any) -> None:
-        """Set additional property by 'key'."""
-        self.additional_properties[key] = value
-
-    def __delitem__(self, key: str) -> None:
-        """Delete additional property."""
-        del self.additional_properties[key]
-
-    def __contains__(self, key: str) -> bool:
-        """Check if additional property includes 'key'."""
-        return key in self.additional_properties
@@ -1,23 +1,84 @@
 """Query Response."""
 
-from typing import TYPE_CHECKING, Any, Optional, TypeVar
+from collections.abc import Iterator, Sequence
+from typing import Any, Optional, TypeVar, Union, cast, overload
 
 import attrs
 
-if TYPE_CHECKING:
-    from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.models.entry_dto import EntryDto
+from karp_api_client.shared import AdditionalProperties, additional_properties_field
 
 T = TypeVar("T", bound="QueryResponse")
 
 
+class LazyHits(Sequence["EntryDto"]):
+    """Sequence of hits that builds each EntryDto on first access.
+
+    The built EntryDto is cached, so repeated access returns the same object.
+    """
+
+    __slots__ = ("_decoded", "_raw")
+
+    def __init__(self, raw: list[dict[str, Any]]) -> None:
+        self._raw: list[Optional[dict[str, Any]]] = list(raw)
+        self._decoded: list[Optional[EntryDto]] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        """Get the number of hits."""
+        return len(self._decoded)
+
+    @overload
+    def __getitem__(self, index: int) -> "EntryDto": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list["EntryDto"]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union["EntryDto", list["EntryDto"]]:
+        """Get hit(s) by index, building them if needed."""
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("hit index out of range")
+        return self._get(index)
+
+    def __iter__(self) -> Iterator["EntryDto"]:
+        """Iterate over the hits, building them if needed."""
+        for i in range(len(self)):
+            yield self._get(i)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare hits with another sequence of hits."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Show how many hits are built."""
+        built = sum(hit is not None for hit in self._decoded)
+        return f"LazyHits(len={len(self)}, built={built})"
+
+    def _get(self, index: int) -> "EntryDto":
+        hit = self._decoded[index]
+        if hit is None:
+            hit = EntryDto.from_dict(cast(dict[str, Any], self._raw[index]))
+            self._decoded[index] = hit
+            # the built hit holds its own copies, so the raw dict can go
+            self._raw[index] = None
+        return hit
+
+
 @attrs.define
-class QueryResponse:
+class QueryResponse(AdditionalProperties):
     """Response returned from query."""
 
     total: int
-    hits: list["EntryDto"]
+    hits: Sequence["EntryDto"]
     distribution: Optional[dict[str, int]]
-    additional_properties: dict[str, Any] = attrs.field(init=False, factory=dict)
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize to dict."""
@@ -27,7 +88,8 @@ class QueryResponse:
             "total": self.total,
             "distibution": self.distribution,
         }
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
 
         field_dict.update(
             {
@@ -38,12 +100,15 @@ class QueryResponse:
         return field_dict
 
     @classmethod
-    def from_dict(cls: type[T], src_dict: dict[str, Any]) -> T:
-        """Deserialize from dict."""
-        from karp_api_client.models.entry_dto import EntryDto  # noqa: PLC0415
+    def from_dict(cls: type[T], src_dict: dict[str, Any], *, lazy_hits: bool = False) -> T:
+        """Deserialize from dict.
 
+        With `lazy_hits`, `hits` is a `LazyHits` that builds each EntryDto on first access.
+        """
         d = src_dict.copy()
-        hits = [EntryDto.from_dict(entry) for entry in d.pop("hits")]
+        hits: Sequence[EntryDto] = (
+            LazyHits(d.pop("hits")) if lazy_hits else [EntryDto.from_dict(entry) for entry in d.pop("hits")]
+        )
         total = d.pop("total")
         distribution = d.pop("distribution")
 
@@ -53,26 +118,5 @@ class QueryResponse:
             distribution=distribution,
         )
 
-        query_response.additional_properties = d
+        query_response._additional_properties = d or None
         return query_response
-
-    @property
-    def additional_keys(self) -> list[str]:
-        """Get additional property keys."""
-        return list(self.additional_properties.keys())
-
-    def __getitem__(self, key: str) -> Any:
-        """Get an additional property by 'key'."""
-        return self.additional_properties[key]
-
-    def __setitem__(self, key: str, value: Any) -> None:
-        """Set an additional property by 'key'."""
-        self.additional_properties[key] = value
-
-    def __delitem__(self, key: str) -> None:
-        """Delete an additional property by 'key'."""
-        del self.additional_properties[key]
-
-    def __contains__(self, key: str) -> bool:
-        """Check if additional properties contains 'key'."""
-        return key in self.additional_properties
@@ -1,15 +1,16 @@
 """Validation error."""
 
-from typing import Any, TypeVar, Union, cast
+from typing import Any, Optional, TypeVar, Union, cast
 
 from attrs import define as _attrs_define
-from attrs import field as _attrs_field
+
+from karp_api_client.shared import AdditionalProperties, additional_properties_field, intern_str
 
 T = TypeVar("T", bound="ValidationError")
 
 
 @_attrs_define
-class ValidationError:
+class ValidationError(AdditionalProperties):
     """Validation error.
 
     Attributes:
@@ -21,7 +22,7 @@ class ValidationError:
     loc: list[Union[int, str]]
     msg: str
     type_: str
-    additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
+    _additional_properties: Optional[dict[str, Any]] = additional_properties_field()
 
     def to_dict(self) -> dict[str, Any]:
         """Serialize to dict."""
@@ -36,7 +37,8 @@ class ValidationError:
         type_ = self.type_
 
         field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
+        if self._additional_properties:
+            field_dict.update(self._additional_properties)
         field_dict.update(
             {
                 "loc": loc,
@@ -64,7 +66,7 @@ class ValidationError:
 
         msg = d.pop("msg")
 
-        type_ = d.pop("type")
+        type_ = intern_str(d.pop("type"))
 
         validation_error = cls(
             loc=loc,
@@ -72,26 +74,5 @@ class ValidationError:
             type_=type_,
         )
 
-        validation_error.additional_properties = d
+        validation_error._additional_properties = d or None
         return validation_error
-
-    @property
-    def additional_keys(self) -> list[str]:
-        """Additonal keys."""
-        return list(self.additional_properties.keys())
-
-    def __getitem__(self, key: str) -> Any:
-        """Get an additional property by 'key'."""
-        return self.additional_properties[key]
-
-    def __setitem__(self, key: str, value: Any) -> None:
-        """Set an additional property by 'key'."""
-        self.additional_properties[key] = value
-
-    def __delitem__(self, key: str) -> None:
-        """Delete an additional property by 'key'."""
-        del self.additional_properties[key]
-
-    def __contains__(self, key: str) -> bool:
-        """Check if this the additional properties contains 'key'."""
-        return key in self.additional_properties
@@ -0,0 +1,92 @@
+"""Connection pool configuration and statistics."""
+
+from typing import Any, Optional, Union
+
+import attrs
+import httpx
+
+
+@attrs.define(frozen=True)
+class PoolProfile:
+    """Connection pool configuration for a client.
+
+    HTTP/2 multiplexes concurrent requests over one connection per host and
+    requires the `h2` package (`pip install karp-api-client[http2]`).
+
+    Attributes:
+    max_connections (Optional[int]): maximum number of open connections, None for no limit.
+    max_keepalive_connections (Optional[int]): maximum number of idle connections kept open.
+    keepalive_expiry (Optional[float]): seconds an idle connection is kept open.
+    http2 (bool): negotiate HTTP/2 when the server supports it.
+    """
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    http2: bool = False
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """The httpx limits for this profile."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+DEFAULT_POOL = PoolProfile()
+"""httpx's defaults."""
+
+HIGH_CONCURRENCY_POOL = PoolProfile(max_connections=200, max_keepalive_connections=100, keepalive_expiry=30.0)
+"""Many parallel HTTP/1.1 connections kept alive, for busy async workers."""
+
+HTTP2_POOL = PoolProfile(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0, http2=True)
+"""Few long-lived HTTP/2 connections that multiplex concurrent requests."""
+
+
+@attrs.define
+class PoolStats:
+    """Snapshot of a connection pool.
+
+    Attributes:
+    connections (int): open connections.
+    in_use (int): connections serving a request.
+    idle (int): connections kept alive for reuse.
+    http2 (int): connections using HTTP/2.
+    waiting (int): requests queued for a connection.
+    """
+
+    connections: int = 0
+    in_use: int = 0
+    idle: int = 0
+    http2: int = 0
+    waiting: int = 0
+
+
+def pool_stats(client: Union[httpx.Client, httpx.AsyncClient]) -> Optional[PoolStats]:
+    """Inspect the connection pool of an httpx client.
+
+    This reads httpcore internals, so it returns None for transports it does not know.
+    """
+    transport: Any = getattr(client, "_transport", None)
+    # unwrap transports wrapping another transport, e.g. ResilientTransport
+    while hasattr(transport, "transport"):
+        transport = transport.transport
+    pool = getattr(transport, "_pool", None)
+    if pool is None or not hasattr(pool, "connections"):
+        return None
+    connections = list(pool.connections)
+    idle = sum(1 for connection in connections if connection.is_idle())
+    http2 = sum(1 for connection in connections if "HTTP/2" in connection.info())
+    waiting = sum(1 for request in getattr(pool, "_requests", []) if request.is_queued())
+    return PoolStats(
+        connections=len(connections),
+        in_use=len(connections) - idle,
+        idle=idle,
+        http2=http2,
+        waiting=waiting,
+    )
+
+
+__all__ = ["DEFAULT_POOL", "HIGH_CONCURRENCY_POOL", "HTTP2_POOL", "PoolProfile", "PoolStats", "pool_stats"]
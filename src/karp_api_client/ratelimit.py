@@ -0,0 +1,208 @@
+"""Client-side rate limiting."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Optional
+
+import attrs
+import httpx
+
+from karp_api_client.instrumentation import TIMING_EXTENSION
+
+
+@attrs.define
+class RateLimit:
+    """A request budget.
+
+    Attributes:
+    rate (float): sustained requests per second.
+    burst (Optional[float]): requests that may be sent at once after being idle, defaults to `rate`.
+    """
+
+    rate: float
+    burst: Optional[float] = None
+
+    def __attrs_post_init__(self) -> None:
+        """Validate the budget."""
+        if self.rate <= 0:
+            raise ValueError(f"rate must be positive, got {self.rate}")
+
+
+@attrs.define
+class RateLimiterStats:
+    """Queueing statistics for a RateLimiter.
+
+    Attributes:
+    requests (int): requests that passed the limiter.
+    delayed (int): requests that had to wait.
+    total_delay (float): total seconds spent waiting.
+    max_delay (float): longest wait in seconds.
+    """
+
+    requests: int = 0
+    delayed: int = 0
+    total_delay: float = 0.0
+    max_delay: float = 0.0
+
+    @property
+    def mean_delay(self) -> float:
+        """Mean wait in seconds per request."""
+        if self.requests == 0:
+            return 0.0
+        return self.total_delay / self.requests
+
+    def record(self, delay: float) -> None:
+        """Record a request that waited `delay` seconds."""
+        self.requests += 1
+        if delay > 0:
+            self.delayed += 1
+            self.total_delay += delay
+            self.max_delay = max(self.max_delay, delay)
+
+
+class _TokenBucket:
+    def __init__(self, limit: RateLimit, now: float) -> None:
+        self.rate = limit.rate
+        self.capacity = limit.burst if limit.burst is not None else limit.rate
+        self.tokens = self.capacity
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take a token, returning how long to wait until it is available.
+
+        Tokens may go negative, which queues later callers behind earlier ones.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Token-bucket rate limiter.
+
+    Attach one to a client with `Client(rate_limiter=...)` to limit the
+    requests of both its sync and async httpx clients. The limiter wraps the
+    transport under the retries of `Client(resilience=...)`, so every retry
+    waits for a token too. The limiter is thread safe and can be shared
+    between several clients.
+
+    Every request takes a token from the `default` budget, if any, and from the
+    budget of its endpoint. Endpoints are matched by the longest prefix of the
+    request path relative to the base url, e.g. `"query"` or `"query/entries"`.
+    """
+
+    def __init__(
+        self,
+        default: Optional[RateLimit] = None,
+        *,
+        endpoints: Optional[Mapping[str, RateLimit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Construct a RateLimiter with a default and per-endpoint budgets."""
+        self._clock = clock
+        now = clock()
+        self._default = _TokenBucket(default, now) if default is not None else None
+        self._endpoints = {
+            endpoint.strip("/"): _TokenBucket(limit, now) for endpoint, limit in (endpoints or {}).items()
+        }
+        # longest prefix first
+        self._endpoint_names = sorted(self._endpoints, key=len, reverse=True)
+        self.stats = RateLimiterStats()
+        self.endpoint_stats: dict[str, RateLimiterStats] = {name: RateLimiterStats() for name in self._endpoints}
+        self._lock = threading.Lock()
+
+    def endpoint(self, path: str) -> Optional[str]:
+        """Get the configured endpoint matching `path`, if any."""
+        path = path.strip("/")
+        for name in self._endpoint_names:
+            if path == name or path.startswith(f"{name}/"):
+                return name
+        return None
+
+    def reserve(self, path: str = "") -> float:
+        """Reserve a slot for a request to `path`, returning how long to wait before sending it."""
+        endpoint = self.endpoint(path)
+        with self._lock:
+            now = self._clock()
+            delay = 0.0
+            if self._default is not None:
+                delay = self._default.reserve(now)
+            if endpoint is not None:
+                delay = max(delay, self._endpoints[endpoint].reserve(now))
+                self.endpoint_stats[endpoint].record(delay)
+            self.stats.record(delay)
+        return delay
+
+    def acquire(self, path: str = "") -> float:
+        """Wait until a request to `path` may be sent, returning the time waited."""
+        delay = self.reserve(path)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, path: str = "") -> float:
+        """Wait until a request to `path` may be sent, returning the time waited."""
+        delay = self.reserve(path)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """Transport that waits for a RateLimiter before sending each request."""
+
+    def __init__(self, transport: httpx.BaseTransport, rate_limiter: RateLimiter, *, base_path: str = "") -> None:
+        """Wrap `transport`, matching endpoints by the request path relative to `base_path`."""
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.base_path = base_path
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send `request` once the rate limiter allows it."""
+        _exclude_from_timing(request, self.rate_limiter.acquire(_relative_path(request, self.base_path)))
+        return self.transport.handle_request(request)
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async transport that waits for a RateLimiter before sending each request."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, rate_limiter: RateLimiter, *, base_path: str = "") -> None:
+        """Wrap `transport`, matching endpoints by the request path relative to `base_path`."""
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self.base_path = base_path
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send `request` once the rate limiter allows it."""
+        _exclude_from_timing(request, await self.rate_limiter.acquire_async(_relative_path(request, self.base_path)))
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
+
+
+def _exclude_from_timing(request: httpx.Request, delay: float) -> None:
+    timing = request.extensions.get(TIMING_EXTENSION)
+    if timing is not None and delay > 0:
+        timing.exclude(delay)
+
+
+def _relative_path(request: httpx.Request, base_path: str) -> str:
+    path = request.url.path
+    base_path = base_path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        return path[len(base_path) :]
+    return path
+
+
+__all__ = ["AsyncRateLimitedTransport", "RateLimit", "RateLimitedTransport", "RateLimiter", "RateLimiterStats"]
@@ -1,8 +1,9 @@
 """Utility types."""
 
+import sys
 from collections.abc import MutableMapping
 from http import HTTPStatus
-from typing import Generic, Literal, Optional, TypeVar
+from typing import Any, Generic, Literal, Optional, TypeVar
 
 import attrs
 
@@ -22,6 +23,79 @@ UNSET: Unset = Unset()
 T = TypeVar("T")
 
 
+def additional_properties_field() -> Any:
+    """Field for storing additional properties of a model.
+
+    The field is `None` until a property is set, so models without additional
+    properties don't carry an empty dict each. `None` compares equal to `{}`.
+    """
+    return attrs.field(
+        init=False,
+        default=None,
+        eq=attrs.cmp_using(eq=_additional_properties_eq, require_same_type=False),
+        repr=lambda value: repr(value or {}),
+    )
+
+
+def _additional_properties_eq(a: Optional[dict[str, Any]], b: Optional[dict[str, Any]]) -> bool:
+    return (a or {}) == (b or {})
+
+
+class AdditionalProperties:
+    """Access to the additional properties of a model, stored in an `additional_properties_field()`.
+
+    The mixin has no slots of its own, so it keeps the models slotted; each
+    model defines the `_additional_properties` field.
+    """
+
+    __slots__ = ()
+
+    _additional_properties: Optional[dict[str, Any]]
+
+    @property
+    def additional_properties(self) -> dict[str, Any]:
+        """Additional properties, created on first access."""
+        if self._additional_properties is None:
+            self._additional_properties = {}  # type: ignore[misc]
+        return self._additional_properties
+
+    @additional_properties.setter
+    def additional_properties(self, value: dict[str, Any]) -> None:
+        self._additional_properties = value  # type: ignore[misc]
+
+    @property
+    def additional_keys(self) -> list[str]:
+        """Keys of the additional properties."""
+        return list(self._additional_properties or ())
+
+    def __getitem__(self, key: str) -> Any:
+        """Get an additional property by 'key'."""
+        if self._additional_properties is None:
+            raise KeyError(key)
+        return self._additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set an additional property by 'key'."""
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Delete an additional property by 'key'."""
+        if self._additional_properties is None:
+            raise KeyError(key)
+        del self._additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        """Check if the additional properties contain 'key'."""
+        return self._additional_properties is not None and key in self._additional_properties
+
+
+def intern_str(value: Any) -> Any:
+    """Intern `value` if it is a string, to share repeated low-cardinality values."""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
 @attrs.define
 class Response(Generic[T]):
     """A response from an endpoint."""
@@ -0,0 +1,388 @@
+"""Resilient transports with retries, backoff and circuit breaking."""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Optional
+
+import attrs
+import httpx
+
+from karp_api_client import errors
+
+RETRYABLE_ERRORS: tuple[type[httpx.TransportError], ...] = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.ReadTimeout,
+    httpx.RemoteProtocolError,
+)
+
+
+@attrs.define
+class RetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    Only requests with a method in `retry_methods` are retried, so requests
+    with side effects are never sent twice.
+
+    Attributes:
+    max_retries (int): maximum number of retries per request.
+    backoff_factor (float): base delay in seconds, doubled for every retry.
+    max_backoff (float): maximum delay in seconds.
+    jitter (bool): draw the delay uniformly from [0, backoff] ("full jitter").
+    retry_statuses (frozenset[int]): response statuses that are retried.
+    retry_methods (frozenset[str]): idempotent methods that may be retried.
+    respect_retry_after (bool): wait as long as the `Retry-After` header asks, up to `max_retry_after`.
+    max_retry_after (float): give up rather than wait longer than this for `Retry-After`.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    retry_methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def backoff(self, retry: int, rng: Optional[random.Random] = None) -> float:
+        """Compute the delay before retry number `retry` (starting at 0)."""
+        delay = min(self.max_backoff, self.backoff_factor * (2**retry))
+        if self.jitter:
+            delay = (rng or random).uniform(0, delay)
+        return delay
+
+
+class RetryBudget:
+    """Caps retries to a share of the requests, to avoid retry storms.
+
+    Every request deposits `ratio` tokens, up to `max_tokens`, and every retry
+    withdraws one. When the budget is empty, failures are returned at once.
+    """
+
+    def __init__(self, ratio: float = 0.2, *, initial_tokens: float = 10.0, max_tokens: float = 100.0) -> None:
+        """Construct a RetryBudget allowing `ratio` retries per request."""
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min(initial_tokens, max_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Number of retries currently available."""
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Record a request."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Take one retry from the budget, returning False if it is empty."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+@attrs.define
+class _HostCircuit:
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit for that host
+    opens and requests fail fast with `errors.CircuitOpen`. After
+    `reset_timeout` seconds one probe request is let through; if it succeeds
+    the circuit closes again, otherwise it stays open for another period.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Construct a CircuitBreaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._circuits: dict[str, _HostCircuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        """Get the state of the circuit for `host`: 'closed', 'open' or 'half-open'."""
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return "closed"
+            if circuit.probing or self._clock() - circuit.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def before_request(self, host: str) -> None:
+        """Check that a request to `host` may be sent.
+
+        Raises:
+            errors.CircuitOpen: if the circuit for `host` is open.
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.opened_at is None:
+                return
+            remaining = self.reset_timeout - (self._clock() - circuit.opened_at)
+            if remaining > 0 or circuit.probing:
+                raise errors.CircuitOpen(host, max(remaining, 0.0))
+            circuit.probing = True
+
+    def record_success(self, host: str) -> None:
+        """Record a successful request to `host`, closing its circuit."""
+        with self._lock:
+            self._circuits.pop(host, None)
+
+    def cancel_probe(self, host: str) -> None:
+        """Let another request probe `host` after a probe ended without an outcome."""
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is not None:
+                circuit.probing = False
+
+    def record_failure(self, host: str) -> bool:
+        """Record a failed request to `host`, returning True if this opened the circuit."""
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _HostCircuit())
+            circuit.failures += 1
+            if circuit.probing or (circuit.opened_at is None and circuit.failures >= self.failure_threshold):
+                circuit.opened_at = self._clock()
+                circuit.probing = False
+                return True
+            return False
+
+
+@attrs.define
+class ResilienceMetrics:
+    """Counters for a resilient transport.
+
+    Attributes:
+    requests (int): requests sent by the client, not counting retries.
+    retries (int): retries sent.
+    backoff_seconds (float): total time spent waiting before retries.
+    retry_after_honoured (int): retries that waited for a `Retry-After` header.
+    retries_exhausted (int): requests that failed after using all retries.
+    budget_exhausted (int): retries skipped because the retry budget was empty.
+    circuit_opened (int): times a circuit opened.
+    circuit_rejected (int): requests rejected by an open circuit.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    backoff_seconds: float = 0.0
+    retry_after_honoured: int = 0
+    retries_exhausted: int = 0
+    budget_exhausted: int = 0
+    circuit_opened: int = 0
+    circuit_rejected: int = 0
+
+
+@attrs.define
+class Resilience:
+    """Configuration shared by the sync and async resilient transports of a client.
+
+    Attributes:
+    retry (RetryPolicy): when and how long to wait before retrying.
+    budget (Optional[RetryBudget]): optional cap on retries across requests.
+    circuit_breaker (Optional[CircuitBreaker]): optional per-host circuit breaker.
+    metrics (ResilienceMetrics): counters updated by the transports.
+    """
+
+    retry: RetryPolicy = attrs.field(factory=RetryPolicy)
+    budget: Optional[RetryBudget] = attrs.field(factory=RetryBudget)
+    circuit_breaker: Optional[CircuitBreaker] = attrs.field(factory=CircuitBreaker)
+    metrics: ResilienceMetrics = attrs.field(factory=ResilienceMetrics)
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False, repr=False, eq=False)
+
+    def before_request(self, request: httpx.Request) -> None:
+        """Check the circuit for the request's host."""
+        if self.circuit_breaker is None:
+            return
+        try:
+            self.circuit_breaker.before_request(request.url.host)
+        except errors.CircuitOpen:
+            self._count("circuit_rejected")
+            raise
+
+    def record(self, request: httpx.Request, *, failed: bool) -> None:
+        """Record the outcome of one attempt with the circuit breaker."""
+        if self.circuit_breaker is None:
+            return
+        if not failed:
+            self.circuit_breaker.record_success(request.url.host)
+        elif self.circuit_breaker.record_failure(request.url.host):
+            self._count("circuit_opened")
+
+    def abandon(self, request: httpx.Request) -> None:
+        """Record that an attempt ended without a response or retryable error."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.cancel_probe(request.url.host)
+
+    def retry_delay(self, request: httpx.Request, retry: int, response: Optional[httpx.Response]) -> Optional[float]:
+        """Decide whether to retry and how long to wait first.
+
+        Returns:
+            the delay in seconds, or None if the request should not be retried.
+        """
+        policy = self.retry
+        if request.method.upper() not in policy.retry_methods:
+            return None
+        if retry >= policy.max_retries:
+            self._count("retries_exhausted")
+            return None
+        delay = policy.backoff(retry)
+        if response is not None and policy.respect_retry_after:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                if retry_after > policy.max_retry_after:
+                    return None
+                delay = retry_after
+                self._count("retry_after_honoured")
+        if self.budget is not None and not self.budget.try_withdraw():
+            self._count("budget_exhausted")
+            return None
+        with self._lock:
+            self.metrics.retries += 1
+            self.metrics.backoff_seconds += delay
+        return delay
+
+    def start_request(self) -> None:
+        """Record a new request."""
+        self._count("requests")
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.metrics, name, getattr(self.metrics, name) + 1)
+
+
+class ResilientTransport(httpx.BaseTransport):
+    """Transport that retries idempotent requests and trips a circuit breaker."""
+
+    def __init__(self, transport: httpx.BaseTransport, resilience: Optional[Resilience] = None) -> None:
+        """Wrap `transport`."""
+        self.transport = transport
+        self.resilience = resilience or Resilience()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send `request`, retrying according to the retry policy."""
+        resilience = self.resilience
+        resilience.start_request()
+        retry = 0
+        while True:
+            resilience.before_request(request)
+            try:
+                response = self.transport.handle_request(request)
+            except RETRYABLE_ERRORS:
+                resilience.record(request, failed=True)
+                delay = resilience.retry_delay(request, retry, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                resilience.abandon(request)
+                raise
+            else:
+                resilience.record(request, failed=_is_server_failure(response))
+                if response.status_code not in resilience.retry.retry_statuses:
+                    return response
+                delay = resilience.retry_delay(request, retry, response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            retry += 1
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+
+class AsyncResilientTransport(httpx.AsyncBaseTransport):
+    """Async transport that retries idempotent requests and trips a circuit breaker."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, resilience: Optional[Resilience] = None) -> None:
+        """Wrap `transport`."""
+        self.transport = transport
+        self.resilience = resilience or Resilience()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send `request`, retrying according to the retry policy."""
+        resilience = self.resilience
+        resilience.start_request()
+        retry = 0
+        while True:
+            resilience.before_request(request)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except RETRYABLE_ERRORS:
+                resilience.record(request, failed=True)
+                delay = resilience.retry_delay(request, retry, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                resilience.abandon(request)
+                raise
+            else:
+                resilience.record(request, failed=_is_server_failure(response))
+                if response.status_code not in resilience.retry.retry_statuses:
+                    return response
+                delay = resilience.retry_delay(request, retry, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            retry += 1
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def _is_server_failure(response: httpx.Response) -> bool:
+    # 429 means we are sending too much, not that the host is unhealthy
+    return response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+
+
+__all__ = [
+    "AsyncResilientTransport",
+    "CircuitBreaker",
+    "Resilience",
+    "ResilienceMetrics",
+    "ResilientTransport",
+    "RetryBudget",
+    "RetryPolicy",
+    "parse_retry_after",
+]
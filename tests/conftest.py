@@ -0,0 +1,15 @@
+from collections.abc import Iterator
+
+import pytest
+from fakes import FakeKarp, make_entry, serve_locally
+
+
+@pytest.fixture
+def fake_karp() -> FakeKarp:
+    return FakeKarp([make_entry(i) for i in range(23)])
+
+
+@pytest.fixture
+def local_server() -> Iterator[str]:
+    with serve_locally() as base_url:
+        yield base_url
@@ -0,0 +1,161 @@
+"""Fake Karp server for tests."""
+
+import json
+import operator
+import threading
+import time
+from collections import Counter
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Union
+from urllib import parse
+
+import httpx
+
+from karp_api_client import AuthenticatedClient, Client
+
+BASE_URL = "https://karp.test/karp/v7"
+
+
+def make_entry(i: int, resource: str = "ao", **entry: Any) -> dict[str, Any]:
+    return {
+        "id": f"{resource}-{i:06d}",
+        "version": 1,
+        "last_modified": 1700000000.0 + i,
+        "last_modified_by": "local admin",
+        "resource": resource,
+        "entry": {"baseform": f"word{i}", **entry},
+        "message": None,
+        "discarded": False,
+    }
+
+
+class FakeKarp:
+    """Serves `/query/{resources}` from the entries of the resources and `/history/{resource_id}` from a list of changes.
+
+    Honours `from`, `size`, `sort` on entry fields, `path` and `q` made of `equals` and `or`,
+    and `from_date`, `to_date`, `current_page` and `page_size` for the history, newest first.
+    """
+
+    def __init__(self, entries: Sequence[dict[str, Any]]) -> None:
+        self.entries = list(entries)
+        self.history: list[dict[str, Any]] = []
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        params = dict(parse.parse_qsl(request.url.query.decode()))
+        if "/history/" in request.url.path:
+            return self._history(params)
+        from_ = int(params.get("from", 0))
+        size = int(params.get("size", 25))
+        resources = set(request.url.path.rsplit("/", 1)[-1].split(","))
+        entries = [
+            entry for entry in self.entries if entry["resource"] in resources and _matches(params.get("q"), entry)
+        ]
+        for sort in reversed(params.get("sort", "").split(",") if params.get("sort") else []):
+            field, _, order = sort.partition("|")
+            entries.sort(key=lambda entry: entry["entry"][field], reverse=order == "desc")
+        hits = entries[from_ : from_ + size]
+        if "path" in params:
+            hits = [_at_path(hit, params["path"]) for hit in hits]
+        return httpx.Response(
+            200,
+            json={"total": len(entries), "hits": hits, "distribution": dict(Counter(e["resource"] for e in entries))},
+        )
+
+    def _history(self, params: dict[str, str]) -> httpx.Response:
+        from_date, to_date = float(params.get("from_date", "-inf")), float(params.get("to_date", "inf"))
+        page, size = int(params.get("current_page", 0)), int(params.get("page_size", 100))
+        changes = sorted(
+            (change for change in self.history if from_date <= change["timestamp"] <= to_date),
+            key=operator.itemgetter("timestamp"),
+            reverse=True,
+        )
+        return httpx.Response(200, json={"history": changes[page * size : (page + 1) * size], "total": len(changes)})
+
+    def change(self, op: str, entry: dict[str, Any]) -> None:
+        """Record a change to an entry, ADDED, UPDATED or DELETED, and apply it to the entries."""
+        self.history.append(
+            {
+                "id": entry["id"],
+                "timestamp": entry["last_modified"],
+                "message": "",
+                "version": entry["version"],
+                "op": op,
+                "userId": entry["last_modified_by"],
+                "diff": [],
+                "entry": entry["entry"],
+            }
+        )
+        self.entries = [other for other in self.entries if other["id"] != entry["id"]]
+        if op != "DELETED":
+            self.entries.append(entry)
+
+
+def _at_path(hit: dict[str, Any], path: str) -> Any:
+    value: Any = hit
+    for name in path.split("."):
+        value = value.get(name)
+    return value
+
+
+def _matches(q: Optional[str], entry: dict[str, Any]) -> bool:
+    if not q:
+        return True
+    if q.startswith("or(") and q.endswith(")"):
+        return any(_matches(sub, entry) for sub in q[3:-1].split("||"))
+    _, field, value = q.split("|")
+    return str(entry["entry"].get(field)) == value
+
+
+def mock_client(
+    handler: Any, client: Optional[Union[Client, AuthenticatedClient]] = None
+) -> Union[Client, AuthenticatedClient]:
+    client = client or Client(base_url=BASE_URL)
+    client.set_sync_client(httpx.Client(base_url=BASE_URL, transport=httpx.MockTransport(handler)))
+    client.set_async_client(httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler)))
+    return client
+
+
+def unwrapped(transport: Any) -> Any:
+    """Get the httpx transport under the transports wrapping it, e.g. ResilientTransport."""
+    while hasattr(transport, "transport"):
+        transport = transport.transport
+    return transport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 handler answering GET with the request headers as JSON and HEAD slowly."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps(dict(self.headers.items())).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@contextmanager
+def serve_locally() -> Generator[str, None, None]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
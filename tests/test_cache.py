@@ -0,0 +1,143 @@
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp, mock_client
+
+from karp_api_client import AuthenticatedClient, Client
+from karp_api_client.api import querying
+from karp_api_client.cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_serves_repeated_queries(fake_karp: FakeKarp) -> None:
+    cache = ResponseCache(ttl=60.0)
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, cache=cache))
+    options = querying.QueryOptions(size=5)
+
+    first = querying.query_sync("ao", client=client, query_options=options).unwrap()
+    second = querying.query_sync("ao", client=client, query_options=options).unwrap()
+
+    assert second is first
+    assert len(fake_karp.requests) == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_expires_after_ttl(fake_karp: FakeKarp) -> None:
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10.0, clock=clock)
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, cache=cache))
+
+    querying.query_sync("ao", client=client)
+    clock.now = 11.0
+    querying.query_sync("ao", client=client)
+
+    assert len(fake_karp.requests) == 2
+    assert cache.stats.misses == 2
+
+
+def test_cache_evicts_least_recently_used(fake_karp: FakeKarp) -> None:
+    cache = ResponseCache(max_size=2)
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, cache=cache))
+
+    for size in (1, 2, 1, 3, 1):
+        querying.query_sync("ao", client=client, query_options=querying.QueryOptions(size=size))
+
+    assert len(fake_karp.requests) == 3
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_cache_honours_no_store() -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            headers={"Cache-Control": "no-store"},
+            json={"total": 0, "hits": [], "distribution": None},
+        )
+
+    client = mock_client(handler, Client(base_url=BASE_URL, cache=ResponseCache()))
+
+    querying.query_sync("ao", client=client)
+    querying.query_sync("ao", client=client)
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidates_with_etag() -> None:
+    clock = FakeClock()
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"', "Cache-Control": "max-age=5"})
+        return httpx.Response(
+            200,
+            headers={"ETag": '"v1"', "Cache-Control": "max-age=5"},
+            json={"total": 0, "hits": [], "distribution": None},
+        )
+
+    cache = ResponseCache(clock=clock)
+    client = mock_client(handler, Client(base_url=BASE_URL, cache=cache))
+
+    first = (await querying.query_async("ao", client=client)).unwrap()
+    clock.now = 6.0
+    second = (await querying.query_async("ao", client=client)).unwrap()
+    third = (await querying.query_async("ao", client=client)).unwrap()
+
+    assert first is second is third
+    assert len(requests) == 2
+    assert cache.stats.revalidations == 1
+    assert cache.stats.hits == 1
+
+
+def test_cache_keys_identify_host_and_credentials(fake_karp: FakeKarp) -> None:
+    cache = ResponseCache()
+    anonymous = mock_client(fake_karp, Client(base_url=BASE_URL, cache=cache))
+    clients = [
+        anonymous,
+        mock_client(fake_karp, AuthenticatedClient(base_url=BASE_URL, token="secret-a", cache=cache)),
+        mock_client(fake_karp, AuthenticatedClient(base_url=BASE_URL, token="secret-b", cache=cache)),
+        mock_client(fake_karp, anonymous.with_headers({"Authorization": "Bearer c"})),
+        mock_client(fake_karp, Client(base_url=BASE_URL, cache=cache).set_base_url("https://other.test/karp/v7")),
+    ]
+
+    for client in clients:
+        querying.query_sync("ao", client=client)
+    querying.query_sync("ao", client=anonymous)
+
+    assert len(fake_karp.requests) == 5
+    assert cache.stats.hits == 1
+    assert "secret-a" not in clients[1].identity()
+
+
+def test_cache_keys_ignore_headers_other_than_credentials(fake_karp: FakeKarp) -> None:
+    cache = ResponseCache()
+    root = Client(base_url=BASE_URL, cache=cache, vary_headers=["Accept-Language"])
+
+    for i in range(3):
+        querying.query_sync("ao", client=mock_client(fake_karp, root.with_headers({"X-Trace": str(i)})))
+    querying.query_sync("ao", client=mock_client(fake_karp, root.with_headers({"Accept-Language": "sv"})))
+
+    assert len(fake_karp.requests) == 2
+    assert cache.stats.hits == 2
+
+
+def test_cache_keys_ignore_the_order_of_resources(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, cache=ResponseCache()))
+
+    querying.query_sync("ao,bo", client=client, query_options=querying.QueryOptions(q="equals|baseform|word1"))
+    querying.query_sync(["bo", "ao"], client=client, query_options=querying.QueryOptions(q="equals|baseform|word1"))
+
+    assert len(fake_karp.requests) == 1
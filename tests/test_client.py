@@ -0,0 +1,53 @@
+import httpx
+import pytest
+
+from karp_api_client import Client
+
+
+def test_derived_clients_share_the_connection_pool(local_server: str) -> None:
+    client = Client(base_url=local_server, headers={"X-App": "test"})
+
+    with client:
+        assert "x-trace" not in client.get_sync_client().get("/").json()
+
+        derived = client.with_headers({"X-Trace": "abc"}).with_cookies({"session": "1"})
+        echoed = derived.get_sync_client().get("/").json()
+        stats = client.sync_pool_stats()
+
+        assert echoed["X-Trace"] == "abc"
+        assert echoed["X-App"] == "test"
+        assert echoed["Cookie"] == "session=1"
+        assert "x-trace" not in client.get_sync_client().get("/").json()
+        assert stats is not None
+        assert stats.connections == 1
+        assert derived.sync_pool_stats() == stats
+
+
+def test_closing_a_derived_client_keeps_the_pool_open(local_server: str) -> None:
+    client = Client(base_url=local_server)
+
+    with client:
+        with client.with_timeout(httpx.Timeout(1.0)) as derived:
+            assert derived.get_sync_client().timeout == httpx.Timeout(1.0)
+            derived.get_sync_client().get("/")
+
+        assert client.get_sync_client().get("/").status_code == 200
+        assert client.sync_pool_stats() is not None
+
+
+@pytest.mark.asyncio
+async def test_derived_async_clients_share_the_connection_pool(local_server: str) -> None:
+    client = Client(base_url=local_server)
+
+    async with client:
+        await client.get_async_client().get("/")
+        derived = client.with_headers({"X-Trace": "abc"})
+        async with derived:
+            echoed = (await derived.get_async_client().get("/")).json()
+        stats = client.async_pool_stats()
+        response = await client.get_async_client().get("/")
+
+    assert echoed["X-Trace"] == "abc"
+    assert response.status_code == 200
+    assert stats is not None
+    assert stats.connections == 1
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp, mock_client
+
+from karp_api_client import AuthenticatedClient, Client
+from karp_api_client.api import querying
+from karp_api_client.coalesce import SingleFlight
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5.0
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_concurrent_identical_sync_queries_share_one_request(fake_karp: FakeKarp) -> None:
+    single_flight = SingleFlight()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        _wait_for(lambda: single_flight.stats.coalesced == 4)
+        return fake_karp(request)
+
+    client = mock_client(handler, Client(base_url=BASE_URL, single_flight=single_flight))
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: querying.query_sync("ao", client=client).unwrap(), range(5)))
+
+    assert len(fake_karp.requests) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats.calls == 1
+    assert single_flight.stats.coalesced == 4
+    assert len(single_flight) == 0
+
+
+def test_sequential_queries_are_not_coalesced(fake_karp: FakeKarp) -> None:
+    single_flight = SingleFlight()
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, single_flight=single_flight))
+
+    querying.query_sync("ao", client=client)
+    querying.query_sync("ao", client=client)
+    querying.query_sync("ao", client=client, query_options=querying.QueryOptions(size=5))
+
+    assert len(fake_karp.requests) == 3
+    assert single_flight.stats.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_async_queries_share_one_request(fake_karp: FakeKarp) -> None:
+    single_flight = SingleFlight()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return fake_karp(request)
+
+    client = mock_client(handler, Client(base_url=BASE_URL, single_flight=single_flight))
+
+    results = await asyncio.gather(*(querying.query_async("ao", client=client) for _ in range(10)))
+    other = await querying.query_async("other", client=client)
+
+    assert len(fake_karp.requests) == 2
+    assert all(result.unwrap() is results[0].unwrap() for result in results)
+    assert other.unwrap() is not results[0].unwrap()
+    assert single_flight.stats.calls == 2
+    assert single_flight.stats.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_calls_with_other_credentials_are_not_shared(fake_karp: FakeKarp) -> None:
+    single_flight = SingleFlight()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return fake_karp(request)
+
+    anonymous = mock_client(handler, Client(base_url=BASE_URL, single_flight=single_flight))
+    authenticated = mock_client(
+        handler, AuthenticatedClient(base_url=BASE_URL, token="secret", single_flight=single_flight)
+    )
+
+    results = await asyncio.gather(
+        querying.query_async("ao", client=authenticated), querying.query_async("ao", client=anonymous)
+    )
+
+    assert len(fake_karp.requests) == 2
+    assert results[0].unwrap() is not results[1].unwrap()
+    assert single_flight.stats.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_cancelling_one_caller_spares_the_rest() -> None:
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        raise httpx.ConnectError("boom", request=request)
+
+    client = mock_client(handler, Client(base_url=BASE_URL, single_flight=single_flight))
+
+    tasks = [asyncio.ensure_future(querying.query_async("ao", client=client)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    tasks[0].cancel()
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert all(isinstance(result, httpx.ConnectError) for result in results[1:])
+    assert len(single_flight) == 0
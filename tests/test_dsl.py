@@ -1,4 +1,4 @@
-from karp_api_client.dsl import Equals, Or
+from karp_api_client.dsl import Equals, Or, Query
 
 
 def test_dsl(snapshot) -> None:  # noqa: ANN001
@@ -24,3 +24,96 @@ def test_equals_combined(snapshot) -> None:  # noqa: ANN001
     actual = str(q)
 
     assert actual == snapshot
+
+
+def test_or_is_flattened_from_both_sides() -> None:
+    a, b, c = (Equals(field="baseform", value=value) for value in "abc")
+
+    assert (a | (b | c)).ors == [a, b, c]
+    assert ((a | b) | c).ors == [a, b, c]
+
+
+def test_ior_appends_in_place_and_refreshes_str() -> None:
+    q = Or(Equals(field="baseform", value="a"))
+    before = str(q)
+
+    q2 = q
+    q2 |= Equals(field="baseform", value="b")
+
+    assert q2 is q
+    assert before == "or(equals|baseform|a)"
+    assert str(q) == "or(equals|baseform|a||equals|baseform|b)"
+
+
+def test_or_does_not_change_its_operands() -> None:
+    q = Or(Equals(field="baseform", value="a"))
+
+    combined = q | Equals(field="baseform", value="b")
+
+    assert len(q.ors) == 1
+    assert len(combined.ors) == 2
+
+
+def test_ior_does_not_share_the_queries_of_the_other_or() -> None:
+    a, b, c, d = (Equals(field="baseform", value=value) for value in "abcd")
+    q = Or(a)
+    other = Or(b)
+
+    q |= other
+    other |= c
+    q |= d
+
+    assert q.ors == [a, b, d]
+    assert other.ors == [b, c]
+
+
+def test_changing_a_nested_or_does_not_change_the_outer_query() -> None:
+    a, b, c = (Equals(field="baseform", value=value) for value in "abc")
+    inner = Or(a)
+    outer = Or(inner, b)
+    before, before_hash = str(outer), hash(outer)
+
+    inner |= c
+
+    assert str(outer) == before == "or(or(equals|baseform|a)||equals|baseform|b)"
+    assert hash(outer) == before_hash
+    assert outer == Or(Or(a), b)
+
+
+def test_from_iterable_builds_large_disjunctions() -> None:
+    words = [f"word{i}" for i in range(5000)]
+
+    q = Or.from_iterable(Equals(field="baseform", value=word) for word in words)
+
+    assert len(q.ors) == len(words)
+    assert str(q).startswith("or(equals|baseform|word0||equals|baseform|word1||")
+
+
+def test_queries_are_hashable_and_compare_by_structure() -> None:
+    a = Equals(field="baseform", value="a") | Equals(field="baseform", value="b")
+    b = Equals(field="baseform", value="a") | Equals(field="baseform", value="b")
+    c = Equals(field="baseform", value="b") | Equals(field="baseform", value="a")
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != c
+    assert len({a, b, c}) == 2
+    assert Equals(field="baseform", value="a") != Equals(field="wordform", value="a")
+
+
+def test_canonical_form_of_equivalent_queries_is_identical() -> None:
+    a, b, c = (Equals(field="baseform", value=value) for value in "abc")
+
+    first = Or(c, Or(a, b), a).canonical()
+    second = Or(b, Or(Or(c), a)).canonical()
+
+    assert first == second
+    assert str(first) == str(second) == "or(equals|baseform|a||equals|baseform|b||equals|baseform|c)"
+    assert Or(a, Or(a)).canonical() == a
+
+
+def test_base_query_formats_as_a_plain_object() -> None:
+    query = Query()
+
+    assert str(query).startswith("<karp_api_client.dsl.query.Query object at ")
+    assert repr(query) == f"Query({str(query)!r})"
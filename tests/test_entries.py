@@ -0,0 +1,84 @@
+import httpx
+import pytest
+from fakes import BASE_URL, make_entry, mock_client
+
+from karp_api_client import AuthenticatedClient, errors
+from karp_api_client.api import querying
+from karp_api_client.api.querying.entries import chunk_entry_ids
+
+
+class FakeEntriesById:
+    def __init__(self, num_entries: int) -> None:
+        self.entries = {entry["id"]: entry for entry in (make_entry(i) for i in range(num_entries))}
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        entry_ids = request.url.path.rsplit("/", 1)[-1].split(",")
+        hits = [self.entries[entry_id] for entry_id in entry_ids if entry_id in self.entries]
+        return httpx.Response(200, json={"total": len(hits), "hits": hits})
+
+
+def test_chunk_entry_ids_respects_limits() -> None:
+    entry_ids = [f"id{i:04d}" for i in range(10)] + ["id0000"]
+
+    chunks = chunk_entry_ids("ao", entry_ids, base_url=BASE_URL, max_url_length=len(BASE_URL) + 40)
+
+    assert [entry_id for chunk in chunks for entry_id in chunk] == entry_ids[:10]
+    for chunk in chunks:
+        url = f"{BASE_URL}/query/entries/ao/{','.join(chunk)}"
+        assert len(url) <= len(BASE_URL) + 40
+    assert chunk_entry_ids("ao", entry_ids, max_ids_per_request=3)[0] == entry_ids[:3]
+
+
+def test_chunk_entry_ids_rejects_too_long_id() -> None:
+    with pytest.raises(ValueError, match="does not fit"):
+        chunk_entry_ids("ao", ["x" * 100], max_url_length=50)
+
+
+def test_get_entries_sync_returns_input_order_and_missing() -> None:
+    fake = FakeEntriesById(30)
+    client = mock_client(fake)
+    entry_ids = ["ao-000029", "nope", *(f"ao-{i:06d}" for i in range(25)), "ao-000029"]
+
+    result = querying.get_entries_sync("ao", entry_ids, client=client, max_ids_per_request=10)
+
+    assert [entry.id if entry else None for entry in result.entries] == [
+        None if entry_id == "nope" else entry_id for entry_id in entry_ids
+    ]
+    assert result.missing == ["nope"]
+    assert result.requests == len(fake.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_entries_async_fetches_chunks() -> None:
+    fake = FakeEntriesById(30)
+    client = mock_client(fake)
+    entry_ids = [f"ao-{i:06d}" for i in range(30)]
+
+    result = await querying.get_entries_async("ao", entry_ids, client=client, max_ids_per_request=7)
+
+    assert [entry.id for entry in result.entries if entry] == entry_ids
+    assert result.missing == []
+    assert result.requests == 5
+
+
+def test_get_entries_sync_counts_the_api_key_in_the_url_length() -> None:
+    fake = FakeEntriesById(30)
+    client = AuthenticatedClient(
+        base_url=BASE_URL, token="t" * 100, httpx_args={"transport": httpx.MockTransport(fake)}
+    )
+    entry_ids = [f"ao-{i:06d}" for i in range(30)]
+
+    result = querying.get_entries_sync("ao", entry_ids, client=client, max_url_length=300)
+
+    assert [entry.id for entry in result.entries if entry] == entry_ids
+    assert all("api_key=" in str(request.url) for request in fake.requests)
+    assert all(len(str(request.url)) <= 300 for request in fake.requests)
+
+
+def test_get_entries_sync_raises_on_failure() -> None:
+    client = mock_client(lambda _request: httpx.Response(422, json={"detail": []}))
+
+    with pytest.raises(errors.QueryFailed):
+        querying.get_entries_sync("ao", ["a", "b"], client=client)
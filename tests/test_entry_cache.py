@@ -0,0 +1,153 @@
+import contextlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+import httpx
+import pytest
+from fakes import BASE_URL, make_entry, mock_client
+
+from karp_api_client import AuthenticatedClient, Client
+from karp_api_client.api import history
+from karp_api_client.entry_cache import EntryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+class FakeHistory:
+    """Serves `/entries/{resource_id}/{entry_id}[/{version}]`, with version 3 as the latest."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path.removeprefix("/karp/v7/entries/").split("/")
+        resource_id, entry_id = path[:2]
+        entry = {**make_entry(0, resource_id), "id": entry_id, "version": int(path[2]) if len(path) > 2 else 3}
+        return httpx.Response(200, json=entry)
+
+
+def test_entries_persist_across_instances(tmp_path: Path) -> None:
+    with EntryCache(tmp_path / "entries.db") as cache:
+        cache.put("ao", "a", 1, b'{"id": "a"}')
+        cache.put("ao", "a", 1, b'{"id": "changed"}')
+
+    with EntryCache(tmp_path / "entries.db") as cache:
+        assert cache.get("ao", "a", 1) == b'{"id": "a"}'
+        assert cache.get("ao", "a", 2) is None
+        assert len(cache) == 1
+        assert cache.size == len(b'{"id": "a"}')
+        assert cache.stats.hit_rate == pytest.approx(0.5)
+
+
+def test_least_recently_read_entries_are_evicted(tmp_path: Path) -> None:
+    with EntryCache(tmp_path / "entries.db", max_bytes=30, clock=FakeClock()) as cache:
+        for version in range(3):
+            cache.put("ao", "a", version, b"x" * 10)
+        cache.get("ao", "a", 0)
+        cache.put("ao", "a", 3, b"x" * 10)
+
+        assert cache.get("ao", "a", 1) is None
+        assert cache.get("ao", "a", 0) is not None
+        assert cache.size == 30
+        assert cache.stats.evictions == 1
+
+
+@pytest.mark.parametrize(
+    ("version", "url"),
+    [
+        (None, f"{BASE_URL}/entries/ao/a%20b"),
+        (2, f"{BASE_URL}/entries/ao/a%20b/2"),
+    ],
+)
+def test_entry_urls(version: Optional[int], url: str) -> None:
+    fake_history = FakeHistory()
+
+    history.get_history_for_entry_sync("ao", "a b", version, client=mock_client(fake_history))
+
+    assert [str(request.url) for request in fake_history.requests] == [url]
+
+
+def test_access_times_are_written_in_batches(tmp_path: Path) -> None:
+    def accessed() -> float:
+        with contextlib.closing(sqlite3.connect(tmp_path / "entries.db")) as db:
+            return db.execute("SELECT accessed FROM entries").fetchone()[0]
+
+    cache = EntryCache(tmp_path / "entries.db", clock=FakeClock())
+    cache.put("ao", "a", 1, b"{}")
+    cache.get("ao", "a", 1)
+
+    assert accessed() == pytest.approx(1.0)
+    cache.close()
+    assert accessed() == pytest.approx(2.0)
+
+
+def test_version_pinned_reads_are_served_from_the_cache(tmp_path: Path) -> None:
+    fake_history = FakeHistory()
+    with EntryCache(tmp_path / "entries.db") as cache:
+        client = mock_client(fake_history, Client(base_url=BASE_URL, entry_cache=cache))
+
+        first = history.get_history_for_entry_sync("ao", "ao-1", 2, client=client).unwrap()
+        second = history.get_history_for_entry_sync("ao", "ao-1", 2, client=client).unwrap()
+        latest = history.get_history_for_entry_sync("ao", "ao-1", None, client=client).unwrap()
+        pinned_latest = history.get_history_for_entry_sync("ao", "ao-1", 3, client=client).unwrap()
+
+        assert [request.url.path for request in fake_history.requests] == [
+            "/karp/v7/entries/ao/ao-1/2",
+            "/karp/v7/entries/ao/ao-1",
+        ]
+        assert second.parsed == first.parsed
+        assert json.loads(second.content)["version"] == 2
+        assert latest.parsed == pinned_latest.parsed
+        assert cache.stats.hits == 2
+
+
+def test_clients_of_other_servers_or_credentials_do_not_share_entries(tmp_path: Path) -> None:
+    fake_history = FakeHistory()
+    with EntryCache(tmp_path / "entries.db") as cache:
+        clients: list[Union[Client, AuthenticatedClient]] = [
+            Client(base_url=BASE_URL, entry_cache=cache),
+            AuthenticatedClient(base_url=BASE_URL, token="secret", entry_cache=cache),
+            Client(base_url="https://staging.test/karp/v7", entry_cache=cache),
+        ]
+        for client in [*clients, *clients]:
+            history.get_history_for_entry_sync("ao", "ao-1", 2, client=mock_client(fake_history, client))
+
+        assert len(fake_history.requests) == 3
+        assert len(cache) == 3
+        assert cache.stats.hits == 3
+
+
+def test_a_cache_with_an_old_schema_is_emptied(tmp_path: Path) -> None:
+    with contextlib.closing(sqlite3.connect(tmp_path / "entries.db")) as db:
+        db.execute("CREATE TABLE entries (resource TEXT, id TEXT, version INTEGER, payload BLOB)")
+        db.execute("INSERT INTO entries VALUES ('ao', 'a', 1, '{}')")
+        db.commit()
+
+    with EntryCache(tmp_path / "entries.db") as cache:
+        assert len(cache) == 0
+        cache.put("ao", "a", 1, b"{}")
+        assert cache.get("ao", "a", 1) == b"{}"
+
+
+@pytest.mark.asyncio
+async def test_async_reads_use_the_cache(tmp_path: Path) -> None:
+    fake_history = FakeHistory()
+    with EntryCache(tmp_path / "entries.db") as cache:
+        client = mock_client(fake_history, Client(base_url=BASE_URL, entry_cache=cache))
+
+        for _ in range(3):
+            response = (await history.get_history_for_entry_async("ao", "ao-1", 1, client=client)).unwrap()
+
+        assert len(fake_history.requests) == 1
+        assert response.parsed is not None
+        assert response.parsed.version == 1
@@ -0,0 +1,106 @@
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+from pathlib import Path
+
+import httpx
+import pytest
+from fakes import FakeKarp, make_entry, mock_client
+
+from karp_api_client import cli, errors
+from karp_api_client.api.querying import QueryOptions
+from karp_api_client.export import ExportProgress, export_async, export_sync
+
+
+class FailingOnce:
+    """Fails the request for `from=fail_at` once."""
+
+    def __init__(self, fake_karp: FakeKarp, fail_at: int) -> None:
+        self.fake_karp = fake_karp
+        self.fail_at = fail_at
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("from") == str(self.fail_at):
+            self.fail_at = -1
+            return httpx.Response(500, text="busy")
+        return self.fake_karp(request)
+
+
+def test_jsonl_is_written_page_by_page(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    output = tmp_path / "ao.jsonl"
+
+    progress = export_sync("ao", output, client=mock_client(fake_karp), page_size=10)
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [entry["id"] for entry in fake_karp.entries]
+    assert progress == ExportProgress(offset=23, pages_fetched=3, bytes_read=progress.bytes_read, total=23)
+    assert not (tmp_path / "ao.jsonl.progress").exists()
+
+
+def test_csv_gzip_with_nested_fields(tmp_path: Path) -> None:
+    fake_karp = FakeKarp([make_entry(i, senses=[{"id": i}], inflection={"pos": "nn"}) for i in range(5)])
+    output = tmp_path / "ao.csv.gz"
+
+    export_sync("ao", output, client=mock_client(fake_karp), format_="csv", page_size=2)
+
+    with gzip.open(output, "rt", encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 5
+    assert rows[1]["entry.inflection.pos"] == "nn"
+    assert json.loads(rows[1]["entry.senses"]) == [{"id": 1}]
+    assert rows[4]["id"] == "ao-000004"
+
+
+def test_path_projection_to_stream(fake_karp: FakeKarp) -> None:
+    stream = io.StringIO()
+
+    export_sync(
+        "ao",
+        stream,
+        client=mock_client(fake_karp),
+        query_options=QueryOptions(q="equals|baseform|word3", path="entry.baseform"),
+        format_="csv",
+    )
+
+    assert stream.getvalue().splitlines() == ["entry.baseform", "word3"]
+
+
+def test_interrupted_export_resumes_where_it_stopped(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    output = tmp_path / "ao.csv.xz"
+    client = mock_client(FailingOnce(fake_karp, fail_at=10))
+
+    with pytest.raises(errors.QueryFailed):
+        export_sync("ao", output, client=client, format_="csv", page_size=5)
+    with pytest.raises(ValueError, match="another query"):
+        export_sync("ao", output, client=client, format_="csv", query_options=QueryOptions(q="x"), resume=True)
+    progress = export_sync("ao", output, client=client, format_="csv", page_size=5, resume=True)
+
+    assert progress.resumed_from == 10
+    assert progress.pages_fetched == 3
+    with lzma.open(output, "rt", encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["id"] for row in rows] == [entry["id"] for entry in fake_karp.entries]
+
+
+@pytest.mark.asyncio
+async def test_export_async(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    output = tmp_path / "ao.jsonl.bz2"
+
+    progress = await export_async("ao", output, client=mock_client(fake_karp), page_size=10)
+
+    assert progress.offset == 23
+    assert len(bz2.decompress(output.read_bytes()).splitlines()) == 23
+
+
+def test_cli_export(fake_karp: FakeKarp, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cli, "_client", lambda _base_url: mock_client(fake_karp))
+    output = tmp_path / "ao.csv"
+
+    status = cli.main(["export", "ao", "-q", "equals|baseform|word1", "-o", str(output), "--fields", "id,version"])
+
+    assert status == 0
+    assert output.read_text(encoding="utf-8").splitlines() == ["id,version", "ao-000001,1"]
+    assert cli.main(["export", "ao", "-o", str(output), "--resume"]) == 1
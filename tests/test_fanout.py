@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp, make_entry, mock_client
+
+from karp_api_client import Client
+from karp_api_client.api import querying
+from karp_api_client.cache import ResponseCache
+
+
+@pytest.fixture
+def fake_karp() -> FakeKarp:
+    return FakeKarp([make_entry(i, resource, rank=(i * 7) % 10) for resource in ("ao", "bo", "co") for i in range(8)])
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        querying.QueryOptions(sort=["rank"], from_=5, size=7),
+        querying.QueryOptions(sort=["rank|desc", "baseform"], size=30),
+        querying.QueryOptions(q="equals|rank|4", sort=["baseform|desc"]),
+    ],
+)
+def test_fan_out_matches_one_request(fake_karp: FakeKarp, options: querying.QueryOptions) -> None:
+    client = mock_client(fake_karp)
+
+    fanned_out = querying.query_fanout_sync("ao,bo,co", client=client, query_options=options).unwrap().parsed
+    requests = sorted(request.url.path for request in fake_karp.requests)
+    single = querying.query_sync("ao,bo,co", client=client, query_options=options).unwrap().parsed
+
+    assert requests == ["/karp/v7/query/ao", "/karp/v7/query/bo", "/karp/v7/query/co"]
+    assert fanned_out is not None
+    assert single is not None
+    assert fanned_out.total == single.total
+    assert fanned_out.distribution == single.distribution
+    assert [(hit.entry["rank"], hit.entry["baseform"]) for hit in fanned_out.hits] == [
+        (hit.entry["rank"], hit.entry["baseform"]) for hit in single.hits
+    ]
+
+
+def test_without_sort_resources_follow_each_other(fake_karp: FakeKarp) -> None:
+    options = querying.QueryOptions(from_=6, size=4)
+
+    response = querying.query_fanout_sync(["bo", "ao"], client=mock_client(fake_karp), query_options=options).unwrap()
+
+    assert response.parsed is not None
+    assert [hit.id for hit in response.parsed.hits] == ["bo-000006", "bo-000007", "ao-000000", "ao-000001"]
+    assert all(request.url.params["size"] == "10" for request in fake_karp.requests)
+    assert all("from" not in request.url.params for request in fake_karp.requests)
+
+
+def test_size_zero_returns_only_totals(fake_karp: FakeKarp) -> None:
+    options = querying.QueryOptions(sort=["rank"], size=0)
+
+    response = querying.query_fanout_sync("ao,bo,co", client=mock_client(fake_karp), query_options=options).unwrap()
+
+    assert response.parsed is not None
+    assert response.parsed.total == 24
+    assert list(response.parsed.hits) == []
+
+
+def test_each_resource_is_cached_separately(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, cache=ResponseCache()))
+    options = querying.QueryOptions(sort=["rank"])
+
+    querying.query_fanout_sync("ao,bo", client=client, query_options=options)
+    querying.query_fanout_sync("bo,co", client=client, query_options=options)
+
+    assert sorted(request.url.path for request in fake_karp.requests) == [
+        "/karp/v7/query/ao",
+        "/karp/v7/query/bo",
+        "/karp/v7/query/co",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_a_slow_resource_does_not_hold_up_the_others(fake_karp: FakeKarp) -> None:
+    finished: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        resource = request.url.path.rsplit("/", 1)[-1]
+        await asyncio.sleep(0.05 if resource == "ao" else 0)
+        finished.append(resource)
+        return fake_karp(request)
+
+    client = mock_client(handler)
+    result = await querying.query_fanout_async(
+        "ao,bo,co", client=client, query_options=querying.QueryOptions(sort=["rank"], size=3)
+    )
+
+    assert finished[-1] == "ao"
+    response = result.unwrap()
+    assert response.parsed is not None
+    assert response.parsed.total == 24
+    assert response.parsed.distribution == {"ao": 8, "bo": 8, "co": 8}
+    assert [hit.entry["rank"] for hit in response.parsed.hits] == [0, 0, 0]
+
+
+def test_failures_are_returned(fake_karp: FakeKarp) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/bo"):
+            return httpx.Response(422, json={"detail": []})
+        return fake_karp(request)
+
+    result = querying.query_fanout_sync("ao,bo", client=mock_client(handler))
+
+    assert result.failure().status_code == 422
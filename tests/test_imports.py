@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import pytest
+
+from karp_api_client import api, models
+
+IMPORT_BUDGET_US = 50_000
+FIRST_USE_BUDGET_US = 1_000_000
+
+
+def _run(code: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+
+def _loaded(code: str, modules: list[str]) -> list[str]:
+    output = _run(f"import sys\n{code}\nprint(*[m for m in {modules!r} if m in sys.modules])").stdout
+    return output.split()
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["karp_api_client", "karp_api_client.api", "karp_api_client.api.querying", "karp_api_client.models"],
+)
+def test_packages_import_no_dependencies(module: str) -> None:
+    assert _loaded(f"import {module}", ["httpx", "attrs", "returns"]) == []
+
+
+def test_dsl_does_not_import_httpx() -> None:
+    code = "from karp_api_client import dsl\nstr(dsl.Equals(field='baseform', value='ord') | dsl.Equals(field='id', value='x'))"
+    assert _loaded(code, ["httpx", "karp_api_client.client"]) == []
+
+
+def test_submodules_load_on_first_access() -> None:
+    code = "import karp_api_client\nkarp_api_client.Client\nkarp_api_client.api.querying.QueryOptions"
+    assert _loaded(code, ["httpx", "karp_api_client.api.querying.query"]) == [
+        "httpx",
+        "karp_api_client.api.querying.query",
+    ]
+
+
+def test_unknown_attributes_raise() -> None:
+    with pytest.raises(AttributeError, match="no attribute 'nope'"):
+        _ = api.nope
+    with pytest.raises(AttributeError, match="no attribute 'Nope'"):
+        _ = models.Nope
+
+
+def test_import_time_budget() -> None:
+    """Cumulative time of importing the package, as reported by `python -X importtime`."""
+    report = _run("import karp_api_client").stderr
+    cumulative = {
+        columns[2].strip(): int(columns[1])
+        for columns in (line.split("|") for line in report.splitlines() if line.startswith("import time:"))
+        if columns[1].strip().isdigit()
+    }
+    assert cumulative["karp_api_client"] < IMPORT_BUDGET_US
+
+
+def test_first_use_time_budget() -> None:
+    """Time of importing the package and the querying API and models a client uses first, dependencies included."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import karp_api_client.api.querying\n"
+        "karp_api_client.api.querying.QueryOptions\n"
+        "karp_api_client.models.QueryResponse\n"
+        "print(round((time.perf_counter() - start) * 1e6))"
+    )
+    assert int(_run(code).stdout) < FIRST_USE_BUDGET_US
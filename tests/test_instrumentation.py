@@ -0,0 +1,108 @@
+import logging
+
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp
+
+from karp_api_client import Client
+from karp_api_client.api import querying
+from karp_api_client.instrumentation import (
+    Histogram,
+    HistogramSink,
+    Instrumentation,
+    LoggingSink,
+    RequestTiming,
+)
+
+
+def test_query_is_timed_and_passed_to_every_sink(fake_karp: FakeKarp) -> None:
+    histograms = HistogramSink()
+    timings: list[RequestTiming] = []
+    client = Client(
+        base_url=BASE_URL,
+        instrumentation=Instrumentation(histograms, timings.append),
+        httpx_args={"transport": httpx.MockTransport(fake_karp)},
+    )
+
+    querying.query_sync("ao", client=client)
+
+    [timing] = timings
+    assert timing.method == "GET"
+    assert timing.url == f"{BASE_URL}/query/ao"
+    assert timing.status_code == 200
+    assert timing.size > 0
+    assert timing.decode is not None
+    assert timing.build is not None
+    assert timing.elapsed is not None
+    assert timing.elapsed >= timing.decode + timing.build
+    # the mock transport reports no network phases
+    assert timing.connect is None
+    assert histograms.requests == 1
+    assert histograms.statuses[200] == 1
+    assert histograms.histograms["decode"].count == 1
+    assert histograms.histograms["connect"].count == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_async_query_is_recorded() -> None:
+    timings: list[RequestTiming] = []
+    client = Client(
+        base_url=BASE_URL,
+        instrumentation=Instrumentation(timings.append),
+        httpx_args={"transport": httpx.MockTransport(lambda _request: httpx.Response(500, content=b"oops"))},
+    )
+
+    await querying.query_async("ao", client=client)
+
+    [timing] = timings
+    assert timing.status_code == 500
+    assert timing.size == 4
+    assert timing.decode is None
+
+
+def test_network_phases_are_traced(local_server: str) -> None:
+    timings: list[RequestTiming] = []
+    instrumentation = Instrumentation(timings.append)
+
+    with Client(base_url=local_server, instrumentation=instrumentation) as client:
+        instrumentation.record(client.get_sync_client().get("/"))
+
+    [timing] = timings
+    assert timing.connect is not None
+    assert timing.ttfb is not None
+    assert timing.download is not None
+
+
+@pytest.mark.asyncio
+async def test_network_phases_are_traced_async(local_server: str) -> None:
+    timings: list[RequestTiming] = []
+    instrumentation = Instrumentation(timings.append)
+
+    async with Client(base_url=local_server, instrumentation=instrumentation) as client:
+        instrumentation.record(await client.get_async_client().get("/"))
+
+    [timing] = timings
+    assert timing.ttfb is not None
+    assert timing.download is not None
+
+
+def test_logging_sink_logs_one_line_per_request(caplog: pytest.LogCaptureFixture) -> None:
+    sink = LoggingSink(level=logging.INFO)
+    timing = RequestTiming(method="GET", url="https://karp.test/query/ao", status_code=200, size=10, decode=0.002)
+
+    with caplog.at_level(logging.INFO):
+        sink(timing)
+
+    assert caplog.messages == ["GET https://karp.test/query/ao 200 10 bytes decode=2.0ms"]
+
+
+def test_histogram_quantiles_are_bucket_bounds() -> None:
+    histogram = Histogram((0.01, 0.1, 1.0))
+
+    for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(0.1)
+    assert histogram.quantile(1.0) == float("inf")
+    assert histogram.mean == pytest.approx(5.605 / 5)
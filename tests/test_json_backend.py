@@ -0,0 +1,68 @@
+from typing import Any
+
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp, mock_client
+
+from karp_api_client import Client
+from karp_api_client.api import querying
+from karp_api_client.instrumentation import Instrumentation, RequestTiming
+from karp_api_client.json_backend import STDLIB_BACKEND, JsonBackend, get_json_backend
+
+
+def test_queries_are_decoded_with_the_client_backend(fake_karp: FakeKarp) -> None:
+    decoded: list[bytes] = []
+
+    def loads(content: bytes) -> Any:
+        decoded.append(content)
+        return STDLIB_BACKEND.loads(content)
+
+    client = mock_client(fake_karp, Client(base_url=BASE_URL, json_backend=JsonBackend("counting", loads)))
+    plain = mock_client(fake_karp)
+
+    response = querying.query_sync("ao", client=client).unwrap()
+
+    assert len(decoded) == 1
+    assert response.content == decoded[0]
+    assert response.parsed == querying.query_sync("ao", client=plain).unwrap().parsed
+
+
+def test_orjson_backend_decodes_like_the_standard_library(fake_karp: FakeKarp) -> None:
+    pytest.importorskip("orjson")
+    timings: list[RequestTiming] = []
+    client = mock_client(
+        fake_karp,
+        Client(
+            base_url=BASE_URL, json_backend=get_json_backend("orjson"), instrumentation=Instrumentation(timings.append)
+        ),
+    )
+
+    response = querying.query_sync("ao", client=client).unwrap()
+
+    assert response.parsed is not None
+    assert response.parsed.total == len(fake_karp.entries)
+    assert response.parsed.hits[0].id == fake_karp.entries[0]["id"]
+    assert timings[0].decode is not None
+
+
+def test_auto_picks_an_installed_backend() -> None:
+    backend = get_json_backend()
+
+    assert backend.name in {"orjson", "msgspec", "json"}
+    assert backend.loads(b'{"total": 1}') == {"total": 1}
+    assert get_json_backend("json") is STDLIB_BACKEND
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError, match="unknown JSON backend"):
+        get_json_backend("yaml")
+
+
+def test_decoding_errors_surface() -> None:
+    client = mock_client(
+        lambda _request: httpx.Response(200, content=b"{not json"),
+        Client(base_url=BASE_URL, json_backend=get_json_backend()),
+    )
+
+    with pytest.raises(ValueError):
+        querying.query_sync("ao", client=client)
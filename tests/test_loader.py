@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+from fakes import FakeKarp, make_entry, mock_client
+
+from karp_api_client import dsl, errors
+from karp_api_client.api import querying
+
+
+def _lookup(word: str) -> dsl.Equals:
+    return dsl.Equals(field="baseform", value=word)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_sent_as_one_query() -> None:
+    fake_karp = FakeKarp([make_entry(i, baseform=f"word{i % 10}") for i in range(30)])
+    loader = querying.EntryLoader("ao", client=mock_client(fake_karp))
+
+    words = ["word1", "word2", "word1", "missing"]
+    results = await asyncio.gather(*(loader.load(_lookup(word)) for word in words))
+
+    assert len(fake_karp.requests) == 1
+    assert [len(hits) for hits in results] == [3, 3, 3, 0]
+    assert all(hit.entry["baseform"] == "word2" for hit in results[1])
+    assert results[0] is results[2]
+    assert loader.stats == querying.LoaderStats(loads=4, coalesced=1, batches=1, requests=1)
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size_and_delay_split_batches() -> None:
+    fake_karp = FakeKarp([make_entry(i, baseform=f"word{i}") for i in range(10)])
+    loader = querying.EntryLoader("ao", client=mock_client(fake_karp), delay=0.01, max_batch_size=4)
+
+    results = await loader.load_many(_lookup(f"word{i}") for i in range(10))
+    later = await loader.load(_lookup("word3"))
+
+    assert [[hit.entry["baseform"] for hit in hits] for hits in results] == [[f"word{i}"] for i in range(10)]
+    assert later[0].id == results[3][0].id
+    assert loader.stats.batches == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_lookup() -> None:
+    client = mock_client(lambda _request: httpx.Response(500, json={}))
+    loader = querying.EntryLoader("ao", client=client)
+
+    results = await asyncio.gather(*(loader.load(_lookup(word)) for word in ["a", "b"]), return_exceptions=True)
+
+    assert all(isinstance(result, errors.QueryFailed) for result in results)
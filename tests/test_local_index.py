@@ -0,0 +1,79 @@
+import pytest
+from fakes import FakeKarp, make_entry, mock_client
+
+from karp_api_client import dsl, local_index
+from karp_api_client.api import querying
+from karp_api_client.local_index import LocalIndex
+from karp_api_client.models import EntryDto
+
+
+def _entries() -> list[EntryDto]:
+    return [
+        EntryDto.from_dict(make_entry(i, "ao" if i % 3 else "bo", pos="nn" if i % 2 else "vb", senses=[{"id": i % 4}]))
+        for i in range(20)
+    ]
+
+
+def test_matches_remote_query(fake_karp: FakeKarp) -> None:
+    index = LocalIndex(EntryDto.from_dict(entry) for entry in fake_karp.entries)
+    q = dsl.Or.from_iterable(dsl.Equals(field="baseform", value=f"word{i}") for i in (7, 3, 3, 12, 99))
+    options = querying.QueryOptions(q=q, from_=1, size=2, sort=["baseform|desc"])
+
+    local = index.query("ao", query_options=options)
+    remote = querying.query_sync("ao", client=mock_client(fake_karp), query_options=options).unwrap().parsed
+
+    assert remote is not None
+    assert local.total == remote.total == 3
+    assert local.hits == remote.hits
+    assert local.distribution == {"ao": 3}
+
+
+def test_nested_fields_lists_and_resources() -> None:
+    index = LocalIndex(_entries())
+
+    assert index.fields == ["baseform", "pos", "senses.id"]
+    hits = index.search(dsl.Equals(field="senses.id", value="1") | dsl.Equals(field="baseform", value="word2"))
+    assert [hit.id for hit in hits] == ["ao-000001", "ao-000002", "ao-000005", "bo-000009", "ao-000013", "ao-000017"]
+
+    response = index.query(["bo"], query_options=querying.QueryOptions(q=dsl.Equals(field="pos", value="vb")))
+    assert response.total == 4
+    assert response.distribution == {"bo": 4}
+    assert index.query(query_options=querying.QueryOptions(size=5, lexicon_stats=False)).distribution is None
+
+
+def test_replace_and_remove_entries() -> None:
+    index = LocalIndex(_entries())
+    katt = dsl.Equals(field="baseform", value="katt")
+
+    index.add(EntryDto.from_dict({**make_entry(1), "version": 2, "entry": {"baseform": "katt"}}))
+    index.remove("ao-000002")
+    index.remove("missing")
+
+    assert len(index) == 19
+    assert "ao-000002" not in index
+    assert [hit.version for hit in index.search(katt)] == [2]
+    assert index.search(dsl.Equals(field="baseform", value="word1")) == []
+    assert index.query(query_options=querying.QueryOptions(size=100)).total == 19
+
+
+def test_removed_entries_are_compacted(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(local_index, "COMPACT_AFTER", 4)
+    index = LocalIndex(EntryDto.from_dict(make_entry(i)) for i in range(10))
+    words = dsl.Equals(field="baseform", value="word1") | dsl.Equals(field="baseform", value="word3")
+
+    for version in range(2, 50):
+        index.add(EntryDto.from_dict({**make_entry(3), "version": version}))
+    for i in range(5, 10):
+        index.remove(f"ao-{i:06}")
+
+    assert len(index._entries) <= 2 * len(index)
+    assert [hit.id for hit in index.search(None)] == ["ao-000000", "ao-000001", "ao-000002", "ao-000004", "ao-000003"]
+    assert [(hit.id, hit.version) for hit in index.search(words)] == [("ao-000001", 1), ("ao-000003", 49)]
+    assert index.search(dsl.Equals(field="baseform", value="word7")) == []
+
+
+def test_unsupported_queries_are_rejected() -> None:
+    index = LocalIndex(_entries())
+
+    with pytest.raises(ValueError, match="query strings"):
+        index.query(query_options=querying.QueryOptions(q="equals|baseform|word1"))
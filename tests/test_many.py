@@ -0,0 +1,86 @@
+import threading
+import time
+
+import httpx
+import pytest
+from fakes import FakeKarp, mock_client
+from returns.result import Success
+
+from karp_api_client import dsl
+from karp_api_client.api import querying
+
+
+def _lookup(i: int) -> querying.QueryItem:
+    return "ao", querying.QueryOptions(q=dsl.Equals(field="baseform", value=f"word{i}"))
+
+
+class SlowKarp:
+    """Answers `word{i}` lookups after `delays[i]` seconds, counting the requests in flight."""
+
+    def __init__(self, fake_karp: FakeKarp, delays: dict[str, float]) -> None:
+        self.fake_karp = fake_karp
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delays.get(request.url.params["q"].rsplit("|", 1)[-1], 0.01))
+        with self.lock:
+            self.in_flight -= 1
+        return self.fake_karp(request)
+
+
+def test_results_in_order_on_a_bounded_pool(fake_karp: FakeKarp) -> None:
+    slow_karp = SlowKarp(fake_karp, {})
+    client = mock_client(slow_karp)
+
+    results = list(querying.query_many_sync([_lookup(i) for i in range(20)], client=client, max_workers=4))
+
+    assert [index for index, _ in results] == list(range(20))
+    parsed = [result.unwrap().parsed for _, result in results]
+    assert [response.hits[0].entry["baseform"] for response in parsed if response is not None] == [
+        f"word{i}" for i in range(20)
+    ]
+    assert slow_karp.max_in_flight == 4
+
+
+def test_results_as_completed(fake_karp: FakeKarp) -> None:
+    client = mock_client(SlowKarp(fake_karp, {"word0": 0.2}))
+
+    indexes = [
+        index for index, _ in querying.query_many_sync([_lookup(i) for i in range(3)], client=client, ordered=False)
+    ]
+
+    assert indexes[-1] == 0
+    assert sorted(indexes) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_queries_not_done_by_the_deadline_fail(fake_karp: FakeKarp, ordered: bool) -> None:
+    client = mock_client(SlowKarp(fake_karp, {"word1": 0.5}))
+
+    results = dict(
+        querying.query_many_sync([_lookup(i) for i in range(3)], client=client, ordered=ordered, timeout=0.2)
+    )
+
+    assert isinstance(results[0], Success)
+    assert isinstance(results[2], Success)
+    assert isinstance(results[1].failure(), TimeoutError)
+
+
+def test_exceptions_fail_their_own_query(fake_karp: FakeKarp) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["q"].endswith("word1"):
+            raise httpx.ConnectTimeout("too slow")
+        return fake_karp(request)
+
+    results = [
+        result for _, result in querying.query_many_sync([_lookup(i) for i in range(3)], client=mock_client(handler))
+    ]
+
+    assert isinstance(results[1].failure(), httpx.ConnectTimeout)
+    assert all(isinstance(result, Success) for result in (results[0], results[2]))
@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import attrs
+import httpx
+import pytest
+from fakes import FakeKarp, make_entry, mock_client
+
+from karp_api_client.api import history
+from karp_api_client.mirror import MAX_HISTORY_RESTARTS, MirrorUpdate, ResourceMirror
+from karp_api_client.models import EntryOp
+
+
+def _clock() -> float:
+    return 1800000000.0
+
+
+def _modify(fake_karp: FakeKarp) -> None:
+    updated = {**make_entry(3, baseform="katt"), "version": 2, "last_modified": 1700001000.0}
+    fake_karp.change("UPDATED", updated)
+    deleted = {**make_entry(5), "version": 2, "last_modified": 1700001001.0, "discarded": True}
+    fake_karp.change("DELETED", deleted)
+    added = {**make_entry(100), "last_modified": 1700001002.0}
+    fake_karp.change("ADDED", added)
+
+
+def test_get_history_pages(fake_karp: FakeKarp) -> None:
+    _modify(fake_karp)
+    client = mock_client(fake_karp)
+
+    response = history.get_history_sync(
+        "ao", client=client, history_options=history.HistoryOptions(from_date=1700001001.0, page_size=1)
+    ).unwrap()
+
+    assert fake_karp.requests[0].url.params["from_date"] == "1700001001.0"
+    assert response.parsed is not None
+    assert response.parsed.total == 2
+    assert [(change.id, change.op) for change in response.parsed.history] == [("ao-000100", EntryOp.ADDED)]
+
+
+def test_first_update_downloads_then_only_changes_are_read(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    client = mock_client(fake_karp)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, page_size=10, clock=_clock) as mirror:
+        first = mirror.update_sync()
+        assert attrs.evolve(first, checkpoint=None) == MirrorUpdate(full=True, added=23, requests=3)
+        assert first.checkpoint == pytest.approx(1700000022.0)
+
+        _modify(fake_karp)
+        fake_karp.requests.clear()
+        second = mirror.update_sync()
+
+        assert [request.url.path for request in fake_karp.requests] == ["/karp/v7/history/ao"]
+        assert attrs.evolve(second, checkpoint=None) == MirrorUpdate(added=1, updated=1, deleted=1, requests=1)
+        assert second.checkpoint == pytest.approx(1700001002.0)
+        assert len(mirror) == 23
+        entry = mirror.get("ao-000003")
+        assert entry is not None
+        assert entry.version == 2
+        assert entry.entry["baseform"] == "katt"
+        assert mirror.get("ao-000005") is None
+        assert [entry.id for entry in mirror.entries()] == sorted(entry["id"] for entry in fake_karp.entries)
+
+
+def test_changes_read_again_are_not_applied_twice(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    client = mock_client(fake_karp)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, page_size=2, clock=_clock) as mirror:
+        mirror.update_sync()
+        _modify(fake_karp)
+        mirror.update_sync()
+        # an older change to the deleted entry must not bring it back
+        fake_karp.change("UPDATED", {**make_entry(5), "last_modified": 1700001003.0})
+
+        update = mirror.update_sync()
+
+        assert attrs.evolve(update, checkpoint=None) == MirrorUpdate(unchanged=3, requests=2)
+        assert mirror.get("ao-000005") is None
+        assert len(mirror) == 23
+
+
+def test_changes_after_the_update_started_are_left_for_the_next(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    client = mock_client(fake_karp)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, clock=_clock) as mirror:
+        mirror.update_sync()
+        _modify(fake_karp)
+        fake_karp.change("ADDED", {**make_entry(101), "last_modified": _clock() + 1})
+
+        update = mirror.update_sync()
+
+        assert fake_karp.requests[-1].url.params["to_date"] == str(_clock())
+        assert (update.added, update.checkpoint) == (1, pytest.approx(1700001002.0))
+        assert mirror.get("ao-000101") is None
+
+
+def test_update_finishes_while_the_history_keeps_changing(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    def changing(request: httpx.Request) -> httpx.Response:
+        response = fake_karp(request)
+        if "/history/" in request.url.path:
+            # a change committed late, inside the window being read
+            fake_karp.change("ADDED", {**make_entry(200 + len(fake_karp.history)), "last_modified": 1700000500.0})
+        return response
+
+    client = mock_client(changing)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, page_size=1, clock=_clock) as mirror:
+        first = mirror.update_sync()
+        _modify(fake_karp)
+        fake_karp.change("ADDED", {**make_entry(300), "last_modified": 1700002000.0})
+
+        update = mirror.update_sync()
+
+        assert update.requests > MAX_HISTORY_RESTARTS
+        assert update.added > 0
+        # a change may have been skipped, so the next update starts from the same checkpoint
+        assert update.checkpoint == first.checkpoint
+
+
+def test_checkpoint_of_zero_is_kept(tmp_path: Path) -> None:
+    fake_karp = FakeKarp([{**make_entry(0), "last_modified": 0.0}, {**make_entry(1), "last_modified": -1.0}])
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=mock_client(fake_karp), clock=_clock) as mirror:
+        assert mirror.update_sync().checkpoint == pytest.approx(0.0)
+
+
+def test_checkpoint_persists_across_instances(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    client = mock_client(fake_karp)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, clock=_clock) as mirror:
+        mirror.update_sync()
+
+    _modify(fake_karp)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, clock=_clock) as mirror:
+        update = mirror.update_sync()
+        assert not update.full
+        assert len(mirror) == 23
+
+        mirror.reset()
+        assert mirror.checkpoint is None
+        assert len(mirror) == 0
+
+
+@pytest.mark.asyncio
+async def test_update_async(fake_karp: FakeKarp, tmp_path: Path) -> None:
+    client = mock_client(fake_karp)
+    with ResourceMirror("ao", tmp_path / "mirror.db", client=client, page_size=10, clock=_clock) as mirror:
+        first = await mirror.update_async()
+        _modify(fake_karp)
+        second = await mirror.update_async()
+
+        assert (first.added, first.requests) == (23, 3)
+        assert (second.added, second.updated, second.deleted) == (1, 1, 1)
+        assert len(mirror) == 23
@@ -0,0 +1,60 @@
+from fakes import make_entry
+
+from karp_api_client.models import EntryDto, LazyHits, QueryResponse
+
+
+def _payload(n: int) -> dict:
+    return {"total": n, "hits": [make_entry(i) for i in range(n)], "distribution": {"ao": n}}
+
+
+def test_query_response_lazy_hits_builds_on_access() -> None:
+    response = QueryResponse.from_dict(_payload(5), lazy_hits=True)
+
+    assert isinstance(response.hits, LazyHits)
+    assert repr(response.hits) == "LazyHits(len=5, built=0)"
+
+    hit = response.hits[1]
+
+    assert isinstance(hit, EntryDto)
+    assert hit.id == "ao-000001"
+    assert response.hits[1] is hit
+    assert repr(response.hits) == "LazyHits(len=5, built=1)"
+
+
+def test_query_response_lazy_hits_matches_eager() -> None:
+    lazy = QueryResponse.from_dict(_payload(5), lazy_hits=True)
+    eager = QueryResponse.from_dict(_payload(5))
+
+    assert lazy.hits[-1] == eager.hits[-1]
+    assert lazy.hits[1:3] == eager.hits[1:3]
+    assert lazy == eager
+    assert lazy.to_dict() == eager.to_dict()
+
+
+def test_entry_dto_without_additional_properties_has_no_dict() -> None:
+    entry = EntryDto.from_dict(make_entry(1))
+
+    assert entry._additional_properties is None
+    assert entry.additional_keys == []
+    assert "extra" not in entry
+    assert entry == EntryDto.from_dict(make_entry(1))
+    assert "additional_properties" not in entry.to_dict()
+
+
+def test_entry_dto_keeps_additional_properties() -> None:
+    entry = EntryDto.from_dict({**make_entry(1), "extra": 1})
+
+    assert entry["extra"] == 1
+    assert entry.to_dict()["extra"] == 1
+
+    del entry["extra"]
+
+    assert entry == EntryDto.from_dict(make_entry(1))
+
+
+def test_entry_dto_interns_resource() -> None:
+    first = EntryDto.from_dict(make_entry(1, resource=b"ao".decode()))
+    second = EntryDto.from_dict(make_entry(2, resource=b"ao".decode()))
+
+    assert first.resource is second.resource
+    assert first.last_modified_by is second.last_modified_by
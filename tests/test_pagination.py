@@ -0,0 +1,76 @@
+import httpx
+import pytest
+from fakes import FakeKarp, mock_client
+
+from karp_api_client import errors
+from karp_api_client.api import querying
+
+
+def test_iter_query_sync_walks_all_pages(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+    progress = querying.PaginationProgress()
+
+    hits = list(querying.iter_query_sync("ao", client=client, page_size=10, progress=progress))
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries]
+    assert len(fake_karp.requests) == 3
+    assert progress.pages_fetched == 3
+    assert progress.hits_yielded == 23
+    assert progress.total == 23
+    assert progress.bytes_read > 0
+
+
+def test_iter_query_sync_starts_at_from(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+
+    hits = list(querying.iter_query_sync("ao", client=client, query_options=querying.QueryOptions(from_=20, size=10)))
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries[20:]]
+    assert len(fake_karp.requests) == 1
+
+
+def test_iter_query_sync_raises_on_failure() -> None:
+    client = mock_client(lambda _request: httpx.Response(422, json={"detail": []}))
+
+    with pytest.raises(errors.QueryFailed) as exc_info:
+        list(querying.iter_query_sync("ao", client=client))
+
+    assert exc_info.value.response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_iter_query_async_walks_all_pages(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+    progress = querying.PaginationProgress()
+
+    hits = [hit async for hit in querying.iter_query_async("ao", client=client, page_size=10, progress=progress)]
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries]
+    assert progress.pages_fetched == 3
+    assert progress.hits_yielded == 23
+
+
+@pytest.mark.asyncio
+async def test_iter_query_async_prefetches_concurrently(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+    progress = querying.PaginationProgress()
+
+    hits = [
+        hit
+        async for hit in querying.iter_query_async("ao", client=client, page_size=4, progress=progress, concurrency=3)
+    ]
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries]
+    assert progress.pages_fetched == 6
+    assert progress.hits_yielded == 23
+
+
+@pytest.mark.asyncio
+async def test_iter_query_async_cancels_pending_pages_on_close(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+
+    pages = querying.iter_query_async("ao", client=client, page_size=2, concurrency=4)
+    hits = [await pages.__anext__() for _ in range(3)]
+    await pages.aclose()
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries[:3]]
@@ -0,0 +1,66 @@
+import httpx
+import pytest
+
+from karp_api_client import Client
+from karp_api_client.pool import HIGH_CONCURRENCY_POOL, HTTP2_POOL, PoolProfile, PoolStats, pool_stats
+
+
+def test_pool_profile_configures_transport() -> None:
+    client = Client(pool=HIGH_CONCURRENCY_POOL)
+
+    pool = client.get_sync_client()._transport._pool  # type: ignore[attr-defined]
+
+    assert pool._max_connections == 200
+    assert pool._max_keepalive_connections == 100
+    assert client.sync_pool_stats() == PoolStats()
+
+
+def test_http2_pool_enables_http2() -> None:
+    client = Client(pool=HTTP2_POOL)
+
+    pool = client.get_async_client()._transport._pool  # type: ignore[attr-defined]
+
+    assert pool._http2 is True
+
+
+def test_pool_keeps_the_environment_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    client = Client(pool=HIGH_CONCURRENCY_POOL, httpx_args={"trust_env": True})
+
+    assert client.get_sync_client()._mounts
+
+
+def test_pool_conflicting_with_httpx_args_is_rejected() -> None:
+    with pytest.raises(ValueError, match="pool sets http2, limits"):
+        Client(pool=HTTP2_POOL, httpx_args={"limits": httpx.Limits(max_connections=1), "http2": False})
+
+
+def test_pool_stats_is_none_for_unknown_transports() -> None:
+    with httpx.Client(transport=httpx.MockTransport(lambda _request: httpx.Response(200))) as client:
+        assert pool_stats(client) is None
+
+
+def test_warm_up_sync_opens_connections(local_server: str) -> None:
+    client = Client(base_url=local_server, pool=PoolProfile(max_keepalive_connections=10))
+
+    with client:
+        client.warm_up_sync(connections=3)
+        stats = client.sync_pool_stats()
+
+    assert stats is not None
+    assert stats.connections == 3
+    assert stats.idle == 3
+    assert stats.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_up_async_opens_connections(local_server: str) -> None:
+    client = Client(base_url=local_server, pool=PoolProfile(max_keepalive_connections=10))
+
+    async with client:
+        await client.warm_up_async(connections=2)
+        stats = client.async_pool_stats()
+
+    assert stats is not None
+    assert stats.connections == 2
+    assert stats.idle == 2
@@ -0,0 +1,113 @@
+from typing import Any
+
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp, unwrapped
+
+from karp_api_client import Client
+from karp_api_client.api import querying
+from karp_api_client.ratelimit import AsyncRateLimitedTransport, RateLimit, RateLimitedTransport, RateLimiter
+from karp_api_client.transport import Resilience, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_limiter_allows_burst_then_queues() -> None:
+    limiter = RateLimiter(RateLimit(rate=2.0, burst=2.0), clock=FakeClock())
+
+    delays = [limiter.reserve("query/ao") for _ in range(4)]
+
+    assert delays == pytest.approx([0.0, 0.0, 0.5, 1.0])
+    assert limiter.stats.requests == 4
+    assert limiter.stats.delayed == 2
+    assert limiter.stats.max_delay == pytest.approx(1.0)
+
+
+def test_rate_limiter_refills_over_time() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=1.0), clock=clock)
+
+    limiter.reserve()
+    clock.now = 1.0
+
+    assert limiter.reserve() == pytest.approx(0.0)
+
+
+def test_rate_limiter_applies_per_endpoint_budgets() -> None:
+    limiter = RateLimiter(
+        endpoints={"query": RateLimit(rate=1.0), "query/entries": RateLimit(rate=10.0, burst=2.0)},
+        clock=FakeClock(),
+    )
+
+    assert limiter.endpoint("/query/ao") == "query"
+    assert limiter.endpoint("/query/entries/ao/x") == "query/entries"
+    assert limiter.endpoint("/history/ao") is None
+    assert [limiter.reserve("/query/ao") for _ in range(2)] == pytest.approx([0.0, 1.0])
+    assert [limiter.reserve("/query/entries/ao/x") for _ in range(3)] == pytest.approx([0.0, 0.0, 0.1])
+    assert limiter.reserve("/history/ao") == pytest.approx(0.0)
+    assert limiter.endpoint_stats["query"].delayed == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_is_shared_by_sync_and_async_clients(fake_karp: FakeKarp) -> None:
+    limiter = RateLimiter(endpoints={"query": RateLimit(rate=1000.0)})
+    transport = httpx.MockTransport(fake_karp)
+    client = Client(base_url=BASE_URL, rate_limiter=limiter, httpx_args={"transport": transport})
+
+    querying.query_sync("ao", client=client)
+    await querying.query_async("ao", client=client)
+    querying.get_entries_by_id_sync("ao", ["a"], client=client)
+
+    assert limiter.stats.requests == 3
+    assert limiter.endpoint_stats["query"].requests == 3
+
+
+@pytest.mark.asyncio
+async def test_every_retry_waits_for_the_rate_limiter(fake_karp: FakeKarp) -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) % 3:
+            return httpx.Response(503)
+        return fake_karp(request)
+
+    limiter = RateLimiter(RateLimit(rate=1000.0))
+    resilience = Resilience(retry=RetryPolicy(backoff_factor=0.0, jitter=False), budget=None)
+    client = Client(
+        base_url=BASE_URL,
+        rate_limiter=limiter,
+        resilience=resilience,
+        httpx_args={"transport": httpx.MockTransport(handler)},
+    )
+
+    querying.query_sync("ao", client=client).unwrap()
+    (await querying.query_async("ao", client=client)).unwrap()
+
+    assert len(attempts) == 6
+    assert resilience.metrics.retries == 4
+    assert limiter.stats.requests == 6
+
+
+@pytest.mark.parametrize("get_client", [Client.get_sync_client, Client.get_async_client])
+def test_rate_limiter_keeps_the_httpx_transport_options(get_client: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    client = Client(
+        rate_limiter=RateLimiter(RateLimit(rate=10.0)),
+        httpx_args={"limits": httpx.Limits(max_connections=1), "http2": True},
+    )
+
+    httpx_client = get_client(client)
+    pool = unwrapped(httpx_client._transport)._pool
+
+    limited = (RateLimitedTransport, AsyncRateLimitedTransport)
+    assert isinstance(httpx_client._transport, limited)
+    assert (pool._max_connections, pool._http2) == (1, True)
+    assert httpx_client._mounts
+    assert all(isinstance(transport, limited) for transport in httpx_client._mounts.values())
@@ -0,0 +1,97 @@
+import httpx
+import pytest
+from fakes import BASE_URL, FakeKarp, make_entry, mock_client
+
+from karp_api_client import AuthenticatedClient, dsl
+from karp_api_client.api import querying
+
+
+def _wordlist_query(words: list[str]) -> dsl.Or:
+    return dsl.Or.from_iterable(dsl.Equals(field="baseform", value=word) for word in words)
+
+
+def test_query_that_fits_is_sent_as_is() -> None:
+    options = querying.QueryOptions(q=_wordlist_query(["word1", "word2"]))
+
+    parts = querying.split_query("ao", query_options=options, base_url=BASE_URL)
+
+    assert parts == [options]
+
+
+def test_split_query_keeps_each_url_within_the_limit() -> None:
+    options = querying.QueryOptions(q=_wordlist_query([f"word{i}" for i in range(200)]), from_=10, size=5)
+
+    parts = querying.split_query("ao", query_options=options, base_url=BASE_URL, max_url_length=500)
+
+    assert len(parts) > 1
+    assert sum(len(part.q.ors) for part in parts if isinstance(part.q, dsl.Or)) == 200
+    assert all(part.from_ is None and part.size == 15 for part in parts)
+    assert all(len(BASE_URL) + len(f"/query/ao?{part.to_query_string()}") <= 500 for part in parts)
+
+
+def test_split_query_keeps_size_zero() -> None:
+    options = querying.QueryOptions(q=_wordlist_query([f"word{i}" for i in range(200)]), size=0)
+
+    parts = querying.split_query("ao", query_options=options, base_url=BASE_URL, max_url_length=500)
+
+    assert len(parts) > 1
+    assert all(part.size == 0 for part in parts)
+
+
+def test_split_query_rejects_a_single_query_that_does_not_fit() -> None:
+    options = querying.QueryOptions(q=_wordlist_query(["x" * 500, "y"]))
+
+    with pytest.raises(ValueError, match="does not fit"):
+        querying.split_query("ao", query_options=options, max_url_length=200)
+
+
+def test_query_split_sync_merges_deduplicates_and_sorts() -> None:
+    fake_karp = FakeKarp([make_entry(i, baseform=f"word{i % 50}") for i in range(100)])
+    client = mock_client(fake_karp)
+    words = [f"word{i}" for i in range(40)] + ["word1", "word2"]
+    options = querying.QueryOptions(q=_wordlist_query(words), sort=["baseform|desc"], from_=3, size=10)
+
+    response = querying.query_split_sync("ao", client=client, query_options=options, max_url_length=400).unwrap()
+
+    expected = sorted(
+        (e for e in fake_karp.entries if e["entry"]["baseform"] in words),
+        key=lambda e: e["entry"]["baseform"],
+        reverse=True,
+    )
+    assert len(fake_karp.requests) > 1
+    assert all(len(str(request.url)) <= 400 for request in fake_karp.requests)
+    assert response.parsed is not None
+    assert response.parsed.total == 80
+    assert [hit.entry["baseform"] for hit in response.parsed.hits] == [e["entry"]["baseform"] for e in expected[3:13]]
+
+
+def test_query_split_sync_counts_the_api_key_in_the_url_length() -> None:
+    fake_karp = FakeKarp([make_entry(i) for i in range(60)])
+    client = AuthenticatedClient(
+        base_url=BASE_URL, token="t" * 100, httpx_args={"transport": httpx.MockTransport(fake_karp)}
+    )
+    options = querying.QueryOptions(q=_wordlist_query([f"word{i}" for i in range(60)]), size=100)
+
+    response = querying.query_split_sync("ao", client=client, query_options=options, max_url_length=600).unwrap()
+
+    assert len(fake_karp.requests) > 1
+    assert all("api_key=" in str(request.url) for request in fake_karp.requests)
+    assert all(len(str(request.url)) <= 600 for request in fake_karp.requests)
+    assert response.parsed is not None
+    assert response.parsed.total == 60
+
+
+@pytest.mark.asyncio
+async def test_query_split_async_returns_all_hits() -> None:
+    fake_karp = FakeKarp([make_entry(i) for i in range(60)])
+    client = mock_client(fake_karp)
+    options = querying.QueryOptions(q=_wordlist_query([f"word{i}" for i in range(60)]), size=100)
+
+    response = (
+        await querying.query_split_async("ao", client=client, query_options=options, max_url_length=600)
+    ).unwrap()
+
+    assert len(fake_karp.requests) > 1
+    assert response.parsed is not None
+    assert response.parsed.total == 60
+    assert {hit.id for hit in response.parsed.hits} == {entry["id"] for entry in fake_karp.entries}
@@ -0,0 +1,125 @@
+import json
+import random
+from typing import Any
+
+import httpx
+import pytest
+from fakes import FakeKarp, make_entry, mock_client
+
+from karp_api_client import errors
+from karp_api_client.api import querying
+from karp_api_client.json_stream import QueryResponseParser
+
+
+def test_parser_yields_hits_across_chunk_boundaries() -> None:
+    payload = {
+        "hits": [make_entry(i, message='a "quoted" ] } \\ value') for i in range(20)],
+        "total": 1234,
+        "distribution": {"ao": 20},
+    }
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    rng = random.Random(42)
+
+    for _ in range(20):
+        parser = QueryResponseParser()
+        hits = []
+        pos = 0
+        while pos < len(body):
+            step = rng.randint(1, 50)
+            hits.extend(parser.feed(body[pos : pos + step]))
+            pos += step
+        hits.extend(parser.close())
+
+        assert hits == payload["hits"]
+        assert parser.fields == {"hits": None, "total": 1234, "distribution": {"ao": 20}}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"total": 1',
+        b'{"hits": [{}',
+        b'{"total": 1,}',
+        b'{"total": 1} x',
+        b'{"hits":[1,]}',
+        b'{"hits": [{"a": 1,}]}',
+        b'{"hits": [{"a": "b}]}',
+    ],
+)
+def test_parser_rejects_invalid_body(body: bytes) -> None:
+    parser = QueryResponseParser()
+
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed(body)
+        parser.close()
+
+
+class CountingDecoder(json.JSONDecoder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def raw_decode(self, s: str, idx: int = 0) -> tuple[Any, int]:
+        self.calls += 1
+        return super().raw_decode(s, idx)
+
+
+def test_parser_decodes_a_large_hit_once() -> None:
+    hit = make_entry(0, senses=[{"id": i, "text": f'sense "{i}" \\ [{i}]'} for i in range(5000)])
+    body = json.dumps({"hits": [hit, hit]}).encode()
+    parser = QueryResponseParser()
+    decoder = parser._json = CountingDecoder()
+
+    hits = []
+    for pos in range(0, len(body), 512):
+        hits.extend(parser.feed(body[pos : pos + 512]))
+    hits.extend(parser.close())
+
+    assert hits == [hit, hit]
+    # the key "hits" and the two hits
+    assert decoder.calls == 3
+
+
+def test_stream_query_sync_yields_hits(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+    summary = querying.StreamedQuery()
+
+    hits = list(
+        querying.stream_query_sync("ao", client=client, query_options=querying.QueryOptions(size=10), summary=summary)
+    )
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries[:10]]
+    assert summary.status_code == 200
+    assert summary.total == 23
+    assert summary.bytes_read > 0
+    assert summary.content is None
+
+
+def test_stream_query_sync_can_retain_body(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+    summary = querying.StreamedQuery()
+
+    list(querying.stream_query_sync("ao", client=client, summary=summary, retain_body=True))
+
+    assert summary.content is not None
+    assert json.loads(summary.content)["total"] == 23
+
+
+def test_stream_query_sync_raises_on_failure() -> None:
+    client = mock_client(lambda _request: httpx.Response(422, json={"detail": []}))
+
+    with pytest.raises(errors.QueryFailed) as exc_info:
+        list(querying.stream_query_sync("ao", client=client))
+
+    assert exc_info.value.response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stream_query_async_yields_hits(fake_karp: FakeKarp) -> None:
+    client = mock_client(fake_karp)
+    summary = querying.StreamedQuery()
+
+    hits = [hit async for hit in querying.stream_query_async("ao", client=client, summary=summary)]
+
+    assert [hit.id for hit in hits] == [entry["id"] for entry in fake_karp.entries]
+    assert summary.total == 23
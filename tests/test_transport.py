@@ -0,0 +1,154 @@
+from collections.abc import Iterator
+from typing import Any, Union
+
+import httpx
+import pytest
+from fakes import BASE_URL, unwrapped
+
+from karp_api_client import Client, errors
+from karp_api_client.api import querying
+from karp_api_client.transport import (
+    AsyncResilientTransport,
+    CircuitBreaker,
+    Resilience,
+    ResilientTransport,
+    RetryBudget,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+OK_BODY = {"total": 0, "hits": [], "distribution": None}
+
+
+def _scripted(outcomes: list[Union[int, Exception]], calls: list[httpx.Request]) -> httpx.MockTransport:
+    script: Iterator[Union[int, Exception]] = iter(outcomes)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        outcome = next(script)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json=OK_BODY)
+
+    return httpx.MockTransport(handler)
+
+
+def _resilience(**kwargs: Any) -> Resilience:
+    kwargs.setdefault("retry", RetryPolicy(backoff_factor=0.0))
+    return Resilience(**kwargs)
+
+
+def test_retries_transient_failures() -> None:
+    calls: list[httpx.Request] = []
+    resilience = _resilience()
+    transport = _scripted([503, httpx.ConnectError("reset"), 200], calls)
+    client = Client(base_url=BASE_URL, resilience=resilience, httpx_args={"transport": transport})
+
+    result = querying.query_sync("ao", client=client)
+
+    assert result.unwrap().status_code == 200
+    assert len(calls) == 3
+    assert resilience.metrics.requests == 1
+    assert resilience.metrics.retries == 2
+
+
+def test_does_not_retry_non_idempotent_requests() -> None:
+    calls: list[httpx.Request] = []
+    transport = ResilientTransport(_scripted([503, 200], calls), _resilience())
+
+    with httpx.Client(transport=transport) as client:
+        response = client.post("https://karp.test/entries/ao")
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_retries() -> None:
+    calls: list[httpx.Request] = []
+    resilience = _resilience(retry=RetryPolicy(max_retries=2, backoff_factor=0.0))
+    transport = ResilientTransport(_scripted([502, 502, 502, 200], calls), resilience)
+
+    with httpx.Client(transport=transport) as client:
+        response = client.get("https://karp.test/query/ao")
+
+    assert response.status_code == 502
+    assert len(calls) == 3
+    assert resilience.metrics.retries_exhausted == 1
+
+
+def test_retry_budget_limits_retries() -> None:
+    calls: list[httpx.Request] = []
+    resilience = _resilience(budget=RetryBudget(ratio=0.0, initial_tokens=1.0))
+    transport = ResilientTransport(_scripted([503, 503, 503], calls), resilience)
+
+    with httpx.Client(transport=transport) as client:
+        response = client.get("https://karp.test/query/ao")
+
+    assert response.status_code == 503
+    assert len(calls) == 2
+    assert resilience.metrics.budget_exhausted == 1
+
+
+def test_circuit_opens_and_fails_fast() -> None:
+    now = [0.0]
+    calls: list[httpx.Request] = []
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+    resilience = _resilience(retry=RetryPolicy(max_retries=0), circuit_breaker=breaker)
+    transport = ResilientTransport(_scripted([500, 500, 200], calls), resilience)
+
+    with httpx.Client(transport=transport) as client:
+        client.get("https://karp.test/query/ao")
+        client.get("https://karp.test/query/ao")
+        with pytest.raises(errors.CircuitOpen):
+            client.get("https://karp.test/query/ao")
+        assert breaker.state("karp.test") == "open"
+
+        now[0] = 11.0
+        response = client.get("https://karp.test/query/ao")
+
+    assert response.status_code == 200
+    assert breaker.state("karp.test") == "closed"
+    assert len(calls) == 3
+    assert resilience.metrics.circuit_opened == 1
+    assert resilience.metrics.circuit_rejected == 1
+
+
+def test_honours_retry_after() -> None:
+    resilience = _resilience()
+    request = httpx.Request("GET", "https://karp.test/query/ao")
+    response = httpx.Response(503, headers={"Retry-After": "2"})
+
+    assert resilience.retry_delay(request, 0, response) == pytest.approx(2.0)
+    assert resilience.metrics.retry_after_honoured == 1
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == pytest.approx(0.0)
+    assert parse_retry_after("soon") is None
+
+
+@pytest.mark.asyncio
+async def test_async_transport_retries() -> None:
+    calls: list[httpx.Request] = []
+    resilience = _resilience()
+    transport = AsyncResilientTransport(_scripted([503, 200], calls), resilience)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.get("https://karp.test/query/ao")
+
+    assert response.status_code == 200
+    assert resilience.metrics.retries == 1
+
+
+@pytest.mark.parametrize("get_client", [Client.get_sync_client, Client.get_async_client])
+def test_resilience_keeps_the_httpx_transport_options(get_client: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    client = Client(resilience=Resilience(), httpx_args={"limits": httpx.Limits(max_connections=1), "http2": True})
+
+    httpx_client = get_client(client)
+    pool = unwrapped(httpx_client._transport)._pool
+
+    assert isinstance(httpx_client._transport, (ResilientTransport, AsyncResilientTransport))
+    assert (pool._max_connections, pool._http2) == (1, True)
+    assert httpx_client._mounts
+    assert all(
+        isinstance(transport, (ResilientTransport, AsyncResilientTransport))
+        for transport in httpx_client._mounts.values()
+    )